@@ -0,0 +1,148 @@
+import asyncio, os, threading
+try:
+    import asyncssh
+except ImportError:     #Optional, transfers stay on the threaded engine without it
+    asyncssh = None
+
+class AsyncSFTPEngine():
+    def __init__(self, Concurrency = 64, BlockSize = 65536, MaxRequests = 16, FlushInterval = 0.1):
+        self.Concurrency = Concurrency      #Files in flight at once, each one a coroutine rather than a thread
+        self.BlockSize = BlockSize
+        self.MaxRequests = MaxRequests      #Outstanding SFTP requests per file
+        self.FlushInterval = FlushInterval      #Seconds between completed file batches handed back to the caller
+        self.EventLoop = None
+        self.LoopThread = None
+        self.Connections = {}       #Connection key -> (SSH connection, SFTP client), only touched on the loop thread
+        self.StartLock = threading.Lock()
+
+    def ReturnAvailable(self):
+        return asyncssh is not None
+
+    def Start(self):
+        #One loop on its own thread serves every job, callers block on their own coroutine only
+        with self.StartLock:
+            if self.EventLoop is None:
+                self.EventLoop = asyncio.new_event_loop()
+                self.LoopThread = threading.Thread(target = self.EventLoop.run_forever, daemon = True)
+                self.LoopThread.start()
+
+    def Run(self, Coroutine):
+        self.Start()
+        return asyncio.run_coroutine_threadsafe(Coroutine, self.EventLoop).result()
+
+    def TransferFiles(self, Conn, Transfers, ProgressFunction, BatchFunction, CancelEvent, PreserveTimes = False, WaitFunction = None):
+        return self.Run(self.TransferFilesAsync(Conn, Transfers, ProgressFunction, BatchFunction, CancelEvent, PreserveTimes, WaitFunction))
+
+    def Disconnect(self, ConnectionKey):
+        if self.EventLoop is not None:
+            self.Run(self.DisconnectAsync(ConnectionKey))
+
+    def Close(self):
+        if self.EventLoop is None:
+            return
+        for ConnectionKey in list(self.Connections):
+            self.Disconnect(ConnectionKey)
+        self.EventLoop.call_soon_threadsafe(self.EventLoop.stop)
+        self.LoopThread.join()
+        self.EventLoop.close()
+        self.EventLoop, self.LoopThread = None, None
+
+    async def ReturnSFTPClient(self, Conn):
+        ConnectionKey = f"{Conn["Username"]}@{Conn["Host"]}:{Conn["Port"]}"
+        Connection, SFTPClient = self.Connections.get(ConnectionKey, (None, None))
+        if Connection is None or Connection.is_closed():
+            Connection = await asyncssh.connect(Conn["Host"], int(Conn["Port"]), username = Conn["Username"], password = Conn["Password"], known_hosts = None)
+            SFTPClient = await Connection.start_sftp_client()
+            self.Connections[ConnectionKey] = (Connection, SFTPClient)
+        return SFTPClient
+
+    async def DisconnectAsync(self, ConnectionKey):
+        Connection, SFTPClient = self.Connections.pop(ConnectionKey, (None, None))
+        if Connection is not None:
+            SFTPClient.exit()
+            Connection.close()
+            await Connection.wait_closed()
+
+    async def TransferFilesAsync(self, Conn, Transfers, ProgressFunction, BatchFunction, CancelEvent, PreserveTimes, WaitFunction):
+        SFTPClient = await self.ReturnSFTPClient(Conn)
+        TransferSlots = asyncio.Semaphore(self.Concurrency)
+        CompletedTransfers = []
+        async def TransferFile(Transfer):
+            async with TransferSlots:
+                if WaitFunction is not None:
+                    await self.CopyFileShaped(SFTPClient, Transfer, ProgressFunction, WaitFunction, PreserveTimes)
+                    CompletedTransfers.append(Transfer)
+                    return
+                LastBytes = 0
+                def ProgressHandler(SourcePath, DestinationPath, BytesSoFar, TotalBytes):
+                    nonlocal LastBytes
+                    ProgressFunction(BytesSoFar - LastBytes)
+                    LastBytes = BytesSoFar
+                TransferArguments = {
+                    "preserve" : PreserveTimes,
+                    "block_size" : self.BlockSize,
+                    "max_requests" : self.MaxRequests,
+                    "progress_handler" : ProgressHandler
+                }
+                if Transfer["Transfer Type"] == "Download":
+                    await SFTPClient.get(Transfer["Server Path Item"], Transfer["Local Path Item"], **TransferArguments)
+                else:
+                    await SFTPClient.put(Transfer["Local Path Item"], Transfer["Server Path Item"], **TransferArguments)
+                CompletedTransfers.append(Transfer)
+        def FlushCompleted():
+            if CompletedTransfers:
+                BatchFunction(CompletedTransfers[:])
+                CompletedTransfers.clear()
+        TransferTasks = [asyncio.ensure_future(TransferFile(Transfer)) for Transfer in Transfers]
+        PendingTasks = set(TransferTasks)
+        try:
+            #Completed files are handed back a batch at a time, the first failure or a cancel stops the rest
+            while PendingTasks:
+                DoneTasks, PendingTasks = await asyncio.wait(PendingTasks, timeout = self.FlushInterval, return_when = asyncio.FIRST_EXCEPTION)
+                FlushCompleted()
+                for Task in DoneTasks:
+                    if Task.exception() is not None:
+                        raise Task.exception()
+                if CancelEvent.is_set():
+                    raise InterruptedError("Operation cancelled")
+        finally:
+            for Task in PendingTasks:
+                Task.cancel()
+            await asyncio.gather(*PendingTasks, return_exceptions = True)
+            FlushCompleted()
+
+    async def CopyFileShaped(self, SFTPClient, Transfer, ProgressFunction, WaitFunction, PreserveTimes):
+        #Only this file's coroutine sleeps off its debt, every other job on the loop keeps moving
+        Download = Transfer["Transfer Type"] == "Download"
+        ChunkSize = self.BlockSize * self.MaxRequests       #Each chunk still goes out as parallel block requests
+        async with await SFTPClient.open(Transfer["Server Path Item"], "rb" if Download else "wb", block_size = self.BlockSize, max_requests = self.MaxRequests) as ServerFile:
+            with open(Transfer["Local Path Item"], "wb" if Download else "rb") as LocalFile:
+                Offset, PendingWrites = 0, []
+                try:
+                    while True:
+                        Data = await ServerFile.read(ChunkSize, Offset) if Download else LocalFile.read(ChunkSize)
+                        if not Data:
+                            break
+                        if Download:
+                            LocalFile.write(Data)
+                        else:       #Two chunks in flight at a time, waiting on every chunk's last reply alone drains the pipe
+                            PendingWrites.append(asyncio.ensure_future(ServerFile.write(Data, Offset)))
+                            if len(PendingWrites) > 1:
+                                await PendingWrites.pop(0)
+                        Offset += len(Data)
+                        ProgressFunction(len(Data))
+                        Wait = WaitFunction(len(Data))
+                        while Wait:
+                            await asyncio.sleep(Wait)
+                            Wait = WaitFunction(0)
+                    await asyncio.gather(*PendingWrites)
+                finally:
+                    for PendingWrite in PendingWrites:
+                        PendingWrite.cancel()
+        if PreserveTimes:
+            if Download:
+                Attributes = await SFTPClient.stat(Transfer["Server Path Item"])
+                os.utime(Transfer["Local Path Item"], (Attributes.atime, Attributes.mtime))
+            else:
+                LocalStats = os.stat(Transfer["Local Path Item"])
+                await SFTPClient.utime(Transfer["Server Path Item"], (LocalStats.st_atime, LocalStats.st_mtime))
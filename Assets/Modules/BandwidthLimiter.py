@@ -0,0 +1,108 @@
+import contextlib, threading, time
+
+ACTIVEWINDOW = 1.0      #Seconds a job keeps its share after it last moved data, an idle job hands its share to the others
+MAXIMUMWAIT = 0.1       #Longest single sleep, so a changed limit or a cancel takes effect almost at once
+
+class BandwidthLimiter():
+    def __init__(self, GlobalRate = 0, JobRate = 0, InteractiveReserve = 0.2, BurstSeconds = 0.25):
+        self.GlobalRate = GlobalRate        #Bytes per second shared by every job, 0 leaves it unlimited
+        self.JobRate = JobRate      #Bytes per second for any one job without a rate of its own, 0 leaves it unlimited
+        self.InteractiveReserve = InteractiveReserve        #Part of the global rate held back from bulk jobs while a listing runs
+        self.BurstSeconds = BurstSeconds
+        self.LimiterLock = threading.Lock()
+        self.Jobs = {}      #Job key -> own rate, token bucket and last activity
+        self.InteractiveCount = 0
+
+    def SetGlobalRate(self, Rate):
+        with self.LimiterLock:
+            self.GlobalRate = Rate
+
+    def SetJobRate(self, Rate, JobKey = None):
+        with self.LimiterLock:
+            if JobKey is None:
+                self.JobRate = Rate
+            elif JobKey in self.Jobs:
+                self.Jobs[JobKey]["Rate"] = Rate
+
+    def RegisterJob(self, JobKey, Rate = None):
+        with self.LimiterLock:
+            self.Jobs[JobKey] = {
+                "Rate" : Rate,
+                "Tokens" : 0.0,
+                "Updated" : time.monotonic(),
+                "Last Active" : time.monotonic()
+            }
+
+    def UnregisterJob(self, JobKey):
+        with self.LimiterLock:
+            self.Jobs.pop(JobKey, None)
+
+    @contextlib.contextmanager
+    def Interactive(self):
+        with self.LimiterLock:
+            self.InteractiveCount += 1
+        try:
+            yield
+        finally:
+            with self.LimiterLock:
+                self.InteractiveCount -= 1
+
+    def Acquire(self, JobKey, ByteCount, CancelEvent = None):
+        #Bytes already moved are charged up front, the caller then sleeps off any debt before it moves more
+        Wait = self.ReturnWait(JobKey, ByteCount)
+        while Wait:
+            if CancelEvent is not None:
+                if CancelEvent.wait(Wait):
+                    return
+            else:
+                time.sleep(Wait)
+            Wait = self.ReturnWait(JobKey, 0)
+
+    def ReturnWait(self, JobKey, ByteCount):
+        #Never blocks, the seconds to hold off before moving more, callers on an event loop sleep it off there
+        with self.LimiterLock:
+            Job = self.Jobs.get(JobKey)
+            if Job is None:
+                return 0
+            Job["Last Active"] = time.monotonic()       #A job sleeping off its debt still holds its share
+            Rate = self.RefillTokens(JobKey, Job)
+            Job["Tokens"] -= ByteCount
+            if Job["Tokens"] >= 0 or not Rate:
+                return 0
+            return min(-Job["Tokens"] / Rate, MAXIMUMWAIT)
+
+    def RefillTokens(self, JobKey, Job):
+        Now = time.monotonic()
+        Rate = self.ReturnAllocations(Now).get(JobKey, 0)
+        if Rate:
+            Job["Tokens"] = min(Job["Tokens"] + (Now - Job["Updated"]) * Rate, Rate * self.BurstSeconds)
+        else:       #Unlimited, no debt is carried over into a later limit
+            Job["Tokens"] = 0.0
+        Job["Updated"] = Now
+        return Rate
+
+    def ReturnAllocations(self, Now):
+        #Max-min fair share, jobs capped below an equal split hand what they leave unused to the rest
+        ActiveJobs = [JobKey for JobKey, Job in self.Jobs.items() if Now - Job["Last Active"] <= ACTIVEWINDOW]
+        Caps = {JobKey : self.Jobs[JobKey]["Rate"] if self.Jobs[JobKey]["Rate"] is not None else self.JobRate for JobKey in ActiveJobs}
+        Pool = self.GlobalRate * (1 - self.InteractiveReserve if self.InteractiveCount else 1)
+        if not Pool:
+            return Caps
+        Allocations, Remaining = {}, Pool
+        ActiveJobs.sort(key = lambda JobKey: Caps[JobKey] or float("inf"))
+        for Index, JobKey in enumerate(ActiveJobs):
+            Share = Remaining / (len(ActiveJobs) - Index)
+            Allocations[JobKey] = min(Caps[JobKey], Share) if Caps[JobKey] else Share
+            Remaining -= Allocations[JobKey]
+        return Allocations
+
+    def ReturnJobRate(self, JobKey):
+        #The rate the job is held to right now, 0 when nothing limits it
+        with self.LimiterLock:
+            if JobKey not in self.Jobs:
+                return 0
+            Allocations = self.ReturnAllocations(time.monotonic())
+            if JobKey in Allocations:
+                return Allocations[JobKey]
+            JobRate = self.Jobs[JobKey]["Rate"] if self.Jobs[JobKey]["Rate"] is not None else self.JobRate
+            return min(JobRate, self.GlobalRate) if JobRate and self.GlobalRate else JobRate or self.GlobalRate
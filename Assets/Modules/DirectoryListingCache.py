@@ -0,0 +1,76 @@
+import posixpath, threading, time
+from collections import OrderedDict
+
+class DirectoryListingCache():
+    def __init__(self, TimeToLive = 30, MaxEntries = 256):
+        self.TimeToLive = TimeToLive
+        self.MaxEntries = MaxEntries
+        self.CacheEntries = OrderedDict()       #Path -> (Time cached, Directory items), least recently used first
+        self.CacheLock = threading.Lock()
+
+    def Get(self, ServerPath):
+        ServerPath = self.NormalizePath(ServerPath)
+        with self.CacheLock:
+            CacheEntry = self.CacheEntries.get(ServerPath)
+            if CacheEntry is None:
+                return None
+            if time.monotonic() - CacheEntry[0] > self.TimeToLive:
+                del self.CacheEntries[ServerPath]
+                return None
+            self.CacheEntries.move_to_end(ServerPath)
+            return list(CacheEntry[1])
+
+    def Set(self, ServerPath, DirectoryItems):
+        ServerPath = self.NormalizePath(ServerPath)
+        with self.CacheLock:
+            self.CacheEntries[ServerPath] = (time.monotonic(), list(DirectoryItems))
+            self.CacheEntries.move_to_end(ServerPath)
+            while len(self.CacheEntries) > self.MaxEntries:
+                self.CacheEntries.popitem(last = False)
+
+    def PatchItem(self, ServerPath, DirectoryItem):
+        ServerPath = self.NormalizePath(ServerPath)
+        with self.CacheLock:
+            CacheEntry = self.CacheEntries.get(ServerPath)
+            if CacheEntry is not None:
+                DirectoryItems = [Item for Item in CacheEntry[1] if Item.Name != DirectoryItem.Name]
+                DirectoryItems.append(DirectoryItem)
+                self.CacheEntries[ServerPath] = (CacheEntry[0], DirectoryItems)
+
+    def RemoveItem(self, ServerPath, ItemName):
+        ServerPath = self.NormalizePath(ServerPath)
+        with self.CacheLock:
+            CacheEntry = self.CacheEntries.get(ServerPath)
+            if CacheEntry is not None:
+                self.CacheEntries[ServerPath] = (CacheEntry[0], [Item for Item in CacheEntry[1] if Item.Name != ItemName])
+        self.InvalidateTree(posixpath.join(ServerPath, ItemName))
+
+    def RenameItem(self, OldPath, NewPath):
+        OldPath, NewPath = self.NormalizePath(OldPath), self.NormalizePath(NewPath)
+        with self.CacheLock:
+            CacheEntry = self.CacheEntries.get(posixpath.dirname(OldPath))
+            RenamedItems = [Item._replace(Name = posixpath.basename(NewPath)) for Item in (CacheEntry[1] if CacheEntry else []) if Item.Name == posixpath.basename(OldPath)]
+        self.RemoveItem(posixpath.dirname(OldPath), posixpath.basename(OldPath))
+        self.InvalidateTree(NewPath)
+        if RenamedItems:
+            self.PatchItem(posixpath.dirname(NewPath), RenamedItems[0])
+        else:
+            self.Invalidate(posixpath.dirname(NewPath))
+
+    def Invalidate(self, ServerPath):
+        with self.CacheLock:
+            self.CacheEntries.pop(self.NormalizePath(ServerPath), None)
+
+    def InvalidateTree(self, ServerPath):
+        ServerPath = self.NormalizePath(ServerPath)
+        TreePrefix = ServerPath.rstrip("/") + "/"
+        with self.CacheLock:
+            for CachedPath in [Path for Path in self.CacheEntries if Path == ServerPath or Path.startswith(TreePrefix)]:
+                del self.CacheEntries[CachedPath]
+
+    def Clear(self):
+        with self.CacheLock:
+            self.CacheEntries.clear()
+
+    def NormalizePath(self, ServerPath):
+        return posixpath.normpath(ServerPath.replace("\\", "/")) if ServerPath else "."
@@ -0,0 +1,4 @@
+from collections import namedtuple
+
+#One listing entry. Modified is an epoch timestamp, views format it only for the rows they draw
+DirectoryRecord = namedtuple("DirectoryRecord", ["Name", "Type", "Modified", "Size"])
@@ -0,0 +1,91 @@
+from Assets.Modules import \
+    DirectoryRecord as DirectoryRecordObject
+import os, concurrent.futures
+
+BULKBATCHSIZE = 1000        #Entries reported back per batch callback
+
+class LocalBulkOperations():
+    def __init__(self, WorkerCount = 8, BatchSize = BULKBATCHSIZE, CancelEvent = None):
+        self.WorkerCount = WorkerCount      #Threads listing folders and removing entries, the syscalls release the GIL
+        self.BatchSize = BatchSize
+        self.CancelEvent = CancelEvent
+
+    def Delete(self, LocalPath, BatchCallback = None):
+        #Links are removed as entries and never followed, a link to a folder leaves the folder it points at alone
+        if not os.path.isdir(LocalPath) or os.path.islink(LocalPath):
+            os.remove(LocalPath)
+            if BatchCallback is not None:
+                BatchCallback([LocalPath], [])
+            return 1, []
+        Records, Errors = self.WalkTree(LocalPath)
+        Files = [os.path.join(LocalPath, Record.Name) for Record in Records if Record.Type != "Folder"]
+        Folders = [os.path.join(LocalPath, Record.Name) for Record in Records if Record.Type == "Folder"]
+        Deleted = []
+        def RemovePaths(RemoveFunction, Paths):
+            Results, PathErrors = [], []
+            for Path in Paths:
+                if self.CancelEvent is not None and self.CancelEvent.is_set():
+                    break
+                try:
+                    RemoveFunction(Path)
+                    Results.append(Path)
+                except OSError as e:
+                    PathErrors.append(f"{Path}: {e.strerror}")
+            return Results, PathErrors
+        Executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.WorkerCount)
+        try:
+            #Files go first in parallel batches, then folders deepest level first so each is empty when removed
+            Stages = [(os.remove, Files)] + [(os.rmdir, [Folder for Folder in Folders if Folder.count(os.sep) == Depth]) for Depth in sorted({Folder.count(os.sep) for Folder in Folders}, reverse = True)] + [(os.rmdir, [LocalPath])]
+            for RemoveFunction, Paths in Stages:
+                for Future in [Executor.submit(RemovePaths, RemoveFunction, Paths[Start:Start + self.BatchSize]) for Start in range(0, len(Paths), self.BatchSize)]:
+                    Results, PathErrors = Future.result()
+                    Deleted.extend(Results)
+                    Errors.extend(PathErrors)
+                    if BatchCallback is not None:
+                        BatchCallback(Results, PathErrors)
+                self.ReturnCancelled()
+        finally:
+            Executor.shutdown(cancel_futures = True)       #A cancelled delete stops at the batches already running
+        return len(Deleted), Errors
+
+    def WalkTree(self, LocalPath, BatchCallback = None):
+        #Records carry paths relative to LocalPath, links inside the tree are reported with an empty type and never followed
+        Records, Errors, ReportedResults, ReportedErrors = [], [], 0, 0
+        def ListFolder(RelativePath):
+            FolderItems = []
+            with os.scandir(os.path.join(LocalPath, RelativePath) if RelativePath else LocalPath) as DirectoryEntries:
+                for Entry in DirectoryEntries:
+                    try:
+                        EntryStat = Entry.stat(follow_symlinks = False)
+                        ItemType = "Folder" if Entry.is_dir(follow_symlinks = False) else "File" if Entry.is_file(follow_symlinks = False) else ""
+                        FolderItems.append(DirectoryRecordObject.DirectoryRecord(os.path.join(RelativePath, Entry.name) if RelativePath else Entry.name, ItemType, EntryStat.st_mtime, EntryStat.st_size))
+                    except OSError:     #Removed mid walk
+                        continue
+            return FolderItems
+        Executor = concurrent.futures.ThreadPoolExecutor(max_workers = self.WorkerCount)
+        try:
+            #Every folder is listed as soon as its parent is, keeping every thread busy on wide and deep trees alike
+            PendingFolders = {Executor.submit(ListFolder, "")}
+            while PendingFolders:
+                DoneFolders, PendingFolders = concurrent.futures.wait(PendingFolders, return_when = concurrent.futures.FIRST_COMPLETED)
+                self.ReturnCancelled()
+                for Future in DoneFolders:
+                    try:
+                        FolderItems = Future.result()
+                    except OSError as e:       #An unreadable folder is reported, the rest of the tree is still walked
+                        Errors.append(f"{e.filename}: {e.strerror}")
+                        continue
+                    for Record in FolderItems:
+                        Records.append(Record)
+                        if Record.Type == "Folder":
+                            PendingFolders.add(Executor.submit(ListFolder, Record.Name))
+                if BatchCallback is not None and (len(Records) - ReportedResults >= self.BatchSize or not PendingFolders):
+                    BatchCallback(Records[ReportedResults:], Errors[ReportedErrors:])
+                    ReportedResults, ReportedErrors = len(Records), len(Errors)
+        finally:
+            Executor.shutdown(cancel_futures = True)
+        return Records, Errors
+
+    def ReturnCancelled(self):
+        if self.CancelEvent is not None and self.CancelEvent.is_set():
+            raise InterruptedError("Operation cancelled")
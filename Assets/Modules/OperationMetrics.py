@@ -0,0 +1,181 @@
+import bisect, contextlib, cProfile, json, os, pstats, threading, time
+from collections import deque
+from paramiko.sftp import CMD_NAMES, CMD_WRITE
+
+HISTOGRAMBUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)     #Upper bounds in seconds, slower spans land in a final overflow bucket
+
+class OperationMetrics():
+    def __init__(self, Profiling = False, TraceLimit = 0):
+        self.Profiling = Profiling      #Jobs run under cProfile, their stats are merged into one set
+        self.MetricsLock = threading.Lock()
+        self.Histograms = {}        #Operation -> count, total, maximum and bucket counts
+        self.Counters = {}
+        self.Trace = deque(maxlen = TraceLimit) if TraceLimit else None     #Latest spans, exported in the Chrome trace event format
+        self.ProfileStats = None
+        self.StartTime, self.StartCounter = time.time(), time.perf_counter()
+
+    @contextlib.contextmanager
+    def Span(self, Operation):
+        StartCounter = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.Observe(Operation, time.perf_counter() - StartCounter, StartCounter)
+
+    def Observe(self, Operation, Seconds, StartCounter = None):
+        with self.MetricsLock:
+            Histogram = self.Histograms.get(Operation)
+            if Histogram is None:
+                Histogram = self.Histograms[Operation] = {
+                    "Count" : 0,
+                    "Total Seconds" : 0.0,
+                    "Maximum Seconds" : 0.0,
+                    "Buckets" : [0] * (len(HISTOGRAMBUCKETS) + 1)
+                }
+            Histogram["Count"] += 1
+            Histogram["Total Seconds"] += Seconds
+            Histogram["Maximum Seconds"] = max(Histogram["Maximum Seconds"], Seconds)
+            Histogram["Buckets"][bisect.bisect_left(HISTOGRAMBUCKETS, Seconds)] += 1
+            if self.Trace is not None and StartCounter is not None:
+                self.Trace.append((Operation, StartCounter, Seconds, threading.get_ident()))
+
+    def Count(self, Name, Amount = 1):
+        with self.MetricsLock:
+            self.Counters[Name] = self.Counters.get(Name, 0) + Amount
+
+    @contextlib.contextmanager
+    def Profile(self):
+        #From Python 3.12 a single profiler sees every thread and a second one cannot start, jobs running beside a profiled one are covered by it
+        Profiler = cProfile.Profile() if self.Profiling else None
+        try:
+            if Profiler is not None:
+                Profiler.enable()
+        except ValueError:
+            Profiler = None
+        try:
+            yield
+        finally:
+            if Profiler is not None:
+                Profiler.disable()
+                self.AddProfile(Profiler)
+
+    def AddProfile(self, Profiler):
+        try:
+            with self.MetricsLock:
+                if self.ProfileStats is None:
+                    self.ProfileStats = pstats.Stats(Profiler)
+                else:
+                    self.ProfileStats.add(Profiler)
+        except TypeError:       #Nothing ran under the profiler
+            pass
+
+    def MeterChannel(self, Channel):
+        #Every request on the session is counted by type, the blocking ones are timed as one round trip each
+        AsyncRequest, Request, ReadPacket = Channel._async_request, Channel._request, Channel._read_packet
+        def MeteredAsyncRequest(FileObject, RequestType, *Arguments):
+            with self.MetricsLock:
+                for Name, Amount in (("SFTP Requests", 1), (f"SFTP {CMD_NAMES.get(RequestType, RequestType).title()} Requests", 1),
+                                     ("SFTP Bytes Written", len(Arguments[2]) if RequestType == CMD_WRITE else 0)):
+                    self.Counters[Name] = self.Counters.get(Name, 0) + Amount
+            return AsyncRequest(FileObject, RequestType, *Arguments)
+        def MeteredRequest(RequestType, *Arguments):
+            with self.Span(f"SFTP {CMD_NAMES.get(RequestType, RequestType).title()}"):
+                return Request(RequestType, *Arguments)
+        def MeteredReadPacket():
+            PacketType, Data = ReadPacket()
+            self.Count("SFTP Bytes Received", len(Data))
+            return PacketType, Data
+        Channel._async_request, Channel._request, Channel._read_packet = MeteredAsyncRequest, MeteredRequest, MeteredReadPacket
+        return Channel
+
+    def Reset(self):
+        with self.MetricsLock:
+            self.Histograms, self.Counters, self.ProfileStats = {}, {}, None
+            if self.Trace is not None:
+                self.Trace.clear()
+            self.StartTime, self.StartCounter = time.time(), time.perf_counter()
+
+    def ReturnSnapshot(self):
+        with self.MetricsLock:
+            Histograms = {Operation : dict(Histogram, Buckets = list(Histogram["Buckets"])) for Operation, Histogram in self.Histograms.items()}
+            Counters = dict(self.Counters)
+        Operations = {}
+        for Operation, Histogram in sorted(Histograms.items(), key = lambda Item: -Item[1]["Total Seconds"]):       #Where the time went comes first
+            Operations[Operation] = {
+                "Count" : Histogram["Count"],
+                "Total Seconds" : Histogram["Total Seconds"],
+                "Mean Seconds" : Histogram["Total Seconds"] / Histogram["Count"],
+                "P50 Seconds" : self.ReturnPercentile(Histogram, 0.5),
+                "P95 Seconds" : self.ReturnPercentile(Histogram, 0.95),
+                "P99 Seconds" : self.ReturnPercentile(Histogram, 0.99),
+                "Maximum Seconds" : Histogram["Maximum Seconds"],
+                "Buckets" : dict(zip([str(Bound) for Bound in HISTOGRAMBUCKETS] + ["+Inf"], Histogram["Buckets"]))
+            }
+        return {
+            "Started" : time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(self.StartTime)),
+            "Elapsed Seconds" : time.perf_counter() - self.StartCounter,
+            "Operations" : Operations,
+            "Counters" : dict(sorted(Counters.items()))
+        }
+
+    def ReturnPercentile(self, Histogram, Fraction):
+        #Interpolated inside the bucket the rank falls in, close enough to tell a slow tail from a slow median
+        Rank, Seen, LowerBound = Fraction * Histogram["Count"], 0, 0.0
+        for Index, BucketCount in enumerate(Histogram["Buckets"]):
+            UpperBound = HISTOGRAMBUCKETS[Index] if Index < len(HISTOGRAMBUCKETS) else Histogram["Maximum Seconds"]
+            if BucketCount and Seen + BucketCount >= Rank:
+                return min(LowerBound + (UpperBound - LowerBound) * (Rank - Seen) / BucketCount, Histogram["Maximum Seconds"])
+            Seen, LowerBound = Seen + BucketCount, UpperBound
+        return Histogram["Maximum Seconds"]
+
+    def ReturnPrometheusText(self):
+        Snapshot = self.ReturnSnapshot()
+        Lines = [
+            "# HELP qtsftp_operation_seconds Time spent per client operation",
+            "# TYPE qtsftp_operation_seconds histogram"
+        ]
+        for Operation, Statistics in Snapshot["Operations"].items():
+            Label, Cumulative = Operation.replace("\\", "\\\\").replace("\"", "\\\""), 0
+            for Bound, BucketCount in Statistics["Buckets"].items():
+                Cumulative += BucketCount
+                Lines.append(f"qtsftp_operation_seconds_bucket{{operation=\"{Label}\",le=\"{Bound}\"}} {Cumulative}")
+            Lines.append(f"qtsftp_operation_seconds_sum{{operation=\"{Label}\"}} {Statistics["Total Seconds"]:.6f}")
+            Lines.append(f"qtsftp_operation_seconds_count{{operation=\"{Label}\"}} {Statistics["Count"]}")
+        for Name, Value in Snapshot["Counters"].items():
+            MetricName = "qtsftp_" + "_".join(Name.lower().split()) + "_total"
+            Lines.extend([f"# TYPE {MetricName} counter", f"{MetricName} {Value}"])
+        return "\n".join(Lines) + "\n"
+
+    def ReturnTraceEvents(self):
+        with self.MetricsLock:
+            Trace = list(self.Trace) if self.Trace is not None else []
+        return {
+            "traceEvents" : [{
+                "name" : Operation,
+                "ph" : "X",
+                "ts" : round((StartCounter - self.StartCounter) * 1000000),
+                "dur" : round(Seconds * 1000000),
+                "pid" : os.getpid(),
+                "tid" : ThreadIdent
+            } for Operation, StartCounter, Seconds, ThreadIdent in Trace]
+        }
+
+    def Export(self, ExportPath):
+        #'.prom' or '.txt' writes Prometheus text, anything else JSON, the profile and trace go alongside when there are any
+        os.makedirs(os.path.dirname(os.path.abspath(ExportPath)), exist_ok = True)
+        BasePath = os.path.splitext(ExportPath)[0]
+        with open(ExportPath, "w") as ExportFile:
+            if ExportPath.endswith((".prom", ".txt")):
+                ExportFile.write(self.ReturnPrometheusText())
+            else:
+                json.dump(self.ReturnSnapshot(), ExportFile, indent = 2)
+        ExportedPaths = [ExportPath]
+        if self.Trace:
+            with open(f"{BasePath}.trace.json", "w") as TraceFile:
+                json.dump(self.ReturnTraceEvents(), TraceFile)
+            ExportedPaths.append(f"{BasePath}.trace.json")
+        with self.MetricsLock:
+            if self.ProfileStats is not None:
+                self.ProfileStats.dump_stats(f"{BasePath}.pstats")
+                ExportedPaths.append(f"{BasePath}.pstats")
+        return ExportedPaths
@@ -1,386 +1,470 @@
-""" 
-    File Encryption Module
-
-    Bugs
-        -N/A
-
-    Required Software
-        -Python 
-            -Version >= 3.6
-            -Installation: https://www.python.org/downloads/
-        -Python Modules
-            -Cryptodomex 
-                -Purpose: 256-Bit AES
-                -Installation: https://pypi.org/project/pycryptodomex/
-            -BeautifulSoup
-                -Purpose: XML Processing
-                -Installation: https://pypi.org/project/beautifulsoup4/
-
-    Methods
-        -ProcessFile
-            -Main Method
-            -Decrypts a given file, checks for existance the local variable AESAttr 
-                -Returns value pair(s) of given JSON/XML data if keyword is found
-        -FetchTextList 
-            -Gets the first children of a given JSON keyword
-        -EncryptDirectory
-            -Encrypts a given directory with local variable AES key
-        -DecryptDirectory
-            -Decrypts a given directory with local variable AES key
-        -EncryptFile
-            -Encrypts a given file with AES 256
-            -Supports: [.txt, .json, .xml, .jpg, .jpeg, .png, .pdf]
-        -DecryptFile
-            -Decrypts a given file with AES256
-            -Supports: [.txt, .json, .xml, .jpg, .jpeg, .png, .pdf]
-        -DecryptText
-            -Decrypts the given file contents and returns them
-            -Supports: [.json]
-"""
-
-import sys
-import os
-import logging
-import pathlib
-import subprocess
-import time
-import json
-from collections import defaultdict
-from Cryptodome.Cipher import AES
-from math import sqrt, ceil
-from bs4 import BeautifulSoup 
-
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-
-class FileEncryption():
-    AESKey = None
-    AESAttr = None
-
-    def __init__(self):
-        pass
-    
-    def ChangeKeyToBytes(self, NewKey):
-        self.AESKey = bytes(NewKey, "utf-8")
-            
-    def ChangeAttr(self, NewAttr):
-        self.AESAttr = NewAttr 
-
-    def ReturnKeyAsStringFromBytes(self):
-        return self.AESKey.decode('UTF-8')
-
-    def OpenAppCrossplatform(self, Dir):
-        if sys.platform == "win32":
-            os.startfile(Dir)
-        if sys.platform == 'linux':
-            subprocess.call(('xdg-open ' + Dir), shell=True)
-
-    def ValidateKey(self, Path):
-        try:
-            with open(Path, "rb") as File:
-                Nonce, Tag, CipherText = [File.read(x) for x in (16, 16, -1)]
-                CipherObject = AES.new(self.AESKey, AES.MODE_EAX, Nonce)
-                CipherObject.decrypt_and_verify(CipherText, Tag)
-                return 0
-        except Exception as Error:
-            return -1
-
-    def DeterminePotentialKeyMatch(self, Values, Keyword, Path):
-        if(Path.lower().endswith(".json")):    #File to encrypt is a .json
-            for key, value in Values.items():
-                if key.lower().replace("'", "").replace("`", "").strip() == Keyword:
-                    return {'Key' : key, 'Values' : value}
-        elif(Path.lower().endswith(".xml")):   #File to encrypt is an .xml
-            Keywords = str(Values.findAll(Keyword)[0]).splitlines()[1:-1]   #Get keyword list
-            Values = {}
-            if Keywords:
-                for i in Keywords:
-                    IndKey = i[i.index('<')+len('<'):i.index(' value=')]      #Get keyword
-                    IndValue = i[i.index('>')+len('>'):i.index('</')]         #Get value
-                    Values.update({
-                        IndKey: IndValue
-                    })
-                return {'Key' : Keyword, 'Values' : Values}
-            
-    def DetermineListItems(self, RawData, Path):
-        if(Path.lower().endswith(".json")):    #File to encrypt is a .json
-            return {key: val for key, val in sorted(RawData.items(), key = lambda ele: ele[0])}
-        elif(Path.lower().endswith(".xml")):   #File to encrypt is an .xml
-            Tags = str(RawData.findAll("nodes")).splitlines()[1:-1]       #Get all tags
-            Keywords = [x[x.index('<')+len('<'):x.index('value')].strip() for x in Tags if 'value="0' in x]
-            return {key: {} for key in sorted(Keywords)}
-                
-    def DetermineTextEncryption(self, Text):
-        Score = defaultdict(lambda: 0)
-        for L in Text: 
-            Score[L] += 1
-        Largest = max(Score.values())
-        Average = len(Text) / 256.0
-        return Largest < Average + 5 * sqrt(Average)
-
-    def ProcessFile(self, Path):
-        try:
-            FileTextList = self.DecryptText(Path)
-            if FileTextList is not None:
-                logging.info("Searching for keyword ...")
-                DesiredKeywordFormatted = self.AESAttr.lower().replace("'", "").replace("`", "").strip()
-                DesiredKeywordPair = self.DeterminePotentialKeyMatch(FileTextList, DesiredKeywordFormatted, Path)
-                if DesiredKeywordPair:
-                    if isinstance(DesiredKeywordPair["Values"], dict):       #Multiple Values
-                        LoggingString = DesiredKeywordPair["Key"] + " pair(s) found: "
-                        for i, (key, value) in enumerate(DesiredKeywordPair["Values"].items()):
-                            SplitterStr = " <> " if i != len(DesiredKeywordPair["Values"]) - 1 else ""
-                            LoggingString += ("[" + key + " - " + value + "]" + SplitterStr)
-                        logging.info(LoggingString)
-                    elif isinstance(DesiredKeywordPair["Values"], str):      #Single Value
-                        logging.info("Pair found: [" + DesiredKeywordPair["Key"] + " - " + DesiredKeywordPair["Values"] + "]")
-                    else:
-                        raise Exception("Invalid value type: " + type(DesiredKeywordPair["Values"]))
-                else:
-                    logging.error("Attribute '" + self.AESAttr + "' not found in file")
-        except Exception as GeneralException:
-            logging.error(GeneralException)
-
-    def FetchTextList(self, Path):                                           #Only pulls the highest parent keys
-        try:
-            FileTextList = self.DecryptText(Path)
-            if FileTextList is not None:
-                FileTextListSorted = self.DetermineListItems(FileTextList, Path)
-                print(Path)
-                for key, value in FileTextListSorted.items():
-                    LineIcon = "└── " if list(FileTextListSorted)[-1] == key else "├── "
-                    print(LineIcon + key.replace("`", "").replace("*", "").replace("'", ""))
-                print("1 file, " + str(len(FileTextListSorted)) + " field(s)")
-        except Exception as GeneralException:
-            logging.error(GeneralException)
-            
-    def EncryptDirectory(self, Directory):
-        StartTime = time.time()
-        try:
-            for subdir, dirs, files in os.walk(Directory):
-                fileName = pathlib.PurePath(subdir)
-                logging.info("Working in folder '" + fileName.name + "' ...")
-                for file in files:
-                    fileName = pathlib.PurePath(os.path.join(subdir, file))
-                    logging.info("Encrypting '" + fileName.name + "' ...")
-                    self.EncryptFile((os.path.join(subdir, file)).replace("\\", "/"), False)
-            logging.info("Encryption for directory '" + Directory + "' completed")
-            logging.info("Time elapsed: " + str(ceil((time.time() - StartTime) * 100) / 100.0) + " sec(s)")
-        except IOError:
-            FileSplit = pathlib.PurePath(fileName)
-            logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-        except Exception as General_Exception:
-            logging.error(General_Exception)
-            
-    def DecryptDirectory(self, Directory):
-        StartTime = time.time()
-        try:
-            for subdir, dirs, files in os.walk(Directory):
-                fileName = pathlib.PurePath(subdir)
-                logging.info("Working in folder '" + fileName.name + "' ...")
-                for file in files:
-                    fileName = pathlib.PurePath(os.path.join(subdir, file))
-                    logging.info("Decrypting '" + fileName.name + "' ...")
-                    self.DecryptFile((os.path.join(subdir, file)).replace("\\", "/"), False, False)
-            logging.info("Decryption for directory '" + Directory + "' completed")
-            logging.info("Time elapsed: " + str(ceil((time.time() - StartTime) * 100) / 100.0) + " sec(s)")
-        except IOError:
-            FileSplit = pathlib.PurePath(fileName)
-            logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-        except Exception as GeneralException:
-            logging.error(GeneralException)
-
-    def EncryptFile(self, Path, Verbose):
-        if (os.path.getsize(Path) > 0):
-            if(Path.lower().endswith(".json")):  #File to encrypt is a .json
-                try:
-                    logging.info("Reading in data ...")   if Verbose else None
-                    with open(Path, "rb") as File:
-                        if self.DetermineTextEncryption(File.read()):
-                            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already encrypted")
-                    with open(Path, "r") as File:
-                        JSONData = json.load(File)
-                        JSONDataFormatted = json.dumps(JSONData, indent=2).encode('utf-8')
-                    with open(Path, "wb") as File:
-                        logging.info("Encrypting file ...")   if Verbose else None
-                        CipherObject = AES.new(self.AESKey, AES.MODE_EAX)
-                        CipherText, Tag = CipherObject.encrypt_and_digest(JSONDataFormatted)
-                        [ File.write(x) for x in (CipherObject.nonce, Tag, CipherText) ]
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except ValueError as ValueException:
-                    logging.error(ValueException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-
-            elif(Path.lower().endswith((".txt", ".xml", ".csv"))):      #File to decrypt is a basic text file or mark up language
-                try:
-                    logging.info("Reading in data ...")   if Verbose else None
-                    with open(Path, "rb") as File:
-                        if self.DetermineTextEncryption(File.read()):
-                            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already encrypted")
-                    with open(Path, "r") as File:
-                        TextData = File.read()
-                        TextDataFormatted = TextData.encode('utf-8')
-                    with open(Path, "wb") as File:
-                        logging.info("Encrypting file ...")   if Verbose else None
-                        CipherObject = AES.new(self.AESKey, AES.MODE_EAX)
-                        CipherText, Tag = CipherObject.encrypt_and_digest(TextDataFormatted)
-                        [ File.write(x) for x in (CipherObject.nonce, Tag, CipherText) ]
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except ValueError as ValueException:
-                    logging.error(ValueException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-
-            elif(Path.lower().endswith((".jpg", ".jpeg", ".png", ".pdf"))):        #File to decrypt is an image
-                try:
-                    logging.info("Reading in data ...")  if Verbose else None
-                    with open(Path, "rb") as File:
-                        BytesImage = File.read()
-                    logging.info("Encrypting file ...")  if Verbose else None
-                    Key, RawData = self.AESKey[:len(self.AESKey)], BytesImage[:len(BytesImage)]
-                    Swap = int.from_bytes(RawData, sys.byteorder) ^ int.from_bytes(Key, sys.byteorder)     #XOR swap with AES key
-                    EncryptedImage = Swap.to_bytes(len(RawData), sys.byteorder)                    
-                    with open(Path, "wb") as File:
-                        File.write(EncryptedImage)
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-
-            else:                                     #File to encrypt is not supported
-                logging.error("File extension was not supported: " + os.path.splitext(Path)[1])
-
-        else: 
-            logging.error("Cannot process empty files")
-
-    def DecryptFile(self, Path, Verbose, Open):
-        if (os.path.getsize(Path) > 0):
-            if(Path.lower().endswith(".json")):        #File to decrypt is a .json
-                try:
-                    logging.info("Reading in data ...") if Verbose else None
-                    with open(Path, "rb") as File:
-                        if not self.DetermineTextEncryption(File.read()):
-                            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already decrypted")
-                    logging.info("Validating key ...") if Verbose else None
-                    if self.ValidateKey(Path) == -1:
-                        raise Exception('Invalid encryption key')
-                    with open(Path, "rb") as File:
-                        Nonce, Tag, CipherText = [File.read(x) for x in (16, 16, -1)]
-                    with open(Path, "w") as File:
-                        logging.info("Decrypting file ...") if Verbose else None
-                        CipherObject = AES.new(self.AESKey, AES.MODE_EAX, Nonce)
-                        Raw = (CipherObject.decrypt_and_verify(CipherText, Tag))
-                        JSONData = json.loads(Raw.decode("utf8"))
-                        json.dump(JSONData, File)
-                    if(Open):                               #Open the file if applicable
-                        logging.info("Opening file ...") if Verbose else None
-                        self.OpenAppCrossplatform(Path)
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except ValueError as ValueException:
-                    logging.error(ValueException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-
-            elif(Path.lower().endswith((".txt", ".xml", ".csv"))):      #File to decrypt is a basic text file or mark up language
-                try:
-                    logging.info("Reading in data ...") if Verbose else None
-                    with open(Path, "rb") as File:
-                        if not self.DetermineTextEncryption(File.read()):
-                            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already decrypted")
-                    logging.info("Validating key ...") if Verbose else None
-                    if self.ValidateKey(Path) == -1:
-                        raise Exception('Invalid encryption key')
-                    with open(Path, "rb") as File:
-                        Nonce, Tag, CipherText = [File.read(x) for x in (16, 16, -1)]
-                    with open(Path, "w") as File:
-                        logging.info("Decrypting file ...") if Verbose else None
-                        CipherObject = AES.new(self.AESKey, AES.MODE_EAX, Nonce)
-                        Raw = (CipherObject.decrypt_and_verify(CipherText, Tag)).decode("utf8")
-                        File.write(Raw)
-                    if(Open):                               #Open the file if applicable
-                        logging.info("Opening file ...") if Verbose else None
-                        self.OpenAppCrossplatform(Path)
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except ValueError as ValueException:
-                    logging.error(ValueException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-                    
-            elif(Path.lower().endswith((".jpg", ".jpeg", ".png", ".pdf"))):        #File to decrypt is an image
-                try:
-                    logging.info("Reading in data ...")  if Verbose else None
-                    with open(Path, "rb") as File:
-                        BytesImage = File.read()
-                    logging.info("Decrypting file ...")   if Verbose else None
-                    Key, RawData = self.AESKey[:len(self.AESKey)], BytesImage[:len(BytesImage)]
-                    Swap = int.from_bytes(RawData, sys.byteorder) ^ int.from_bytes(Key, sys.byteorder)      #XOR swap with AES key
-                    DecryptedImage = Swap.to_bytes(len(RawData), sys.byteorder)                    
-                    with open(Path, "wb") as File:
-                        File.write(DecryptedImage)
-                except IOError:
-                    FileSplit = pathlib.PurePath(Path)
-                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-                except UnicodeDecodeError as UnicodeException:
-                    logging.error(UnicodeException)
-                except Exception as GeneralException:
-                    logging.error(GeneralException)
-            else:                                     #File to decrypt is not supported
-                logging.error("File extension was not supported: " + os.path.splitext(Path)[1])
-        else: 
-            logging.error("Cannot process empty files")
-
-    def DecryptText(self, Path):
-        ReturnData = None
-        if (os.path.getsize(Path) > 0):
-            try:
-                logging.info("Reading in data ...")
-                with open(Path, "rb") as File:
-                    if not self.DetermineTextEncryption(File.read()):
-                        raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already decrypted")
-                logging.info("Validating key ...") 
-                if self.ValidateKey(Path) == -1:
-                    raise Exception('Invalid encryption key')
-                with open(Path, "rb") as File:
-                    Nonce, Tag, CipherText = [File.read(x) for x in (16, 16, -1)]
-                with open(Path, "r") as File:
-                    logging.info("Decrypting file ...") 
-                    CipherObject = AES.new(self.AESKey, AES.MODE_EAX, Nonce)
-                    Raw = (CipherObject.decrypt_and_verify(CipherText, Tag))
-                    if (Path.lower().endswith(".json")):
-                        ReturnData = json.loads(Raw.decode("utf8"))                    #Returns JSON object
-                    elif (Path.lower().endswith(".xml")):
-                        ReturnData = BeautifulSoup(Raw, "xml")                         #Returns XML object
-                    else:
-                        logging.error("File extension was not supported: " + os.path.splitext(Path)[1])  
-                return ReturnData                     
-            except IOError as E:
-                FileSplit = pathlib.PurePath(Path)
-                logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
-            except UnicodeDecodeError as UnicodeException:
-                logging.error(UnicodeException)
-            except ValueError as ValueException:
-                logging.error(ValueException)
-            except Exception as GeneralException:
-                logging.error(GeneralException)
-        else: 
-            logging.error("Cannot process empty files")
+""" 
+    File Encryption Module
+
+    Bugs
+        -N/A
+
+    Required Software
+        -Python 
+            -Version >= 3.6
+            -Installation: https://www.python.org/downloads/
+        -Python Modules
+            -Cryptodomex 
+                -Purpose: 256-Bit AES
+                -Installation: https://pypi.org/project/pycryptodomex/
+            -BeautifulSoup
+                -Purpose: XML Processing
+                -Installation: https://pypi.org/project/beautifulsoup4/
+
+    Methods
+        -ProcessFile
+            -Main Method
+            -Decrypts a given file, checks for existance the local variable AESAttr 
+                -Returns value pair(s) of given JSON/XML data if keyword is found
+        -FetchTextList 
+            -Gets the first children of a given JSON keyword
+        -EncryptDirectory
+            -Encrypts a given directory with local variable AES key
+            -Files are spread over a process pool (one process per core unless given), balanced by size
+            -Failed files are collected and summarised at the end, they never stop the rest of the directory
+        -DecryptDirectory
+            -Decrypts a given directory with local variable AES key, in parallel like EncryptDirectory
+        -EncryptFile
+            -Encrypts a given file with AES 256 GCM, streamed in fixed size authenticated chunks
+            -Supports: [.txt, .json, .xml, .csv, .jpg, .jpeg, .png, .pdf]
+        -DecryptFile
+            -Decrypts a given file with AES256
+            -Reads the streaming format and files written before it
+            -Supports: [.txt, .json, .xml, .csv, .jpg, .jpeg, .png, .pdf]
+        -DecryptText
+            -Decrypts the given file contents and returns them
+            -Supports: [.json, .xml]
+
+    Streaming Format (Version 2)
+        -Header: 'PYAES\\0', version byte, chunk size (4 bytes), nonce prefix (8 bytes)
+        -Chunks: ciphertext followed by a 16 byte GCM tag, the nonce is the prefix plus the chunk index
+            -Header, chunk index and a last chunk flag are authenticated with every chunk
+        -Files are written to a temporary file beside the original and renamed over it
+"""
+
+import sys
+import os
+import logging
+import pathlib
+import subprocess
+import time
+import json
+import struct
+import shutil
+import tempfile
+import concurrent.futures
+from collections import defaultdict, Counter
+from Cryptodome.Cipher import AES
+from Cryptodome.Random import get_random_bytes
+from math import sqrt, ceil
+from bs4 import BeautifulSoup 
+
+logger = logging.getLogger()
+logger.setLevel(logging.DEBUG)
+
+STREAMMAGIC = b"PYAES\x00"                             #Marks the streaming format, legacy files start with a random nonce
+STREAMVERSION = 2
+STREAMHEADER = struct.Struct(">6sBI8s")                #Magic, version, chunk size, nonce prefix
+CHUNKSIZE = 1048576                                    #Plaintext bytes per authenticated chunk, memory use stays near two of these
+CHUNKTAGSIZE = 16
+LEGACYSAMPLESIZE = 65536                               #Bytes scored when telling a legacy encrypted text file from plain text
+TEXTEXTENSIONS = (".json", ".txt", ".xml", ".csv")
+SUPPORTEDEXTENSIONS = TEXTEXTENSIONS + (".jpg", ".jpeg", ".png", ".pdf")
+DIRECTORYBATCHBYTES = 67108864                         #Bytes of small files handed to a worker process at once
+DIRECTORYBATCHFILES = 256                              #Files handed to a worker process at once
+DIRECTORYPROGRESSINTERVAL = 5                          #Seconds between progress lines while a directory is processed
+DIRECTORYERRORLIMIT = 20                               #Failed files listed one by one in the summary
+
+class FileEncryption():
+    AESKey = None
+    AESAttr = None
+
+    def __init__(self):
+        pass
+    
+    def ChangeKeyToBytes(self, NewKey):
+        self.AESKey = bytes(NewKey, "utf-8")
+            
+    def ChangeAttr(self, NewAttr):
+        self.AESAttr = NewAttr 
+
+    def ReturnKeyAsStringFromBytes(self):
+        return self.AESKey.decode('UTF-8')
+
+    def OpenAppCrossplatform(self, Dir):
+        if sys.platform == "win32":
+            os.startfile(Dir)
+        if sys.platform == 'linux':
+            subprocess.call(('xdg-open ' + Dir), shell=True)
+
+    def ValidateKey(self, Path):
+        try:
+            if self.ReturnStreamHeader(Path) is None and not Path.lower().endswith(TEXTEXTENSIONS):
+                return 0                                #Legacy images were XOR swapped, there is nothing to authenticate
+            with open(Path, "rb") as File:
+                if self.ReturnStreamHeader(Path) is not None:
+                    list(self.IterateDecryptedChunks(File, 1))      #The first chunk is enough to prove the key
+                else:
+                    self.ReturnLegacyText(File)
+                return 0
+        except Exception as Error:
+            return -1
+
+    def DeterminePotentialKeyMatch(self, Values, Keyword, Path):
+        if(Path.lower().endswith(".json")):    #File to encrypt is a .json
+            for key, value in Values.items():
+                if key.lower().replace("'", "").replace("`", "").strip() == Keyword:
+                    return {'Key' : key, 'Values' : value}
+        elif(Path.lower().endswith(".xml")):   #File to encrypt is an .xml
+            Keywords = str(Values.findAll(Keyword)[0]).splitlines()[1:-1]   #Get keyword list
+            Values = {}
+            if Keywords:
+                for i in Keywords:
+                    IndKey = i[i.index('<')+len('<'):i.index(' value=')]      #Get keyword
+                    IndValue = i[i.index('>')+len('>'):i.index('</')]         #Get value
+                    Values.update({
+                        IndKey: IndValue
+                    })
+                return {'Key' : Keyword, 'Values' : Values}
+            
+    def DetermineListItems(self, RawData, Path):
+        if(Path.lower().endswith(".json")):    #File to encrypt is a .json
+            return {key: val for key, val in sorted(RawData.items(), key = lambda ele: ele[0])}
+        elif(Path.lower().endswith(".xml")):   #File to encrypt is an .xml
+            Tags = str(RawData.findAll("nodes")).splitlines()[1:-1]       #Get all tags
+            Keywords = [x[x.index('<')+len('<'):x.index('value')].strip() for x in Tags if 'value="0' in x]
+            return {key: {} for key in sorted(Keywords)}
+                
+    def DetermineTextEncryption(self, Text):
+        Score = Counter(Text)                               #Counted in C, a per byte Python loop dominated small file runs
+        Largest = max(Score.values())
+        Average = len(Text) / 256.0
+        return Largest < Average + 5 * sqrt(Average)
+
+    def ProcessFile(self, Path):
+        try:
+            FileTextList = self.DecryptText(Path)
+            if FileTextList is not None:
+                logging.info("Searching for keyword ...")
+                DesiredKeywordFormatted = self.AESAttr.lower().replace("'", "").replace("`", "").strip()
+                DesiredKeywordPair = self.DeterminePotentialKeyMatch(FileTextList, DesiredKeywordFormatted, Path)
+                if DesiredKeywordPair:
+                    if isinstance(DesiredKeywordPair["Values"], dict):       #Multiple Values
+                        LoggingString = DesiredKeywordPair["Key"] + " pair(s) found: "
+                        for i, (key, value) in enumerate(DesiredKeywordPair["Values"].items()):
+                            SplitterStr = " <> " if i != len(DesiredKeywordPair["Values"]) - 1 else ""
+                            LoggingString += ("[" + key + " - " + value + "]" + SplitterStr)
+                        logging.info(LoggingString)
+                    elif isinstance(DesiredKeywordPair["Values"], str):      #Single Value
+                        logging.info("Pair found: [" + DesiredKeywordPair["Key"] + " - " + DesiredKeywordPair["Values"] + "]")
+                    else:
+                        raise Exception("Invalid value type: " + type(DesiredKeywordPair["Values"]))
+                else:
+                    logging.error("Attribute '" + self.AESAttr + "' not found in file")
+        except Exception as GeneralException:
+            logging.error(GeneralException)
+
+    def FetchTextList(self, Path):                                           #Only pulls the highest parent keys
+        try:
+            FileTextList = self.DecryptText(Path)
+            if FileTextList is not None:
+                FileTextListSorted = self.DetermineListItems(FileTextList, Path)
+                print(Path)
+                for key, value in FileTextListSorted.items():
+                    LineIcon = "└── " if list(FileTextListSorted)[-1] == key else "├── "
+                    print(LineIcon + key.replace("`", "").replace("*", "").replace("'", ""))
+                print("1 file, " + str(len(FileTextListSorted)) + " field(s)")
+        except Exception as GeneralException:
+            logging.error(GeneralException)
+            
+    def EncryptDirectory(self, Directory, Processes = None):
+        return self.ProcessDirectory(Directory, "Encrypt", Processes)
+
+    def DecryptDirectory(self, Directory, Processes = None):
+        return self.ProcessDirectory(Directory, "Decrypt", Processes)
+
+    def ProcessDirectory(self, Directory, Action, Processes = None):
+        StartTime = time.time()
+        try:
+            Files, Skipped = self.ReturnDirectoryFiles(Directory)
+            TotalBytes = sum(Size for _, Size in Files)
+            Processes = Processes or os.cpu_count() or 1
+            logging.info(Action + "ing " + str(len(Files)) + " file(s), " + self.ReturnSizeString(TotalBytes) + " in '" + Directory + "' on " + str(Processes) + " process(es) ...")
+            Results, Errors, DoneBytes, LastReport = defaultdict(lambda: 0), [], 0, time.time()
+            for BatchResults in self.IterateDirectoryResults(Action, self.ReturnDirectoryBatches(Files), Processes):
+                for Path, Size, Result in BatchResults:        #One batch fails file by file, the rest of the directory carries on
+                    Results["Skipped" if Result == "Skipped" else "Failed" if Result is not None else "Succeeded"] += 1
+                    if Result not in (None, "Skipped"):
+                        Errors.append((Path, Result))
+                    DoneBytes += Size
+                if time.time() - LastReport >= DIRECTORYPROGRESSINTERVAL:
+                    LastReport = time.time()
+                    logging.info(Action + "ed " + str(sum(Results.values())) + " of " + str(len(Files)) + " file(s), " + self.ReturnSizeString(DoneBytes) + " of " + self.ReturnSizeString(TotalBytes) + \
+                        " (" + self.ReturnSizeString(DoneBytes / max(LastReport - StartTime, 0.001)) + "/s)")
+            Elapsed = time.time() - StartTime
+            logging.info(Action + "ion for directory '" + Directory + "' completed: " + str(Results["Succeeded"]) + " succeeded, " + str(Results["Failed"]) + " failed, " + \
+                str(Results["Skipped"] + Skipped) + " skipped")
+            logging.info("Time elapsed: " + str(ceil(Elapsed * 100) / 100.0) + " sec(s), " + self.ReturnSizeString(DoneBytes / max(Elapsed, 0.001)) + "/s")
+            for Path, Error in Errors[:DIRECTORYERRORLIMIT]:
+                logging.error("'" + Path + "': " + Error)
+            if len(Errors) > DIRECTORYERRORLIMIT:
+                logging.error("... and " + str(len(Errors) - DIRECTORYERRORLIMIT) + " more error(s)")
+            return {"Succeeded" : Results["Succeeded"], "Failed" : Errors, "Skipped" : Results["Skipped"] + Skipped}
+        except Exception as GeneralException:
+            logging.error(GeneralException)
+
+    def ReturnDirectoryFiles(self, Directory):
+        #Unsupported, empty and linked files are counted out here instead of costing a trip to a worker
+        Files, Skipped, Folders = [], 0, [Directory]
+        while Folders:
+            with os.scandir(Folders.pop()) as Entries:
+                for Entry in Entries:
+                    if Entry.is_dir(follow_symlinks = False):
+                        Folders.append(Entry.path)
+                    elif Entry.is_file(follow_symlinks = False) and Entry.name.lower().endswith(SUPPORTEDEXTENSIONS) and Entry.stat(follow_symlinks = False).st_size > 0:
+                        Files.append((Entry.path.replace("\\", "/"), Entry.stat(follow_symlinks = False).st_size))
+                    else:
+                        Skipped += 1
+        return Files, Skipped
+
+    def ReturnDirectoryBatches(self, Files):
+        #Largest first, small files grouped so each task carries a similar amount of work and idle processes pick up the next one
+        Batch, BatchBytes = [], 0
+        for Path, Size in sorted(Files, key = lambda File: File[1], reverse = True):
+            if Batch and (BatchBytes + Size > DIRECTORYBATCHBYTES or len(Batch) >= DIRECTORYBATCHFILES):
+                yield Batch
+                Batch, BatchBytes = [], 0
+            Batch.append((Path, Size))
+            BatchBytes += Size
+        if Batch:
+            yield Batch
+
+    def IterateDirectoryResults(self, Action, Batches, Processes):
+        if Processes == 1:
+            for Batch in Batches:
+                yield self.ProcessDirectoryBatch(Action, Batch)
+            return
+        with concurrent.futures.ProcessPoolExecutor(max_workers = Processes) as Executor:
+            for Future in concurrent.futures.as_completed([Executor.submit(self.ProcessDirectoryBatch, Action, Batch) for Batch in Batches]):
+                yield Future.result()
+
+    def ProcessDirectoryBatch(self, Action, Batch):
+        #Runs in a worker process, errors come back as text so nothing unpicklable crosses the process boundary
+        Results = []
+        for Path, Size in Batch:
+            try:
+                if Action == "Encrypt" and self.ReturnStreamHeader(Path) is not None:
+                    Results.append((Path, Size, "Skipped"))
+                    continue
+                self.EncryptFileContents(Path, False) if Action == "Encrypt" else self.DecryptFileContents(Path, False)
+                Results.append((Path, Size, None))
+            except Exception as GeneralException:
+                Results.append((Path, Size, type(GeneralException).__name__ + ": " + str(GeneralException)))
+        return Results
+
+    def ReturnSizeString(self, Size):
+        for Unit in ("B", "KB", "MB", "GB"):
+            if Size < 1024:
+                break
+            Size /= 1024.0
+        return str(round(Size, 1)) + " " + Unit
+
+    def EncryptFile(self, Path, Verbose):
+        if (os.path.getsize(Path) > 0):
+            if(Path.lower().endswith(SUPPORTEDEXTENSIONS)):
+                try:
+                    self.EncryptFileContents(Path, Verbose)
+                except IOError:
+                    FileSplit = pathlib.PurePath(Path)
+                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
+                except ValueError as ValueException:
+                    logging.error(ValueException)
+                except Exception as GeneralException:
+                    logging.error(GeneralException)
+            else:                                     #File to encrypt is not supported
+                logging.error("File extension was not supported: " + os.path.splitext(Path)[1])
+        else: 
+            logging.error("Cannot process empty files")
+
+    def DecryptFile(self, Path, Verbose, Open):
+        if (os.path.getsize(Path) > 0):
+            if(Path.lower().endswith(SUPPORTEDEXTENSIONS)):
+                try:
+                    self.DecryptFileContents(Path, Verbose)
+                    if(Open):                               #Open the file if applicable
+                        logging.info("Opening file ...") if Verbose else None
+                        self.OpenAppCrossplatform(Path)
+                except IOError:
+                    FileSplit = pathlib.PurePath(Path)
+                    logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
+                except ValueError as ValueException:
+                    logging.error(ValueException)
+                except Exception as GeneralException:
+                    logging.error(GeneralException)
+            else:                                     #File to decrypt is not supported
+                logging.error("File extension was not supported: " + os.path.splitext(Path)[1])
+        else: 
+            logging.error("Cannot process empty files")
+
+    def EncryptFileContents(self, Path, Verbose):
+        logging.info("Reading in data ...")   if Verbose else None
+        if self.ReturnStreamHeader(Path) is not None or (Path.lower().endswith(TEXTEXTENSIONS) and self.ReturnLegacyEncrypted(Path)):
+            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already encrypted")
+        logging.info("Encrypting file ...")   if Verbose else None
+        with open(Path, "rb") as File:
+            self.WriteFileAtomically(Path, self.IterateEncryptedChunks(File))
+
+    def DecryptFileContents(self, Path, Verbose):
+        logging.info("Reading in data ...") if Verbose else None
+        Header = self.ReturnStreamHeader(Path)
+        logging.info("Validating key ...") if Verbose else None
+        self.RaiseInvalidKey(Path, Header)
+        logging.info("Decrypting file ...") if Verbose else None
+        with open(Path, "rb") as File:
+            if Header is not None:
+                self.WriteFileAtomically(Path, self.IterateDecryptedChunks(File))
+            elif Path.lower().endswith(TEXTEXTENSIONS):         #Written before the streaming format, one EAX message for the whole file
+                self.WriteFileAtomically(Path, [self.ReturnLegacyText(File)])
+            else:
+                self.WriteFileAtomically(Path, self.IterateLegacyImageChunks(File))
+
+    def DecryptText(self, Path):
+        ReturnData = None
+        if (os.path.getsize(Path) > 0):
+            try:
+                logging.info("Reading in data ...")
+                Header = self.ReturnStreamHeader(Path)
+                logging.info("Validating key ...") 
+                self.RaiseInvalidKey(Path, Header)
+                with open(Path, "rb") as File:
+                    logging.info("Decrypting file ...") 
+                    Raw = b"".join(self.IterateDecryptedChunks(File)) if Header is not None else self.ReturnLegacyText(File)
+                if (Path.lower().endswith(".json")):
+                    ReturnData = json.loads(Raw.decode("utf8"))                    #Returns JSON object
+                elif (Path.lower().endswith(".xml")):
+                    ReturnData = BeautifulSoup(Raw, "xml")                         #Returns XML object
+                else:
+                    logging.error("File extension was not supported: " + os.path.splitext(Path)[1])  
+                return ReturnData                     
+            except IOError as E:
+                FileSplit = pathlib.PurePath(Path)
+                logging.error("IOError opening " + "'~\\" + str(FileSplit.parent.name) + "\\" + str(FileSplit.name) + "'")
+            except UnicodeDecodeError as UnicodeException:
+                logging.error(UnicodeException)
+            except ValueError as ValueException:
+                logging.error(ValueException)
+            except Exception as GeneralException:
+                logging.error(GeneralException)
+        else: 
+            logging.error("Cannot process empty files")
+
+    def ReturnStreamHeader(self, Path):
+        with open(Path, "rb") as File:
+            Header = File.read(STREAMHEADER.size)
+        if len(Header) < STREAMHEADER.size or not Header.startswith(STREAMMAGIC):
+            return None
+        Magic, Version, ChunkSize, NoncePrefix = STREAMHEADER.unpack(Header)
+        if Version != STREAMVERSION:
+            raise ValueError("File '" + pathlib.PurePath(Path).name + "' uses unknown encryption format version " + str(Version))
+        return Header
+
+    def ReturnChunkCipher(self, Header, NoncePrefix, Index, Final):
+        #Header, position and last chunk flag are authenticated with every chunk, so chunks cannot be reordered, dropped or cut off
+        CipherObject = AES.new(self.AESKey, AES.MODE_GCM, nonce = NoncePrefix + struct.pack(">I", Index), mac_len = CHUNKTAGSIZE)
+        CipherObject.update(Header + struct.pack(">IB", Index, Final))
+        return CipherObject
+
+    def IterateEncryptedChunks(self, File, ChunkSize = CHUNKSIZE):
+        NoncePrefix = get_random_bytes(8)
+        Header = STREAMHEADER.pack(STREAMMAGIC, STREAMVERSION, ChunkSize, NoncePrefix)
+        yield Header
+        Index, Data = 0, File.read(ChunkSize)
+        while True:
+            NextData = File.read(ChunkSize)         #Read one chunk ahead, the last chunk is marked as such
+            CipherText, Tag = self.ReturnChunkCipher(Header, NoncePrefix, Index, not NextData).encrypt_and_digest(Data)
+            yield CipherText + Tag
+            if not NextData:
+                return
+            Index, Data = Index + 1, NextData
+            if Index >= 2 ** 32:
+                raise ValueError("File is too large for the encryption chunk counter")
+
+    def IterateDecryptedChunks(self, File, MaximumChunks = None, BlockFunction = None):
+        #BlockFunction sees every ciphertext byte as it is read, so a caller streaming from a server can hash and count it
+        Header = File.read(STREAMHEADER.size)
+        if len(Header) < STREAMHEADER.size or not Header.startswith(STREAMMAGIC):
+            raise ValueError("Data is not in the streaming encryption format")
+        Magic, Version, ChunkSize, NoncePrefix = STREAMHEADER.unpack(Header)
+        if Version != STREAMVERSION:
+            raise ValueError("Unknown encryption format version " + str(Version))
+        BlockFunction(Header) if BlockFunction is not None else None
+        Index, Block = 0, File.read(ChunkSize + CHUNKTAGSIZE)
+        while MaximumChunks is None or Index < MaximumChunks:
+            if len(Block) < CHUNKTAGSIZE:
+                raise ValueError("Encrypted file is truncated")
+            BlockFunction(Block) if BlockFunction is not None else None
+            NextBlock = File.read(ChunkSize + CHUNKTAGSIZE)
+            yield self.ReturnChunkCipher(Header, NoncePrefix, Index, not NextBlock).decrypt_and_verify(Block[:-CHUNKTAGSIZE], Block[-CHUNKTAGSIZE:])
+            if not NextBlock:
+                return
+            Index, Block = Index + 1, NextBlock
+
+    def RaiseInvalidKey(self, Path, Header):
+        if self.ValidateKey(Path) == 0:
+            return
+        #Legacy text files carry no marker, a failed check on one that scores as plain text means it was never encrypted
+        if Header is None and not self.ReturnLegacyEncrypted(Path):
+            raise ValueError("File '" + pathlib.PurePath(Path).name + "' is already decrypted")
+        raise Exception('Invalid encryption key')
+
+    def ReturnEncryptedSize(self, FileSize, ChunkSize = CHUNKSIZE):
+        return STREAMHEADER.size + FileSize + CHUNKTAGSIZE * max(1, -(-FileSize // ChunkSize))
+
+    def ReturnLegacyEncrypted(self, Path):
+        with open(Path, "rb") as File:
+            return self.DetermineTextEncryption(File.read(LEGACYSAMPLESIZE))
+
+    def ReturnLegacyText(self, File):
+        Nonce, Tag, CipherText = [File.read(x) for x in (16, 16, -1)]
+        CipherObject = AES.new(self.AESKey, AES.MODE_EAX, Nonce)
+        return CipherObject.decrypt_and_verify(CipherText, Tag)
+
+    def IterateLegacyImageChunks(self, File):
+        #The old integer XOR only ever touched the key length of bytes at the low order end of the file
+        FileSize = os.fstat(File.fileno()).st_size
+        KeyLength = min(len(self.AESKey), FileSize)
+        KeyStart = 0 if sys.byteorder == "little" else FileSize - KeyLength
+        Key = self.AESKey[:KeyLength] if sys.byteorder == "little" else self.AESKey[-KeyLength:]
+        Offset = 0
+        while True:
+            Data = File.read(CHUNKSIZE)
+            if not Data:
+                return
+            if Offset < KeyStart + KeyLength and KeyStart < Offset + len(Data):
+                Data = bytearray(Data)
+                for Position in range(max(KeyStart, Offset), min(KeyStart + KeyLength, Offset + len(Data))):
+                    Data[Position - Offset] ^= Key[Position - KeyStart]
+                Data = bytes(Data)
+            yield Data
+            Offset += len(Data)
+
+    def WriteFileAtomically(self, Path, Chunks):
+        #Written beside the original and renamed over it, a failure part way leaves the original untouched
+        Handle, TemporaryPath = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(Path)), prefix = "." + pathlib.PurePath(Path).name + ".", suffix = ".tmp")
+        try:
+            with os.fdopen(Handle, "wb") as TemporaryFile:
+                for Data in Chunks:
+                    TemporaryFile.write(Data)
+                TemporaryFile.flush()
+                os.fsync(TemporaryFile.fileno())
+            if os.path.exists(Path):
+                shutil.copymode(Path, TemporaryPath)
+            os.replace(TemporaryPath, Path)
+        except BaseException:
+            os.remove(TemporaryPath)
+            raise
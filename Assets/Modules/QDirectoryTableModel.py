@@ -0,0 +1,182 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QMimeData, QVariant, QModelIndex, QPersistentModelIndex, pyqtSignal
+from array import array
+import json, datetime
+
+FETCHBATCHSIZE = 1000       #Rows handed to the view each time it scrolls near the end
+DATEFORMAT = '%Y-%m-%d %I:%M %p'
+
+class QDirectoryTableModel(QAbstractTableModel):
+    valueAdded = pyqtSignal(object)
+    customItemChanged = pyqtSignal(QModelIndex, int, QVariant, QVariant)
+    MIMEFormatType = "application/x-custom-tree-item"
+    HeaderLabels = ["Name", "Type", "Date Modified"]
+
+    def __init__(self, Parent = None):
+        super().__init__()
+        self.OriginView = Parent
+        self.Columns = ([], [], array("d"))     #Names, types and epoch modified times stored column wise, no per cell objects
+        self.FetchedRows = 0
+        self.SortColumn, self.SortOrder = None, Qt.SortOrder.AscendingOrder
+        self.SortPending = False        #Streamed rows appended but not yet sorted in
+
+    def rowCount(self, parent = QModelIndex()):
+        return 0 if parent.isValid() else self.FetchedRows
+
+    def columnCount(self, parent = QModelIndex()):
+        return 0 if parent.isValid() else len(self.Columns)
+
+    def data(self, index, role = Qt.ItemDataRole.DisplayRole):
+        if index.isValid() and role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if index.column() == 2:     #Formatted only for the rows actually drawn
+                return self.ReturnFormattedDate(index.row())
+            return self.Columns[index.column()][index.row()]
+        return None
+
+    def ReturnFormattedDate(self, Row):
+        return datetime.datetime.fromtimestamp(self.Columns[2][Row]).strftime(DATEFORMAT)
+
+    def headerData(self, section, orientation, role = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HeaderLabels[section]
+        return None
+
+    def canFetchMore(self, parent = QModelIndex()):
+        return not parent.isValid() and self.FetchedRows < len(self.Columns[0])
+
+    def fetchMore(self, parent = QModelIndex()):
+        FetchCount = min(FETCHBATCHSIZE, len(self.Columns[0]) - self.FetchedRows)
+        if parent.isValid() or FetchCount <= 0:
+            return
+        if self.SortPending:        #Rows scrolled into view mid listing are in order
+            self.SortPendingRows()
+        self.beginInsertRows(QModelIndex(), self.FetchedRows, self.FetchedRows + FetchCount - 1)
+        self.FetchedRows += FetchCount
+        self.endInsertRows()
+
+    def SetRows(self, Rows):
+        self.beginResetModel()
+        self.Columns = ([], [], array("d"))
+        self.FetchedRows = 0
+        self.SortPending = False
+        self.endResetModel()
+        self.AppendRows(Rows)
+
+    def AppendRows(self, Rows, DeferSort = False):
+        #New rows sit past the fetched range until the view asks for them, a streamed listing sorts once when it ends
+        Names, Types, Dates = self.Columns
+        for Record in Rows:
+            Names.append(Record.Name)
+            Types.append(Record.Type)
+            Dates.append(Record.Modified or 0)
+        if self.SortColumn is not None:
+            if DeferSort:
+                self.SortPending = True
+            else:
+                self.SortStore()
+        if self.FetchedRows == 0:
+            self.fetchMore()
+
+    def UpsertRows(self, Rows):
+        RowIndexes = {Name : Row for Row, Name in enumerate(self.Columns[0])}
+        NewRows = []
+        for Record in Rows:
+            if Record.Name in RowIndexes:      #Changed in place, never routed through setData so it cannot look like a rename
+                Row = RowIndexes[Record.Name]
+                self.Columns[1][Row], self.Columns[2][Row] = Record.Type, Record.Modified or 0
+                if Row < self.FetchedRows:
+                    self.dataChanged.emit(self.index(Row, 0), self.index(Row, len(self.Columns) - 1))
+            else:
+                NewRows.append(Record)
+        if NewRows:
+            FetchAll = self.FetchedRows == len(self.Columns[0])     #A fully shown listing stays fully shown
+            self.AppendRows(NewRows)
+            if FetchAll:
+                while self.canFetchMore():
+                    self.fetchMore()
+
+    def Clear(self):
+        self.SetRows([])
+
+    def SortPendingRows(self):
+        if self.SortPending and self.SortColumn is not None:
+            self.SortStore()
+
+    def sort(self, column, order = Qt.SortOrder.AscendingOrder):
+        self.SortColumn, self.SortOrder = column, order
+        self.SortStore()
+
+    def SortStore(self):
+        self.SortPending = False
+        self.layoutAboutToBeChanged.emit()
+        SortValues = self.Columns[self.SortColumn]
+        SortKey = (lambda Row: SortValues[Row].casefold()) if self.SortColumn == 0 else SortValues.__getitem__
+        NewOrder = sorted(range(len(SortValues)), key = SortKey, reverse = self.SortOrder == Qt.SortOrder.DescendingOrder)
+        for Column in self.Columns:
+            ReorderedColumn = [Column[Row] for Row in NewOrder]
+            Column[:] = array(Column.typecode, ReorderedColumn) if isinstance(Column, array) else ReorderedColumn
+        NewRows = [0] * len(NewOrder)
+        for NewRow, OldRow in enumerate(NewOrder):
+            NewRows[OldRow] = NewRow
+        #Selections follow their rows, rows sorted past the fetched range drop out of the view
+        PersistentIndexes = self.persistentIndexList()
+        self.changePersistentIndexList(PersistentIndexes, [
+            self.index(NewRows[Index.row()], Index.column()) if NewRows[Index.row()] < self.FetchedRows else QModelIndex()
+                for Index in PersistentIndexes
+        ])
+        self.layoutChanged.emit()
+
+    def mimeTypes(self):
+        return [self.MIMEFormatType]
+
+    def mimeData(self, indexes):
+        if not indexes:
+            return None
+        MimeData = QMimeData()
+        RowsData = []
+        for Row in sorted({Index.row() for Index in indexes}):
+            RowsData.append({
+                "Origin View" : self.OriginView,
+                "Item Name" : self.Columns[0][Row],
+                "Item Type" : self.Columns[1][Row],
+                "Item Date" : self.ReturnFormattedDate(Row)
+            })
+        MimeData.setData(self.MIMEFormatType, json.dumps(RowsData).encode('utf-8'))
+        return MimeData
+
+    def dropMimeData(self, data, action, row, column, parent):
+        try:
+            if action == Qt.DropAction.IgnoreAction:
+                return True
+            if not data.hasFormat(self.MIMEFormatType):
+                return False
+
+            self.valueAdded.emit({
+                "Items" : data.data(self.MIMEFormatType).data().decode(),
+            })
+
+            return True
+        except Exception as e:
+            self.valueAdded.emit({
+                "Error Thrown" : e
+            })
+        return False
+
+    def supportedDropActions(self):
+        return Qt.DropAction.CopyAction | Qt.DropAction.MoveAction
+
+    def flags(self, index):
+        if not index.isValid():     #Drops land on the view itself, never on a row
+            return Qt.ItemFlag.ItemIsDropEnabled
+        DefaultFlags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsDragEnabled
+        return DefaultFlags | Qt.ItemFlag.ItemIsEditable if index.column() == 0 else DefaultFlags
+
+    def setData(self, index, value, role = Qt.ItemDataRole.EditRole):
+        if not index.isValid() or index.column() != 0 or role not in (Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole):
+            return False
+        oldValue = self.data(index, role)
+        EditedIndex = QPersistentModelIndex(index)
+        self.customItemChanged.emit(index, role, oldValue, value)
+        if EditedIndex.isValid():       #Listeners may have reloaded the whole model already
+            self.Columns[0][EditedIndex.row()] = value
+            self.dataChanged.emit(QModelIndex(EditedIndex), QModelIndex(EditedIndex), [role])
+        return True
@@ -0,0 +1,122 @@
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+import os, json, time, uuid
+
+class QJobScheduler(QObject):
+    jobStarted = pyqtSignal(object)
+    jobFinished = pyqtSignal(object)
+
+    def __init__(self, WorkerFactory, QueuePath = None, LaneLimits = None):
+        super().__init__()
+        self.WorkerFactory = WorkerFactory      #Job -> QThreadWorker with its result signals already connected
+        self.QueuePath = QueuePath
+        self.LaneLimits = LaneLimits if LaneLimits is not None else {"Interactive" : 2, "Bulk" : 1}     #Running jobs per connection and lane
+        self.PendingJobs = []
+        self.RunningJobs = {}       #Job id -> (Job, Thread, Worker)
+        self.ActiveConnections = set()
+        self.RestoredJobs = self.Load()
+
+    def Submit(self, JobType, Request, Misc, Connection = None, Priority = 0, Lane = "Interactive", ReplaceKey = None, Persist = False):
+        Job = {
+            "Job Id" : uuid.uuid4().hex,
+            "Job Type" : JobType,
+            "Request" : Request,
+            "Misc" : Misc,
+            "Connection" : Connection,
+            "Priority" : Priority,
+            "Lane" : Lane,
+            "Replace Key" : ReplaceKey,
+            "Persist" : Persist,
+            "Submitted" : time.time()
+        }
+        if ReplaceKey is not None:      #Only the latest request for the same view is worth running
+            self.PendingJobs = [PendingJob for PendingJob in self.PendingJobs if PendingJob["Replace Key"] != ReplaceKey]
+        self.PendingJobs.append(Job)
+        if Persist:
+            self.Save()
+        self.Dispatch()
+        return Job
+
+    def SetConnection(self, Connection, Active):
+        #Jobs for a connection wait while it is down, restored jobs start once their server is connected again
+        if Active:
+            self.ActiveConnections.add(Connection)
+        else:
+            self.ActiveConnections.discard(Connection)
+        self.Dispatch()
+
+    def ReturnQueuePosition(self, Job):
+        return sum(1 for PendingJob in self.PendingJobs if PendingJob is not Job and self.ReturnSortKey(PendingJob) < self.ReturnSortKey(Job)) + \
+            sum(1 for RunningJob, _, _ in self.RunningJobs.values() if RunningJob["Connection"] == Job["Connection"] and RunningJob["Lane"] == Job["Lane"])
+
+    def ReturnSortKey(self, Job):
+        return (Job["Priority"], Job["Submitted"])
+
+    def ReturnRunnable(self, Job):
+        if Job["Connection"] is not None and Job["Connection"] not in self.ActiveConnections:
+            return False
+        RunningJobs = [RunningJob for RunningJob, _, _ in self.RunningJobs.values()]
+        if Job["Replace Key"] is not None and any(RunningJob["Replace Key"] == Job["Replace Key"] for RunningJob in RunningJobs):
+            return False        #Waits for the earlier listing so results reach the view in request order
+        LaneCount = sum(1 for RunningJob in RunningJobs if RunningJob["Connection"] == Job["Connection"] and RunningJob["Lane"] == Job["Lane"])
+        return LaneCount < self.LaneLimits.get(Job["Lane"], 1)
+
+    def Dispatch(self):
+        for Job in sorted(self.PendingJobs, key = self.ReturnSortKey):
+            if self.ReturnRunnable(Job):
+                self.PendingJobs.remove(Job)
+                self.StartJob(Job)
+
+    def StartJob(self, Job):
+        Thread = QThread(self)
+        Worker = self.WorkerFactory(Job)
+        Worker.moveToThread(Thread)
+        Thread.started.connect(Worker.ExecuteJob)
+        Worker.completeDataSignal.connect(lambda params, JobId = Job["Job Id"]: self.JobCompleted(JobId, params))
+        Thread.finished.connect(Worker.deleteLater)
+        Thread.finished.connect(Thread.deleteLater)
+        self.RunningJobs[Job["Job Id"]] = (Job, Thread, Worker)
+        Thread.start()
+        self.jobStarted.emit(Job)
+
+    def JobCompleted(self, JobId, params):
+        RunningJob = self.RunningJobs.pop(JobId, None)
+        if RunningJob is None:
+            return
+        Job, Thread, _ = RunningJob
+        Thread.quit()
+        if Job["Persist"]:
+            self.Save()
+        self.jobFinished.emit(dict(Job, **{"Error Thrown" : params["Error Thrown"]}) if "Error Thrown" in params else Job)
+        self.Dispatch()
+
+    def Cancel(self, Lane = None):
+        #Pending jobs are dropped, running ones are asked to stop at their next file or batch
+        CancelledJobs = [Job for Job in self.PendingJobs if Lane is None or Job["Lane"] == Lane]
+        self.PendingJobs = [Job for Job in self.PendingJobs if Job not in CancelledJobs]
+        for Job, _, Worker in self.RunningJobs.values():
+            if Lane is None or Job["Lane"] == Lane:
+                Worker.Cancel()
+                CancelledJobs.append(Job)
+        self.Save()
+        return CancelledJobs
+
+    def Load(self):
+        if self.QueuePath is None or not os.path.exists(self.QueuePath):
+            return 0
+        try:
+            with open(self.QueuePath, "r") as QueueFile:
+                self.PendingJobs = json.load(QueueFile)["Jobs"]
+        except (IOError, ValueError, KeyError):     #An unreadable queue only loses the queued jobs, never blocks startup
+            self.PendingJobs = []
+        return len(self.PendingJobs)
+
+    def Save(self):
+        if self.QueuePath is None:
+            return
+        #Running jobs are kept too, a job interrupted by a restart is queued again and resumes from its journal
+        PersistedJobs = [Job for Job in sorted(self.PendingJobs + [Job for Job, _, _ in self.RunningJobs.values()], key = self.ReturnSortKey) if Job["Persist"]]
+        os.makedirs(os.path.dirname(self.QueuePath), exist_ok = True)
+        TemporaryPath = f"{self.QueuePath}.tmp"
+        with open(TemporaryPath, "w") as QueueFile:
+            json.dump({"Jobs" : PersistedJobs}, QueueFile)
+        os.replace(TemporaryPath, self.QueuePath)
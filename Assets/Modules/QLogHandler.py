@@ -1,20 +1,41 @@
 import logging
-from PyQt6.QtCore import pyqtSignal, QObject
+from collections import deque
+from PyQt6.QtCore import pyqtSignal, QObject, QTimer
 
 class QLogHandler(logging.Handler, QObject):
-    appendPlainText = pyqtSignal(str)
-    def __init__(self):
+    appendPlainText = pyqtSignal(object)
+    flushRequested = pyqtSignal()
+    def __init__(self, FlushInterval = 200, MaximumLines = 5000):
         super().__init__()
         QObject.__init__(self)
+        self.PendingLines = deque(maxlen = MaximumLines)     #Ring buffer, a burst larger than the view keeps only its newest lines
+        self.DroppedLines = 0
+        self.FlushTimer = QTimer(self)
+        self.FlushTimer.setSingleShot(True)
+        self.FlushTimer.setInterval(FlushInterval)
+        self.FlushTimer.timeout.connect(self.Flush)
+        self.flushRequested.connect(self.FlushTimer.start)      #Queued from worker threads, the timer only ever starts on the GUI thread
 
     def emit(self, logRecord):
         Msg = str(logRecord.getMessage())
         Type = str(logRecord.levelname)
-        if Type in ["INFO", "WARNING", "ERROR"]:
-            if Msg != '':
-                MsgFinal = "<span>" + Type + ' - ' + Msg + "</span>"    
-                self.appendPlainText.emit(MsgFinal)
-        else:
-            if Msg != '':
+        if Msg != '':
+            if Type in ["INFO", "WARNING", "ERROR"]:
+                MsgFinal = "<span>" + Type + ' - ' + Msg + "</span>"
+            else:
                 MsgFinal = "<span>" + Msg + "</span>"
-                self.appendPlainText.emit(MsgFinal)
+            if len(self.PendingLines) == self.PendingLines.maxlen:
+                self.DroppedLines += 1
+            self.PendingLines.append(MsgFinal)
+            if len(self.PendingLines) == 1:     #One signal per flush rather than one per record
+                self.flushRequested.emit()
+
+    def Flush(self):
+        with self.lock:
+            Lines, DroppedLines = list(self.PendingLines), self.DroppedLines
+            self.PendingLines.clear()
+            self.DroppedLines = 0
+        if DroppedLines:        #Takes the place of the oldest line, so the notice still fits in a view of the same size
+            Lines[0] = f"<span>... {DroppedLines + 1} earlier line(s) not shown, the log file has every line</span>"
+        if Lines:
+            self.appendPlainText.emit(Lines)
@@ -0,0 +1,38 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+class QRefreshScheduler(QObject):
+    refreshBatch = pyqtSignal(object)
+
+    def __init__(self, Interval = 250):
+        super().__init__()
+        self.PendingItems = {}      #(View name, Directory path) -> {Item name: Directory item}, later events replace earlier ones
+        self.RefreshTimer = QTimer(self)
+        self.RefreshTimer.setSingleShot(True)
+        self.RefreshTimer.setInterval(Interval)
+        self.RefreshTimer.timeout.connect(self.Flush)
+
+    def Queue(self, ViewName, DirectoryPath, DirectoryItem):
+        self.QueueItems(ViewName, DirectoryPath, [DirectoryItem])
+
+    def QueueItems(self, ViewName, DirectoryPath, DirectoryItems):
+        PendingItems = self.PendingItems.setdefault((ViewName, DirectoryPath), {})
+        for DirectoryItem in DirectoryItems:
+            PendingItems[DirectoryItem.Name] = DirectoryItem
+        if not self.RefreshTimer.isActive():
+            self.RefreshTimer.start()
+
+    def Flush(self):
+        self.RefreshTimer.stop()
+        PendingItems, self.PendingItems = self.PendingItems, {}
+        for (ViewName, DirectoryPath), DirectoryItems in PendingItems.items():
+            self.refreshBatch.emit({
+                "View Name" : ViewName,
+                "Directory Path" : DirectoryPath,
+                "Directory Items" : list(DirectoryItems.values())
+            })
+
+    def Discard(self, ViewName, DirectoryPath):
+        #Only that folder's pending items go, batches other jobs queued for other folders still land
+        self.PendingItems.pop((ViewName, DirectoryPath), None)
+        if not self.PendingItems:
+            self.RefreshTimer.stop()
@@ -0,0 +1,93 @@
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QCheckBox, QFileDialog, QLabel
+import logging
+
+class QStatisticsPanel(QDialog):
+    OperationLabels = ["Operation", "Count", "Total (s)", "Mean (ms)", "P50 (ms)", "P95 (ms)", "P99 (ms)", "Max (ms)"]
+    OperationKeys = ["Mean Seconds", "P50 Seconds", "P95 Seconds", "P99 Seconds", "Maximum Seconds"]
+
+    def __init__(self, Metrics, ExportPath, RefreshInterval = 1000, parent = None):
+        super().__init__(parent)
+        self.Metrics = Metrics
+        self.ExportPath = ExportPath
+        self.setWindowTitle("Statistics")
+        self.resize(820, 520)
+        self.SummaryLabel = QLabel()
+        self.OperationTable = self.ReturnTable(self.OperationLabels)
+        self.CounterTable = self.ReturnTable(["Counter", "Value"])
+        self.ProfileCheckbox = QCheckBox("Profile Jobs")
+        self.ProfileCheckbox.setChecked(Metrics.Profiling)
+        self.ProfileCheckbox.toggled.connect(self.ToggleProfiling)
+        ExportButton, ResetButton, CloseButton = QPushButton("Export..."), QPushButton("Reset"), QPushButton("Close")
+        ExportButton.clicked.connect(self.ExportMetrics)
+        ResetButton.clicked.connect(self.ResetMetrics)
+        CloseButton.clicked.connect(self.close)
+        ButtonLayout = QHBoxLayout()
+        ButtonLayout.addWidget(self.ProfileCheckbox)
+        ButtonLayout.addStretch(1)
+        for Button in (ExportButton, ResetButton, CloseButton):
+            ButtonLayout.addWidget(Button)
+        PanelLayout = QVBoxLayout(self)
+        PanelLayout.addWidget(self.SummaryLabel)
+        PanelLayout.addWidget(self.OperationTable, 3)
+        PanelLayout.addWidget(self.CounterTable, 2)
+        PanelLayout.addLayout(ButtonLayout)
+        self.RefreshTimer = QTimer(self)        #Only runs while the panel is open
+        self.RefreshTimer.setInterval(RefreshInterval)
+        self.RefreshTimer.timeout.connect(self.RefreshTables)
+
+    def ReturnTable(self, HeaderLabels):
+        Table = QTableWidget(0, len(HeaderLabels))
+        Table.setHorizontalHeaderLabels(HeaderLabels)
+        Table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        Table.verticalHeader().hide()
+        Table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        return Table
+
+    def showEvent(self, event):
+        self.RefreshTables()
+        self.RefreshTimer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.RefreshTimer.stop()
+        super().hideEvent(event)
+
+    def RefreshTables(self):
+        Snapshot = self.Metrics.ReturnSnapshot()
+        self.SummaryLabel.setText(f"Collecting since {Snapshot["Started"]} ({Snapshot["Elapsed Seconds"]:.0f} s)")
+        self.OperationTable.setRowCount(len(Snapshot["Operations"]))
+        for Row, (Operation, Statistics) in enumerate(Snapshot["Operations"].items()):
+            Cells = [Operation, str(Statistics["Count"]), f"{Statistics["Total Seconds"]:.3f}"] + [f"{Statistics[Key] * 1000:.2f}" for Key in self.OperationKeys]
+            self.SetRow(self.OperationTable, Row, Cells)
+        self.CounterTable.setRowCount(len(Snapshot["Counters"]))
+        for Row, (Name, Value) in enumerate(Snapshot["Counters"].items()):
+            self.SetRow(self.CounterTable, Row, [Name, f"{Value:,}"])
+
+    def SetRow(self, Table, Row, Cells):
+        for Column, Text in enumerate(Cells):
+            Item = Table.item(Row, Column)
+            if Item is None:
+                Item = QTableWidgetItem()
+                if Column > 0:
+                    Item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                Table.setItem(Row, Column, Item)
+            Item.setText(Text)
+
+    def ToggleProfiling(self, Checked):
+        self.Metrics.Profiling = Checked        #Takes effect from the next job
+        logging.info(f"Job profiling {"enabled" if Checked else "disabled"}")
+
+    def ExportMetrics(self):
+        ExportPath, _ = QFileDialog.getSaveFileName(self, "Export Statistics", self.ExportPath, "JSON (*.json);;Prometheus Text (*.prom *.txt)")
+        if ExportPath:
+            try:
+                ExportedPaths = self.Metrics.Export(ExportPath)
+                self.ExportPath = ExportPath
+                logging.info(f"Statistics exported to {", ".join(f"'{Path}'" for Path in ExportedPaths)}")
+            except OSError as e:
+                logging.error(f"Could not export statistics to '{ExportPath}': {e}")
+
+    def ResetMetrics(self):
+        self.Metrics.Reset()
+        self.RefreshTables()
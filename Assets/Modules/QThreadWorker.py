@@ -1,5 +1,25 @@
 from PyQt6.QtCore import *
-import datetime, stat, os
+from Assets.Modules import \
+    SFTPChannelPool as ChannelPoolObject \
+    , SFTPLargeFileTransfer as LargeFileTransferObject \
+    , TransferJournal as TransferJournalObject \
+    , SFTPDeltaSync as DeltaSyncObject \
+    , TransferProgressAggregator as ProgressAggregatorObject \
+    , DirectoryRecord as DirectoryRecordObject \
+    , SFTPBulkOperations as BulkOperationsObject \
+    , LocalBulkOperations as LocalBulkOperationsObject \
+    , TransferPlanner as TransferPlannerObject \
+    , SFTPArchiveStream as ArchiveStreamObject \
+    , TransferIntegrity as IntegrityObject
+import stat, os, posixpath, queue, threading, hashlib, json, math, time, contextlib
+try:
+    from Assets.Modules import PyAESEncryption as EncryptionObject
+except ImportError:     #Optional, transfers cannot be encrypted in flight without pycryptodomex
+    EncryptionObject = None
+
+TRANSFERQUEUEDEPTH = 4          #Queued files per open channel
+FIRSTLISTINGCHUNK = 256         #Listing entries in the first chunk sent to the view, kept small so it renders at once
+MAXLISTINGCHUNK = 16384         #Later chunks grow up to this size to keep the signal count down
 
 class QThreadWorker(QObject):
     serverMessage = pyqtSignal(object)
@@ -7,34 +27,81 @@ class QThreadWorker(QObject):
     transferProgress = pyqtSignal(object)
     transferCompleteLocal = pyqtSignal(object)
     transferCompleteRemote = pyqtSignal(object)
+    directoryChunkLocal = pyqtSignal(object)
+    directoryChunkRemote = pyqtSignal(object)
     completeDataSignal = pyqtSignal(object)
 
-    def __init__(self, SSHObj = None, SFTPObj = None, Conn = None, Misc = None):
+    def __init__(self, SSHObj = None, SFTPObj = None, Conn = None, Misc = None, Cache = None, Manager = None, Engine = None, Metrics = None, Limiter = None):
         super().__init__()
         self.SSHObject = SSHObj
         self.SFTPObject = SFTPObj
         self.ConnectionParameters = Conn
         self.MiscParameters = Misc
+        self.ListingCache = Cache
+        self.ConnectionManager = Manager
+        self.AsyncEngine = Engine       #Optional asyncio engine, single files go through it instead of the channel threads
+        self.Metrics = Metrics      #Optional, jobs and the operations inside them are timed into it
+        self.BandwidthLimiter = Limiter     #Optional, shapes the bytes a transfer moves and holds bulk traffic back while listings run
+        self.ConnectionKey = Manager.ReturnConnectionKey(Conn) if Manager is not None and Conn is not None else None
+        self.CancelEvent = threading.Event()
+
+    def ExecuteJob(self):
+        #Scheduled jobs run side by side, each leases its own SFTP session since a paramiko client is not safe to share between threads
+        try:
+            if self.ConnectionKey is not None:
+                self.SSHObject = self.ConnectionManager.ReturnClient(self.ConnectionKey)
+                self.SFTPObject = self.ConnectionManager.LeaseSFTP(self.ConnectionKey)
+        except Exception as e:
+            self.completeDataSignal.emit({
+                "Error Thrown" : e
+            })
+            return
+        try:
+            with self.ReturnSpan(f"Job {self.MiscParameters["Job Request"]}"), self.ReturnProfile(), self.ReturnPriorityLane():
+                getattr(self, self.MiscParameters["Job Request"])()
+        finally:
+            if self.ConnectionKey is not None:
+                self.ConnectionManager.ReturnSFTP(self.ConnectionKey, self.SFTPObject)
+
+    def Cancel(self):
+        self.CancelEvent.set()      #Called from the GUI thread, checked by the job between files and batches
+
+    def ReturnCancelled(self):
+        if self.CancelEvent.is_set():
+            raise InterruptedError("Operation cancelled")
+
+    def ReturnSpan(self, Operation):
+        return self.Metrics.Span(Operation) if self.Metrics is not None else contextlib.nullcontext()
+
+    def ReturnProfile(self):
+        return self.Metrics.Profile() if self.Metrics is not None else contextlib.nullcontext()
+
+    def ReturnPriorityLane(self):
+        Interactive = self.BandwidthLimiter is not None and self.ConnectionKey is not None and self.MiscParameters.get("Job Lane") == "Interactive"
+        return self.BandwidthLimiter.Interactive() if Interactive else contextlib.nullcontext()
+
+    def CountMetric(self, Name, Amount = 1):
+        if self.Metrics is not None:
+            self.Metrics.Count(Name, Amount)
 
     def ConnectAndOpenSFTP(self):
         try:
-            self.SSHObject.connect(self.ConnectionParameters["Host"], self.ConnectionParameters["Port"], self.ConnectionParameters["Username"], self.ConnectionParameters["Password"])
+            self.ConnectionKey = self.ConnectionManager.Connect(self.ConnectionParameters)     #A host that is still connected is reused without a new handshake
+            self.SSHObject = self.ConnectionManager.ReturnClient(self.ConnectionKey)
             SSHTransport = self.SSHObject.get_transport()
             if (SSHTransport is not None and SSHTransport.is_active()):
-                self.SFTPObject = self.SSHObject.open_sftp()
-                stdin, stdout, stderr = self.SSHObject.exec_command("pwd")   #Attempt to fetch the default ssh directory path
-                ServerErrorOuput = stderr.read().decode().strip()
-                if not ServerErrorOuput:
-                    RemoteDefaultDirectory = stdout.read().decode().strip()
+                self.SFTPObject = self.ConnectionManager.LeaseSFTP(self.ConnectionKey)
+                try:
+                    RemoteDefaultDirectory = self.SFTPObject.normalize(".")   #Fetch the default ssh directory path
                     QueryResults = self.QueryServerForADirectoriesContentsRemote(RemoteDefaultDirectory)
-                    self.completeDataSignal.emit({
-                        "SSH Object" : self.SSHObject, 
-                        "SFTP Object" : self.SFTPObject,
-                        "Server Path" : RemoteDefaultDirectory, 
-                        "Directory Items" : QueryResults
-                    })
-                else: 
-                    raise Exception(ServerErrorOuput)
+                finally:
+                    self.ConnectionManager.ReturnSFTP(self.ConnectionKey, self.SFTPObject)
+                self.completeDataSignal.emit({
+                    "SSH Object" : self.SSHObject, 
+                    "Connection Key" : self.ConnectionKey,
+                    "Server Path" : RemoteDefaultDirectory, 
+                    "Directory Items" : QueryResults
+                })
             else:
                 raise Exception(f"Unable to connect to {self.ConnectionParameters["Host"]} on port {self.ConnectionParameters["Port"]}")
         except Exception as e:
@@ -44,14 +111,10 @@ class QThreadWorker(QObject):
 
     def DisconnectAndCloseSFTP(self):
         try:
-            if self.SFTPObject is not None:
-                self.SFTPObject.close()
-            self.SSHObject.close()
-            SSHTransport = self.SSHObject.get_transport()
-            if (SSHTransport is None or not SSHTransport.is_active()):
+            self.ConnectionManager.Disconnect(self.ConnectionKey)
+            if not self.ConnectionManager.ReturnConnected(self.ConnectionKey):
                 self.completeDataSignal.emit({
-                    "SSH Object" : self.SSHObject, 
-                    "SFTP Object" : self.SFTPObject,
+                    "Connection Key" : self.ConnectionKey
                 })
             else:
                 raise Exception(f"Unable to safely disconnect from the server")
@@ -62,11 +125,11 @@ class QThreadWorker(QObject):
 
     def QueryDirectoriesContentsLocalRequest(self):
         try:
-            QueryResults = self.QueryServerForADirectoriesContentsLocal(self.MiscParameters["Local Path"])
+            QueryResults = self.QueryServerForADirectoriesContentsLocal(self.MiscParameters["Local Path"], self.directoryChunkLocal)
             if (type(QueryResults) == list):
                 self.completeDataSignal.emit({
                     "Local Path" : self.MiscParameters["Local Path"], 
-                    "Directory Items" : QueryResults
+                    "Item Count" : len(QueryResults)
                 })
             else:
                 raise QueryResults
@@ -75,33 +138,47 @@ class QThreadWorker(QObject):
                 "Error Thrown" : e
             })
 
-    def QueryServerForADirectoriesContentsLocal(self, LocalPath):
+    def QueryServerForADirectoriesContentsLocal(self, LocalPath, ChunkSignal = None):
         if not os.path.isdir(LocalPath):
             return Exception(f"Cannot navigate to '{LocalPath}'. It is a file")
         else:
-            DirectoryItems = os.listdir(LocalPath)
-            DirectoryItemList = []
-            for DirectoryItem in os.listdir(LocalPath):
-                DirectoryItemPath = f"{LocalPath}/{DirectoryItem}" 
-                if os.path.exists(DirectoryItemPath):
-                    if os.path.isdir(DirectoryItemPath):
-                        ItemType = "Folder"
-                    elif os.path.isfile(DirectoryItemPath):
-                        ItemType = "File"
-                    DirectoryItemList.append({
-                        "Item Name" : os.path.basename(DirectoryItemPath), 
-                        "Item Type" : ItemType,
-                        "Item Date" : str(datetime.datetime.fromtimestamp(os.stat(DirectoryItemPath).st_mtime).strftime('%Y-%m-%d %I:%M %p'))
-                    })
-            return DirectoryItemList
+            with self.ReturnSpan("List Local"):
+                return self.CollectDirectoryItems(self.IterateLocalDirectory(LocalPath), ChunkSignal, {"Local Path" : LocalPath})
+
+    def IterateLocalDirectory(self, LocalPath):
+        with os.scandir(LocalPath) as DirectoryEntries:
+            for Entry in DirectoryEntries:
+                try:
+                    EntryStat = Entry.stat()        #One syscall per entry, cached on the DirEntry
+                except OSError:     #Broken link or entry removed mid listing
+                    continue
+                yield DirectoryRecordObject.DirectoryRecord(Entry.name, "Folder" if stat.S_ISDIR(EntryStat.st_mode) else "File", EntryStat.st_mtime, EntryStat.st_size)
+
+    def CollectDirectoryItems(self, DirectoryItems, ChunkSignal, ChunkParameters):
+        #Entries go out in growing chunks while the listing is still being read, the full list is returned at the end
+        DirectoryItemList, ChunkStart, ChunkSize = [], 0, FIRSTLISTINGCHUNK
+        for DirectoryItem in DirectoryItems:
+            DirectoryItemList.append(DirectoryItem)
+            if ChunkSignal is not None and len(DirectoryItemList) - ChunkStart >= ChunkSize:
+                ChunkSignal.emit(dict(ChunkParameters, **{
+                    "Directory Items" : DirectoryItemList[ChunkStart:],
+                    "First Chunk" : ChunkStart == 0
+                }))
+                ChunkStart, ChunkSize = len(DirectoryItemList), min(ChunkSize * 4, MAXLISTINGCHUNK)
+        if ChunkSignal is not None and (ChunkStart == 0 or ChunkStart < len(DirectoryItemList)):     #An empty folder still clears the view
+            ChunkSignal.emit(dict(ChunkParameters, **{
+                "Directory Items" : DirectoryItemList[ChunkStart:],
+                "First Chunk" : ChunkStart == 0
+            }))
+        return DirectoryItemList
 
     def QueryDirectoriesContentsServerRequest(self):
         try:
-            QueryResults = self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"])
+            QueryResults = self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"], UseCache = not self.MiscParameters.get("Force Refresh", False), ChunkSignal = self.directoryChunkRemote)
             if (type(QueryResults) == list):
                 self.completeDataSignal.emit({
                     "Server Path" : self.MiscParameters["Server Path"], 
-                    "Directory Items" : QueryResults
+                    "Item Count" : len(QueryResults)
                 })
             else:
                 raise QueryResults
@@ -110,29 +187,67 @@ class QThreadWorker(QObject):
                 "Error Thrown" : e
             })
 
-    def QueryServerForADirectoriesContentsRemote(self, ServerPath):
-        PathAttributes = self.SFTPObject.lstat(ServerPath)
+    def QueryServerForADirectoriesContentsRemote(self, ServerPath, SFTPObj = None, UseCache = True, ChunkSignal = None):
+        SFTPObj = SFTPObj if SFTPObj is not None else self.SFTPObject
+        if UseCache and self.ListingCache is not None:
+            CachedItems = self.ListingCache.Get(ServerPath)
+            if CachedItems is not None:
+                self.CountMetric("Listing Cache Hits")
+                return self.CollectDirectoryItems(CachedItems, ChunkSignal, {"Server Path" : ServerPath})
+        with self.ReturnSpan("Stat"):
+            PathAttributes = SFTPObj.lstat(ServerPath)
         if stat.S_ISREG(PathAttributes.st_mode):
             return Exception(f"Cannot navigate to '{ServerPath}'. It is a file")
         else:
-            DirectoryItemList = []
-            for Item in self.SFTPObject.listdir_attr(ServerPath): 
-                ItemType = ""
-                if stat.S_ISREG(Item.st_mode):
-                    ItemType = "File"
-                elif stat.S_ISDIR(Item.st_mode) or stat.S_ISLNK(Item.st_mode):
-                    ItemType = "Folder"
-                DirectoryItemList.append({
-                    "Item Name" : Item.filename, 
-                    "Item Type" : ItemType,
-                    "Item Date" : str(datetime.datetime.fromtimestamp(Item.st_mtime).strftime('%Y-%m-%d %I:%M %p'))
-                })
+            with self.ReturnSpan("List"):
+                DirectoryItemList = self.CollectDirectoryItems(self.IterateServerDirectory(SFTPObj, ServerPath), ChunkSignal, {"Server Path" : ServerPath})
+            if self.ListingCache is not None:
+                self.ListingCache.Set(ServerPath, DirectoryItemList)
             return DirectoryItemList
+
+    def IterateServerDirectory(self, SFTPObj, ServerPath):
+        for ItemAttributes in SFTPObj.listdir_iter(ServerPath):     #Yields as each READDIR reply arrives, with further requests already in flight
+            yield self.ReturnRemoteDirectoryItem(ItemAttributes.filename, ItemAttributes)
+
+    def ReturnRemoteDirectoryItem(self, ItemName, ItemAttributes):
+        ItemType = ""
+        if stat.S_ISREG(ItemAttributes.st_mode):
+            ItemType = "File"
+        elif stat.S_ISDIR(ItemAttributes.st_mode) or stat.S_ISLNK(ItemAttributes.st_mode):
+            ItemType = "Folder"
+        return DirectoryRecordObject.DirectoryRecord(ItemName, ItemType, ItemAttributes.st_mtime, ItemAttributes.st_size)
+
+    def PatchRemoteListing(self, SFTPObj, ServerViewPath, ItemName):
+        DirectoryItem = self.ReturnRemoteDirectoryItem(ItemName, SFTPObj.stat(f"{ServerViewPath}/{ItemName}"))
+        if self.ListingCache is not None:
+            self.ListingCache.PatchItem(ServerViewPath, DirectoryItem)
+        return DirectoryItem
+
+    def ReturnLocalDirectoryItem(self, LocalViewPath, ItemName):
+        ItemStat = os.stat(f"{LocalViewPath}/{ItemName}")
+        return DirectoryRecordObject.DirectoryRecord(ItemName, "Folder" if stat.S_ISDIR(ItemStat.st_mode) else "File", ItemStat.st_mtime, ItemStat.st_size)
             
     def RenameFileOrDirectory(self):
         try:
             if self.MiscParameters["Old Name"] != self.MiscParameters["New Name"]:
-                self.SFTPObject.rename(self.MiscParameters["Old Name"], self.MiscParameters["New Name"])
+                with self.ReturnSpan("Rename"):
+                    self.SFTPObject.rename(self.MiscParameters["Old Name"], self.MiscParameters["New Name"])
+                if self.ListingCache is not None:
+                    self.ListingCache.RenameItem(self.MiscParameters["Old Name"], self.MiscParameters["New Name"])
+            self.completeDataSignal.emit({
+                "Old Name" : self.MiscParameters["Old Name"],
+                "New Name" : self.MiscParameters["New Name"]
+            })        
+        except Exception as e: 
+            self.completeDataSignal.emit({
+                "Error Thrown" : e
+            })
+
+    def RenameFileOrDirectoryLocal(self):
+        try:
+            if self.MiscParameters["Old Name"] != self.MiscParameters["New Name"]:
+                with self.ReturnSpan("Rename Local"):
+                    os.rename(self.MiscParameters["Old Name"], self.MiscParameters["New Name"])
             self.completeDataSignal.emit({
                 "Old Name" : self.MiscParameters["Old Name"],
                 "New Name" : self.MiscParameters["New Name"]
@@ -142,10 +257,40 @@ class QThreadWorker(QObject):
                 "Error Thrown" : e
             })
 
+    def DeleteFileOrDirectoryLocalRequest(self):
+        try:
+            BulkOperations = LocalBulkOperationsObject.LocalBulkOperations(self.MiscParameters.get("Delete Workers", 8), CancelEvent = self.CancelEvent)
+            for Item in self.MiscParameters["Directory Items"]:
+                self.ReturnCancelled()
+                self.DeleteLocalFileOrDirectory(BulkOperations, os.path.join(self.MiscParameters["Local Path"], Item["Item Name"]))
+            QueryResults = self.QueryServerForADirectoriesContentsLocal(self.MiscParameters["Local Path"])
+            if (type(QueryResults) == list):
+                self.completeDataSignal.emit({
+                    "Local Path" : self.MiscParameters["Local Path"], 
+                    "Local Results" : QueryResults
+                })
+            else:
+                raise QueryResults
+        except Exception as e: 
+            self.completeDataSignal.emit({
+                "Local Path" : self.MiscParameters["Local Path"], 
+                "Error Thrown" : e
+            })
+
+    def DeleteLocalFileOrDirectory(self, BulkOperations, Path):
+        with self.ReturnSpan("Delete Local"):
+            DeletedCount, DeleteErrors = BulkOperations.Delete(Path, self.ReturnBulkBatchCallback(Path, "Deleting"))
+        if DeleteErrors:
+            raise IOError(f"{len(DeleteErrors)} item(s) under '{Path}' could not be deleted. First error: {DeleteErrors[0]}")
+        self.serverMessage.emit({
+            "Message" : f"Local path successfully deleted: '{Path}' ({DeletedCount} item(s))"
+        })
+
     def DeleteFileOrDirectoryServerRequest(self):
         try:
+            BulkOperations = BulkOperationsObject.SFTPBulkOperations(self.SSHObject, self.SFTPObject, self.MiscParameters.get("Transfer Channels", 1), self.MiscParameters.get("Channel Mode", "Sessions"), self.ConnectionParameters, Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
             for Item in self.MiscParameters["Directory Items"]:
-                self.DeleteFileOrDirectory(os.path.join(self.MiscParameters["Server Path"], Item["Item Name"]))
+                self.DeleteFileOrDirectory(BulkOperations, os.path.join(self.MiscParameters["Server Path"], Item["Item Name"]))
             QueryResults = self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"])
             if (type(QueryResults) == list):
                 self.completeDataSignal.emit({
@@ -159,93 +304,610 @@ class QThreadWorker(QObject):
                 "Error Thrown" : e
             })
 
-    def DeleteFileOrDirectory(self, Path):
-        if self.ReturnRemoteDirectory(Path):
-            for PathItem in self.SFTPObject.listdir(Path):
-                self.DeleteFileOrDirectory(os.path.join(Path, PathItem)) 
-            self.SFTPObject.rmdir(Path)
-            self.serverMessage.emit({
-                "Message" : f"Server directory successfully deleted: '{Path}'"
-            })
-        else:
-            self.SFTPObject.remove(Path)       
+    def DeleteFileOrDirectory(self, BulkOperations, Path):
+        with self.ReturnSpan("Delete"):
+            DeletedCount, DeleteErrors = BulkOperations.Delete(Path, self.ReturnBulkBatchCallback(Path, "Deleting"))
+        if self.ListingCache is not None:
+            self.ListingCache.RemoveItem(os.path.dirname(Path), os.path.basename(Path))
+        if DeleteErrors:
+            raise IOError(f"{len(DeleteErrors)} item(s) under '{Path}' could not be deleted. First error: {DeleteErrors[0]}")
+        self.serverMessage.emit({
+            "Message" : f"Server path successfully deleted: '{Path}' ({DeletedCount} item(s))"
+        })
+
+    def ReturnBulkBatchCallback(self, Path, Action):
+        ProcessedCount = 0
+        def Callback(Results, Errors):      #One message per batch rather than one per entry
+            nonlocal ProcessedCount
+            self.ReturnCancelled()
+            ProcessedCount += len(Results)
             self.serverMessage.emit({
-                "Message" : f"Server file successfully deleted: '{Path}'"
+                "Message" : f"{Action} '{Path}': {ProcessedCount} item(s) so far" + (f", {len(Errors)} failed in this batch. First error: {Errors[0]}" if Errors else "")
             })
+        return Callback
 
     def TransferFilesServerRequest(self):     
         try:
-            self.TransferFiles(self.MiscParameters["Transfer Data"], self.MiscParameters["Local Path"], self.MiscParameters["Server Path"], self.MiscParameters["Transfer Type"])
+            self.StartTransferEngine()
+            try:
+                TransferItems = [DirectoryRecordObject.DirectoryRecord(Item["Item Name"], Item["Item Type"], None, None) for Item in self.MiscParameters["Transfer Data"]]
+                self.TransferFiles(TransferItems, self.MiscParameters["Local Path"], self.MiscParameters["Server Path"], self.MiscParameters["Transfer Type"])
+            finally:
+                self.StopTransferEngine()
             self.completeDataSignal.emit({
                 "Local Path" : self.MiscParameters["Local Path"],
                 "Local Results" : self.QueryServerForADirectoriesContentsLocal(self.MiscParameters["Local Path"]), 
                 "Server Path" : self.MiscParameters["Server Path"],
-                "Server Results" : self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"])
+                "Server Results" : self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"], UseCache = False)
             })        
         except Exception as e: 
             self.completeDataSignal.emit({
                 "Error Thrown" : e
             })
 
-    def TransferFiles(self, TransferItems, LocalViewPath, ServerViewPath, TypeOfTransfer):             
-        for Item in TransferItems:
-            #Recursion case. Fetches the next directory's attributes and calls the function again
-            if Item["Item Type"] == "Folder":
+    def SyncDirectoriesServerRequest(self):     
+        try:
+            self.StartTransferEngine()
+            try:
+                self.SyncDirectories(self.MiscParameters["Local Path"], self.MiscParameters["Server Path"])
+            finally:
+                self.StopTransferEngine()
+            self.completeDataSignal.emit({
+                "Local Path" : self.MiscParameters["Local Path"],
+                "Local Results" : self.QueryServerForADirectoriesContentsLocal(self.MiscParameters["Local Path"]), 
+                "Server Path" : self.MiscParameters["Server Path"],
+                "Server Results" : self.QueryServerForADirectoriesContentsRemote(self.MiscParameters["Server Path"], UseCache = False)
+            })        
+        except Exception as e: 
+            self.completeDataSignal.emit({
+                "Error Thrown" : e
+            })
+
+    def StartTransferEngine(self):
+        self.ChannelPool = ChannelPoolObject.SFTPChannelPool(self.SSHObject, self.MiscParameters.get("Transfer Channels", 1), self.MiscParameters.get("Channel Mode", "Sessions"), self.ConnectionParameters, self.MiscParameters.get("Channel Window Size"), Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        self.LargeFileTransfer = LargeFileTransferObject.SFTPLargeFileTransfer(self.MiscParameters.get("Pipeline Requests", 64), self.MiscParameters.get("Pipeline Block Size", 32768))
+        self.TransferJournal = TransferJournalObject.TransferJournal(self.ReturnJournalPath())
+        self.DeltaSync = DeltaSyncObject.SFTPDeltaSync(self.MiscParameters.get("Sync Block Size", 1048576))
+        self.BulkOperations = BulkOperationsObject.SFTPBulkOperations(self.SSHObject, self.SFTPObject, self.ChannelPool.ChannelCount, self.MiscParameters.get("Channel Mode", "Sessions"), self.ConnectionParameters, Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        self.TransferPlanner = TransferPlannerObject.TransferPlanner(self.BulkOperations)
+        self.TransferIntegrity = IntegrityObject.TransferIntegrity(self.SSHObject, self.MiscParameters.get("Integrity Algorithm", "sha256"), self.MiscParameters.get("Integrity Batch Size", 256)) if self.MiscParameters.get("Verify Transfers") else None
+        self.TransferCipher = self.ReturnTransferCipher() if self.MiscParameters.get("Encrypt Transfers") else None
+        self.ArchiveStream = ArchiveStreamObject.SFTPArchiveStream(self.SSHObject, self.MiscParameters.get("Archive Compression", 0), self.MiscParameters.get("Preserve Times", False), Algorithm = self.TransferIntegrity.Algorithm if self.TransferIntegrity is not None else None)
+        self.TransferQueue = queue.Queue(maxsize = self.ChannelPool.ChannelCount * TRANSFERQUEUEDEPTH)
+        self.TransferLock = threading.Lock()
+        self.TransferProgress = ProgressAggregatorObject.TransferProgressAggregator(self.transferProgress.emit, self.MiscParameters.get("Progress Sample Rate", 10), \
+            RateLimitFunction = (lambda: self.BandwidthLimiter.ReturnJobRate(self)) if self.BandwidthLimiter is not None else None)
+        if self.BandwidthLimiter is not None:
+            self.BandwidthLimiter.RegisterJob(self)
+        self.TransferProgress.Start()
+        self.TransferErrors = []
+        self.TransferThreads = [threading.Thread(target = self.TransferQueueConsumer, daemon = True) for _ in range(self.ChannelPool.ChannelCount)]
+        for TransferThread in self.TransferThreads:
+            TransferThread.start()
+
+    def StopTransferEngine(self):
+        for _ in self.TransferThreads:
+            self.TransferQueue.put(None)
+        for TransferThread in self.TransferThreads:
+            TransferThread.join()
+        if self.CancelEvent.is_set() and not self.TransferErrors:
+            self.TransferErrors.append(InterruptedError("Operation cancelled"))
+        if self.TransferIntegrity is not None:
+            if not self.TransferErrors:     #Files left short of a full batch are checked on one last channel
+                Channel = self.ChannelPool.Lease()
+                try:
+                    while IntegrityBatch := self.TransferIntegrity.ReturnPending():     #Retried files land back in the pending list
+                        self.VerifyIntegrityBatch(Channel, IntegrityBatch)
+                except Exception as e:
+                    self.TransferErrors.append(e)
+                finally:
+                    self.ChannelPool.Return(Channel)
+            IntegrityReport = self.TransferIntegrity.Report
+            self.serverMessage.emit({
+                "Message" : f"Integrity check ({self.TransferIntegrity.Algorithm}): {IntegrityReport["Verified"]} verified, {IntegrityReport["Retried"]} retried, " \
+                            f"{IntegrityReport["Unverified"]} unverified, {IntegrityReport["Failed"]} failed"
+            })
+        self.TransferProgress.Stop()
+        if self.BandwidthLimiter is not None:
+            self.BandwidthLimiter.UnregisterJob(self)
+        self.ChannelPool.Close()
+        if self.TransferErrors:
+            self.TransferJournal.Save()
+            if self.TransferJournal.JournalPath is not None:
+                self.serverMessage.emit({
+                    "Message" : "Transfer interrupted, progress was saved. Start the same transfer again to resume it"
+                })
+            raise self.TransferErrors[0]
+        self.TransferJournal.Remove()
+
+    def ReturnTransferCipher(self):
+        if EncryptionObject is None:
+            raise ImportError("Encrypted transfers need the pycryptodomex and beautifulsoup4 modules")
+        #Only the key file's path travels with the job, the key itself never lands in the persisted queue
+        with open(self.MiscParameters["Encryption Key Path"], "r") as KeyFile:
+            TransferCipher = EncryptionObject.FileEncryption()
+            TransferCipher.ChangeKeyToBytes(KeyFile.read().strip())
+        if len(TransferCipher.AESKey) not in (16, 24, 32):
+            raise ValueError(f"Encryption key in '{self.MiscParameters["Encryption Key Path"]}' must be 16, 24 or 32 bytes long")
+        return TransferCipher
+
+    def ReturnJournalPath(self):
+        if self.MiscParameters.get("Journal Directory") is None:
+            return None
+        #The same selection between the same folders on the same server maps onto the same journal
+        JobKey = json.dumps([
+            (self.ConnectionParameters or {}).get("Host"),
+            self.MiscParameters["Transfer Type"],
+            self.MiscParameters["Local Path"],
+            self.MiscParameters["Server Path"],
+            sorted(Item["Item Name"] for Item in self.MiscParameters["Transfer Data"])
+        ])
+        return os.path.join(self.MiscParameters["Journal Directory"], f"{hashlib.sha1(JobKey.encode()).hexdigest()}.json")
+
+    def TransferQueueConsumer(self):
+        Channel = self.ChannelPool.Lease()
+        try:
+            with self.ReturnProfile():      #Before Python 3.12 a profiler only sees the thread that started it
+                self.ConsumeTransferQueue(Channel)
+        finally:
+            self.ChannelPool.Return(Channel)
+
+    def ConsumeTransferQueue(self, Channel):
+        while (TransferJob := self.TransferQueue.get()) is not None:
+            if not self.TransferErrors and not self.CancelEvent.is_set():     #Keep draining the queue after a failure so the producer never blocks
+                try:
+                    TransferFunction, *TransferArguments = TransferJob
+                    TransferFunction(Channel, *TransferArguments)
+                except Exception as e:
+                    with self.TransferLock:
+                        self.TransferErrors.append(e)
+
+    def TransferFiles(self, TransferItems, LocalPath, ServerPath, TypeOfTransfer):
+        #The whole source tree is planned first, so totals are known before the first byte moves
+        SourcePath = ServerPath if TypeOfTransfer == "Download" else LocalPath
+        SourceListing = self.QueryServerForADirectoriesContentsRemote(ServerPath, UseCache = False) if TypeOfTransfer == "Download" else self.QueryServerForADirectoriesContentsLocal(LocalPath)
+        if type(SourceListing) != list:
+            raise SourceListing
+        with self.ReturnSpan("Plan Transfer"):
+            Manifest = self.TransferPlanner.ReturnManifest(TransferItems, SourceListing, SourcePath, TypeOfTransfer)
+        for Record in Manifest["Files"]:
+            self.TransferProgress.QueueFile()
+            self.TransferProgress.QueueBytes(Record.Size)
+        self.serverMessage.emit({
+            "Message" : f"Planned {Manifest["Total Files"]} file(s) in {len(Manifest["Folders"])} folder(s), {Manifest["Total Bytes"]} bytes in total",
+            "Item Size": Manifest["Total Bytes"]
+        })
+        self.CreateManifestFolders(Manifest["Folders"], LocalPath, ServerPath, TypeOfTransfer)
+        ArchiveFiles, SingleFiles = self.ReturnArchiveSplit(Manifest["Files"])
+        if self.AsyncEngine is not None and self.TransferCipher is None:
+            for ArchiveBatch in self.ReturnArchiveBatches(ArchiveFiles, LocalPath, ServerPath, TypeOfTransfer):
+                self.TransferQueue.put((self.TransferArchiveBatch, ArchiveBatch, LocalPath, ServerPath, TypeOfTransfer))
+            return self.TransferFilesAsync(SingleFiles, LocalPath, ServerPath, TypeOfTransfer)
+        for Record in SingleFiles:
+            if self.TransferErrors or self.CancelEvent.is_set():
+                return
+            FolderPath, ItemName = posixpath.split(Record.Name)
+            LocalViewPath = f"{LocalPath}/{FolderPath}" if FolderPath else LocalPath
+            ServerViewPath = f"{ServerPath}/{FolderPath}" if FolderPath else ServerPath
+            self.TransferQueue.put((self.TransferSingleFile, Record._replace(Name = ItemName), LocalViewPath, ServerViewPath, TypeOfTransfer))
+        for ArchiveBatch in self.ReturnArchiveBatches(ArchiveFiles, LocalPath, ServerPath, TypeOfTransfer):
+            if self.TransferErrors or self.CancelEvent.is_set():
+                return
+            self.TransferQueue.put((self.TransferArchiveBatch, ArchiveBatch, LocalPath, ServerPath, TypeOfTransfer))
+
+    def TransferFilesAsync(self, Files, LocalPath, ServerPath, TypeOfTransfer):
+        Transfers = []
+        for Record in Files:
+            if self.TransferJournal.ReturnCompleted(f"{TypeOfTransfer}|{LocalPath}/{Record.Name}|{ServerPath}/{Record.Name}", Record.Size, int(Record.Modified)):
+                self.TransferProgress.SkipBytes(Record.Size)
+                self.TransferProgress.CompleteFile()
+                continue
+            Transfers.append({
+                "Transfer Type" : TypeOfTransfer,
+                "Local Path Item" : f"{LocalPath}/{Record.Name}",
+                "Server Path Item" : f"{ServerPath}/{Record.Name}",
+                "Directory Item" : Record
+            })
+        if not Transfers:
+            return
+        TransferArrow = "←" if TypeOfTransfer == "Download" else "→"
+        self.serverMessage.emit({
+            "Message" : f"Transferring {len(Transfers)} file(s) '{LocalPath}' {TransferArrow} '{ServerPath}' on the asyncio engine, {self.AsyncEngine.Concurrency} at a time...",
+            "Item Size": sum(Transfer["Directory Item"].Size for Transfer in Transfers)
+        })
+        self.AsyncEngine.TransferFiles(self.ConnectionParameters, Transfers, self.TransferProgress.AddBytes, self.ReturnAsyncBatchCallback(LocalPath, ServerPath, TypeOfTransfer), self.CancelEvent, self.MiscParameters.get("Preserve Times", False),
+            (lambda ByteCount: self.BandwidthLimiter.ReturnWait(self, ByteCount)) if self.BandwidthLimiter is not None else None)
+
+    def ReturnAsyncBatchCallback(self, LocalPath, ServerPath, TypeOfTransfer):
+        def Callback(Transfers):        #Runs on the engine's loop thread, one signal per folder per batch
+            ViewItems = {}
+            for Transfer in Transfers:
+                Record = Transfer["Directory Item"]
+                JournalKey = f"{TypeOfTransfer}|{Transfer["Local Path Item"]}|{Transfer["Server Path Item"]}"
+                self.CountMetric(f"{TypeOfTransfer} Files")
+                self.CountMetric(f"{TypeOfTransfer} Bytes", Record.Size)
+                self.TransferJournal.BeginFile(JournalKey, Record.Size, int(Record.Modified))
+                self.TransferJournal.CompleteFile(JournalKey)
+                self.TransferProgress.CompleteFile()
+                if self.TransferIntegrity is not None:      #asyncssh gives no hook on the data, so these files go unhashed
+                    self.TransferIntegrity.AddToReport("Unverified")
+                FolderPath, ItemName = posixpath.split(Record.Name)
                 if TypeOfTransfer == "Download":
-                    NextFolderLocal = f"{LocalViewPath}/{Item["Item Name"]}"
-                    NextFolderServer = f"{ServerViewPath}/{Item["Item Name"]}"
-                    if not os.path.exists(NextFolderLocal):
-                        os.mkdir(NextFolderLocal)
-                        self.serverMessage.emit({
-                            "Message" : f"Local folder sucessfully created at '{NextFolderLocal}'"
-                        })
-                    QueryResults = self.QueryServerForADirectoriesContentsRemote(NextFolderServer)
-                    self.TransferFiles(QueryResults, NextFolderLocal, NextFolderServer, TypeOfTransfer)
-                elif TypeOfTransfer == "Upload":
-                    NextFolderLocal = f"{LocalViewPath}/{Item["Item Name"]}"
-                    NextFolderServer = f"{ServerViewPath}/{Item["Item Name"]}"
-                    NextPathItems = os.listdir()
-                    if not self.ReturnRemoteDirectory(NextFolderServer):
-                        self.SFTPObject.mkdir(NextFolderServer)
-                        self.serverMessage.emit({
-                            "Message" : f"Server folder sucessfully created at '{NextFolderServer}'"
-                        })
-                    QueryResults = self.QueryServerForADirectoriesContentsLocal(NextFolderLocal)
-                    self.TransferFiles(QueryResults, NextFolderLocal, NextFolderServer, TypeOfTransfer)
-            #Base case - Fetches or uploads file in the list
-            elif Item["Item Type"] == "File":
+                    LocalViewPath = f"{LocalPath}/{FolderPath}" if FolderPath else LocalPath
+                    ViewItems.setdefault(LocalViewPath, []).append(self.ReturnLocalDirectoryItem(LocalViewPath, ItemName))
+                else:
+                    ServerViewPath = f"{ServerPath}/{FolderPath}" if FolderPath else ServerPath
+                    DirectoryItem = Record._replace(Name = ItemName, Modified = Record.Modified if self.MiscParameters.get("Preserve Times") else time.time())
+                    if self.ListingCache is not None:
+                        self.ListingCache.PatchItem(ServerViewPath, DirectoryItem)
+                    ViewItems.setdefault(ServerViewPath, []).append(DirectoryItem)
+            for ViewPath, DirectoryItems in ViewItems.items():
                 if TypeOfTransfer == "Download":
-                    ServerPathItem = f"{ServerViewPath}/{Item["Item Name"]}"
-                    LocalPathItem = f"{LocalViewPath}/{Item["Item Name"]}"
-                    FileStat = self.SFTPObject.stat(ServerPathItem)
-                    self.serverMessage.emit({
-                        "Message" : f"Starting transfer '{LocalPathItem}' ← '{ServerPathItem}'...",
-                        "Item Size": FileStat.st_size
-                    })
-                    self.SFTPObject.get(ServerPathItem, LocalPathItem, callback=self.TransferProgess)
                     self.transferCompleteLocal.emit({
-                        "Local Path" : LocalViewPath, 
-                        "Directory Items" : self.QueryServerForADirectoriesContentsLocal(LocalViewPath)
+                        "Local Path" : ViewPath, 
+                        "Directory Items" : DirectoryItems
                     })
-                elif TypeOfTransfer == "Upload": 
-                    ServerPathItem = f"{ServerViewPath}/{Item["Item Name"]}"
-                    LocalPathItem = f"{LocalViewPath}/{Item["Item Name"]}"
-                    FileSize = os.path.getsize(LocalPathItem)
-                    self.serverMessage.emit({
-                        "Message" : f"Starting transfer '{LocalPathItem}' → '{ServerPathItem}'...",
-                        "Item Size": FileSize
+                else:
+                    self.transferCompleteRemote.emit({
+                        "Server Path" : ViewPath, 
+                        "Directory Items" : DirectoryItems
+                    })
+        return Callback
+
+    def ReturnArchiveSplit(self, Files):
+        #Only 'Auto' picks the archive stream, and only once enough small files make the per file round trips dominate
+        if self.MiscParameters.get("Transfer Mode", "Standard") != "Auto" or self.TransferCipher is not None:
+            return [], Files
+        ArchiveFiles = [Record for Record in Files if Record.Size < self.MiscParameters.get("Archive File Threshold", 1048576)]
+        if len(ArchiveFiles) < self.MiscParameters.get("Archive Minimum Files", 32) or not self.ArchiveStream.ReturnServerTar():
+            return [], Files
+        return ArchiveFiles, [Record for Record in Files if Record.Size >= self.MiscParameters.get("Archive File Threshold", 1048576)]
+
+    def ReturnArchiveBatches(self, Files, LocalPath, ServerPath, TypeOfTransfer):
+        #Batches are spread over every channel, and capped in bytes so an interrupted batch costs little to redo
+        BatchFiles = math.ceil(len(Files) / self.ChannelPool.ChannelCount) if Files else 0
+        ArchiveBatch, BatchBytes = [], 0
+        for Record in Files:
+            if self.TransferJournal.ReturnCompleted(f"{TypeOfTransfer}|{LocalPath}/{Record.Name}|{ServerPath}/{Record.Name}", Record.Size, int(Record.Modified)):
+                self.TransferProgress.SkipBytes(Record.Size)
+                self.TransferProgress.CompleteFile()
+                continue
+            if ArchiveBatch and (len(ArchiveBatch) >= BatchFiles or BatchBytes + Record.Size > self.MiscParameters.get("Archive Batch Size", 67108864)):
+                yield ArchiveBatch
+                ArchiveBatch, BatchBytes = [], 0
+            ArchiveBatch.append(Record)
+            BatchBytes += Record.Size
+        if ArchiveBatch:
+            yield ArchiveBatch
+
+    def TransferArchiveBatch(self, Channel, Records, LocalPath, ServerPath, TypeOfTransfer):
+        #Runs on its own exec channel, the leased SFTP channel is left idle for the length of the batch
+        for Record in Records:
+            self.TransferJournal.BeginFile(f"{TypeOfTransfer}|{LocalPath}/{Record.Name}|{ServerPath}/{Record.Name}", Record.Size, int(Record.Modified))
+        TransferArrow = "←" if TypeOfTransfer == "Download" else "→"
+        self.serverMessage.emit({
+            "Message" : f"Streaming {len(Records)} small file(s) as one archive '{LocalPath}' {TransferArrow} '{ServerPath}'...",
+            "Item Size": sum(Record.Size for Record in Records)
+        })
+        ArchiveDigests = []
+        FileCallback = self.ReturnArchiveFileCallback(LocalPath, ServerPath, TypeOfTransfer, ArchiveDigests)
+        with self.ReturnSpan(f"{TypeOfTransfer} Archive Batch"):
+            if TypeOfTransfer == "Download":
+                self.ArchiveStream.Download(ServerPath, LocalPath, Records, FileCallback, self.AddArchiveBytes)
+            elif TypeOfTransfer == "Upload":
+                self.ArchiveStream.Upload(LocalPath, ServerPath, Records, FileCallback, self.AddArchiveBytes)
+        self.CountMetric(f"{TypeOfTransfer} Files", len(Records))
+        self.CountMetric(f"{TypeOfTransfer} Bytes", sum(Record.Size for Record in Records))
+        for Record, Digest in ArchiveDigests:       #Recorded once the stream is closed, a retry never runs inside it
+            FolderPath, ItemName = posixpath.split(Record.Name)
+            LocalViewPath = f"{LocalPath}/{FolderPath}" if FolderPath else LocalPath
+            ServerViewPath = f"{ServerPath}/{FolderPath}" if FolderPath else ServerPath
+            self.RecordIntegrity(Channel, f"{ServerPath}/{Record.Name}", Digest, (Record._replace(Name = ItemName), LocalViewPath, ServerViewPath, TypeOfTransfer, 0))
+
+    def AddArchiveBytes(self, ByteCount):
+        self.ReturnCancelled()
+        self.AddTransferBytes(ByteCount)
+
+    def ReturnArchiveFileCallback(self, LocalPath, ServerPath, TypeOfTransfer, ArchiveDigests):
+        def Callback(Record, Digest):
+            if Digest is not None:
+                ArchiveDigests.append((Record, Digest))
+            FolderPath, ItemName = posixpath.split(Record.Name)
+            LocalViewPath = f"{LocalPath}/{FolderPath}" if FolderPath else LocalPath
+            ServerViewPath = f"{ServerPath}/{FolderPath}" if FolderPath else ServerPath
+            self.TransferJournal.CompleteFile(f"{TypeOfTransfer}|{LocalPath}/{Record.Name}|{ServerPath}/{Record.Name}")
+            if TypeOfTransfer == "Download":
+                self.transferCompleteLocal.emit({
+                    "Local Path" : LocalViewPath, 
+                    "Directory Item" : self.ReturnLocalDirectoryItem(LocalViewPath, ItemName)
+                })
+            else:       #Built from the plan, a stat per file is exactly the round trip the archive avoids
+                DirectoryItem = Record._replace(Name = ItemName, Modified = Record.Modified if self.MiscParameters.get("Preserve Times") else time.time())
+                if self.ListingCache is not None:
+                    self.ListingCache.PatchItem(ServerViewPath, DirectoryItem)
+                self.transferCompleteRemote.emit({
+                    "Server Path" : ServerViewPath, 
+                    "Directory Item" : DirectoryItem
+                })
+            self.TransferProgress.CompleteFile()
+        return Callback
+
+    def CreateManifestFolders(self, Folders, LocalPath, ServerPath, TypeOfTransfer):
+        CreatedFolders = 0
+        for Folder in Folders:
+            if TypeOfTransfer == "Download" and not os.path.isdir(f"{LocalPath}/{Folder}"):
+                os.mkdir(f"{LocalPath}/{Folder}")
+                CreatedFolders += 1
+                if "/" not in Folder:
+                    self.transferCompleteLocal.emit({
+                        "Local Path" : LocalPath, 
+                        "Directory Item" : self.ReturnLocalDirectoryItem(LocalPath, Folder)
                     })
-                    self.SFTPObject.put(LocalPathItem, ServerPathItem, callback=self.TransferProgess)
+            elif TypeOfTransfer == "Upload":
+                try:    #Trying mkdir first costs one round trip per folder, a stat only pays off when it already exists
+                    self.SFTPObject.mkdir(f"{ServerPath}/{Folder}")
+                except IOError:
+                    if not self.ReturnRemoteDirectory(f"{ServerPath}/{Folder}"):
+                        raise
+                    continue
+                CreatedFolders += 1
+                if "/" not in Folder:
                     self.transferCompleteRemote.emit({
-                        "Server Path" : ServerViewPath, 
-                        "Directory Items" : self.QueryServerForADirectoriesContentsRemote(ServerViewPath)
+                        "Server Path" : ServerPath, 
+                        "Directory Item" : self.PatchRemoteListing(self.SFTPObject, ServerPath, Folder)
                     })
-        
-    def TransferProgess(self, bytesSoFar, totalBytes):
-        self.transferProgress.emit({
-            "Current Bytes": bytesSoFar, 
-            "Total Bytes": totalBytes
+        if CreatedFolders:
+            self.serverMessage.emit({
+                "Message" : f"{"Local" if TypeOfTransfer == "Download" else "Server"} folders sucessfully created: {CreatedFolders}"
+            })
+
+    def SyncDirectories(self, LocalPath, ServerPath):
+        LocalFiles, LocalFolders = self.DeltaSync.ReturnLocalTree(LocalPath)
+        ServerFiles, ServerFolders = self.ReturnServerTree(ServerPath)
+        if self.ListingCache is not None:
+            self.ListingCache.InvalidateTree(ServerPath)
+        for Folder in sorted(LocalFolders - ServerFolders):       #Sorted so parents are created before their children
+            self.SFTPObject.mkdir(f"{ServerPath}/{Folder}")
+            self.serverMessage.emit({
+                "Message" : f"Server folder sucessfully created at '{ServerPath}/{Folder}'"
+            })
+        for Folder in sorted(ServerFolders - LocalFolders):
+            os.mkdir(f"{LocalPath}/{Folder}")
+            self.serverMessage.emit({
+                "Message" : f"Local folder sucessfully created at '{LocalPath}/{Folder}'"
+            })
+        SyncPlan = self.DeltaSync.ReturnSyncPlan(LocalFiles, ServerFiles)
+        SyncActions = [Action for _, Action in SyncPlan]
+        self.serverMessage.emit({
+            "Message" : f"Sync compared {len(SyncPlan)} file(s): {SyncActions.count("Upload")} to upload, {SyncActions.count("Download")} to download, " \
+                        f"{SyncActions.count("Delta Upload") + SyncActions.count("Delta Download")} to patch by block, {SyncActions.count("Unchanged")} unchanged"
+        })
+        for RelativePath, Action in SyncPlan:
+            if Action in ("Upload", "Download", "Delta Upload", "Delta Download"):
+                self.TransferProgress.QueueFile()
+            if Action in ("Upload", "Download"):
+                self.TransferProgress.QueueBytes((LocalFiles if Action == "Upload" else ServerFiles)[RelativePath][0])
+        for RelativePath, Action in SyncPlan:
+            if self.TransferErrors or self.CancelEvent.is_set():
+                return
+            FolderPath, ItemName = os.path.split(RelativePath)
+            ItemSize, ItemModified = (LocalFiles if Action.endswith("Upload") else ServerFiles).get(RelativePath, (None, None))
+            Item = DirectoryRecordObject.DirectoryRecord(ItemName, "File", ItemModified, ItemSize)
+            LocalViewPath = f"{LocalPath}/{FolderPath}" if FolderPath else LocalPath
+            ServerViewPath = f"{ServerPath}/{FolderPath}" if FolderPath else ServerPath
+            if Action in ("Upload", "Download"):
+                self.TransferQueue.put((self.TransferSingleFile, Item, LocalViewPath, ServerViewPath, Action))
+            elif Action in ("Delta Upload", "Delta Download"):
+                self.TransferQueue.put((self.TransferDeltaFile, Item, LocalViewPath, ServerViewPath, Action.split()[1]))
+            elif Action == "Conflict":
+                self.serverMessage.emit({
+                    "Message" : f"Skipping '{RelativePath}', both copies share a modification time but differ in size"
+                })
+
+    def ReturnServerTree(self, ServerPath):
+        TreeRecords, TreeErrors = self.BulkOperations.WalkTree(ServerPath)
+        if TreeErrors:      #Unread folders would look empty and get everything uploaded again
+            raise IOError(f"Could not read the whole server tree under '{ServerPath}'. First error: {TreeErrors[0]}")
+        ServerFiles = {Record.Name : (Record.Size, int(Record.Modified)) for Record in TreeRecords if Record.Type == "File"}
+        return ServerFiles, {Record.Name for Record in TreeRecords if Record.Type == "Folder"}
+
+    def TransferDeltaFile(self, Channel, Item, LocalViewPath, ServerViewPath, TypeOfTransfer):
+        ServerPathItem = f"{ServerViewPath}/{Item.Name}"
+        LocalPathItem = f"{LocalViewPath}/{Item.Name}"
+        with self.ReturnSpan("Delta Compare"):
+            ChangedBlocks = self.DeltaSync.ReturnChangedBlocks(self.SSHObject, LocalPathItem, ServerPathItem, TypeOfTransfer)
+        if ChangedBlocks is None:       #Server cannot hash blocks, copy the whole file instead
+            self.TransferProgress.QueueBytes(Item.Size)
+            return self.TransferSingleFile(Channel, Item, LocalViewPath, ServerViewPath, TypeOfTransfer)
+        ChangedBytes = sum(Length for _, Length in ChangedBlocks)
+        self.TransferProgress.QueueBytes(ChangedBytes)
+        TransferArrow = "←" if TypeOfTransfer == "Download" else "→"
+        self.serverMessage.emit({
+            "Message" : f"Patching {len(ChangedBlocks)} changed block(s) '{LocalPathItem}' {TransferArrow} '{ServerPathItem}'...",
+            "Item Size": ChangedBytes
+        })
+        if TypeOfTransfer == "Download":
+            FileModified = int(Channel.stat(ServerPathItem).st_mtime)
+            self.DeltaSync.GetBlocks(Channel, ServerPathItem, LocalPathItem, ChangedBlocks, self.TransferProgessCallback())
+            os.utime(LocalPathItem, (FileModified, FileModified))
+            self.transferCompleteLocal.emit({
+                "Local Path" : LocalViewPath, 
+                "Directory Item" : self.ReturnLocalDirectoryItem(LocalViewPath, Item.Name)
+            })
+        elif TypeOfTransfer == "Upload":
+            FileModified = int(os.stat(LocalPathItem).st_mtime)
+            self.DeltaSync.PutBlocks(Channel, LocalPathItem, ServerPathItem, ChangedBlocks, self.TransferProgessCallback())
+            Channel.utime(ServerPathItem, (FileModified, FileModified))
+            self.transferCompleteRemote.emit({
+                "Server Path" : ServerViewPath, 
+                "Directory Item" : self.PatchRemoteListing(Channel, ServerViewPath, Item.Name)
+            })
+        if self.TransferIntegrity is not None:      #Only the changed blocks streamed, the whole file was never hashed
+            self.TransferIntegrity.AddToReport("Unverified")
+        self.TransferProgress.CompleteFile()
+        self.CountMetric(f"{TypeOfTransfer} Files")
+        self.CountMetric(f"{TypeOfTransfer} Bytes", ChangedBytes)
+
+    def TransferSingleFile(self, Channel, Item, LocalViewPath, ServerViewPath, TypeOfTransfer, Attempt = 0):
+        ServerPathItem = f"{ServerViewPath}/{Item.Name}"
+        LocalPathItem = f"{LocalViewPath}/{Item.Name}"
+        JournalKey = self.ReturnJournalKey(TypeOfTransfer, LocalPathItem, ServerPathItem)
+        FileSize, FileModified = Item.Size, int(Item.Modified)       #Planned up front, and already counted in the job totals
+        if self.TransferJournal.ReturnCompleted(JournalKey, FileSize, FileModified):
+            self.TransferProgress.SkipBytes(FileSize)
+            self.TransferProgress.CompleteFile()
+            self.serverMessage.emit({
+                "Message" : f"Skipping '{Item.Name}', already transferred by a previous attempt"
+            })
+            return
+        if self.TransferCipher is None:
+            ResumeOffset = self.ReturnResumeOffset(Channel, JournalKey, LocalPathItem, ServerPathItem, TypeOfTransfer, FileSize, FileModified)
+        else:       #Chunks are sealed to their position in the file, an encrypted transfer always starts again from the top
+            self.TransferJournal.BeginFile(JournalKey, FileSize, FileModified)
+            ResumeOffset = 0
+        TransferArrow = "←" if TypeOfTransfer == "Download" else "→"
+        self.serverMessage.emit({
+            "Message" : f"Resuming transfer '{LocalPathItem}' {TransferArrow} '{ServerPathItem}' at byte {ResumeOffset}..." if ResumeOffset > 0 else \
+                        f"Starting {"encrypted " if self.TransferCipher is not None else ""}transfer '{LocalPathItem}' {TransferArrow} '{ServerPathItem}'...",
+            "Item Size": FileSize
         })
+        self.TransferProgress.SkipBytes(ResumeOffset)
+        ProgressCallback = self.TransferProgessCallback(JournalKey if self.TransferCipher is None else None, ResumeOffset)     #Ciphertext offsets are never journalled, nothing could resume from them
+        TransferMethod = self.ReturnTransferMethod(FileSize) if self.TransferCipher is None else "Encrypted"
+        #Hashed as the bytes stream past, paramiko's own get/put give no hook on the data so they go through the pipelined path
+        Checksum = self.TransferIntegrity.ReturnHasher() if self.TransferIntegrity is not None and (ResumeOffset > 0 or TransferMethod != "Segmented") else None
+        StartCounter = time.perf_counter()
+        if TypeOfTransfer == "Download":
+            if ResumeOffset > 0:
+                self.LargeFileTransfer.ResumeGet(Channel, ServerPathItem, LocalPathItem, ResumeOffset, ProgressCallback, Checksum)
+            elif TransferMethod == "Segmented":
+                self.TransferSegmentedFile(LocalPathItem, ServerPathItem, TypeOfTransfer)
+            elif TransferMethod == "Encrypted":
+                self.LargeFileTransfer.EncryptedGet(Channel, ServerPathItem, LocalPathItem, self.TransferCipher, ProgressCallback, Checksum)
+            elif TransferMethod == "Pipelined" or Checksum is not None:
+                self.LargeFileTransfer.Get(Channel, ServerPathItem, LocalPathItem, ProgressCallback, Checksum)
+            else:
+                Channel.get(ServerPathItem, LocalPathItem, callback=ProgressCallback)
+            if self.MiscParameters.get("Preserve Times"):
+                os.utime(LocalPathItem, (FileModified, FileModified))
+            self.TransferJournal.CompleteFile(JournalKey)
+            self.transferCompleteLocal.emit({
+                "Local Path" : LocalViewPath, 
+                "Directory Item" : self.ReturnLocalDirectoryItem(LocalViewPath, Item.Name)
+            })
+        elif TypeOfTransfer == "Upload": 
+            if ResumeOffset > 0:
+                self.LargeFileTransfer.ResumePut(Channel, LocalPathItem, ServerPathItem, ResumeOffset, ProgressCallback, Checksum)
+            elif TransferMethod == "Segmented":
+                self.TransferSegmentedFile(LocalPathItem, ServerPathItem, TypeOfTransfer)
+            elif TransferMethod == "Encrypted":
+                self.LargeFileTransfer.EncryptedPut(Channel, LocalPathItem, ServerPathItem, self.TransferCipher, ProgressCallback, Checksum)
+            elif TransferMethod == "Pipelined" or Checksum is not None:
+                self.LargeFileTransfer.Put(Channel, LocalPathItem, ServerPathItem, ProgressCallback, Checksum)
+            else:
+                Channel.put(LocalPathItem, ServerPathItem, callback=ProgressCallback)
+            if self.MiscParameters.get("Preserve Times"):
+                Channel.utime(ServerPathItem, (FileModified, FileModified))
+            self.TransferJournal.CompleteFile(JournalKey)
+            self.transferCompleteRemote.emit({
+                "Server Path" : ServerViewPath, 
+                "Directory Item" : self.PatchRemoteListing(Channel, ServerViewPath, Item.Name)
+            })
+        self.TransferProgress.CompleteFile()
+        if self.Metrics is not None:        #Timed per method, a slow segmented or encrypted path stands apart from the rest
+            self.Metrics.Observe(f"{TypeOfTransfer} File ({TransferMethod if ResumeOffset == 0 else "Resumed"})", time.perf_counter() - StartCounter, StartCounter)
+            self.Metrics.Count(f"{TypeOfTransfer} Files")
+            self.Metrics.Count(f"{TypeOfTransfer} Bytes", FileSize - ResumeOffset)
+        if Checksum is not None:
+            self.RecordIntegrity(Channel, ServerPathItem, Checksum.hexdigest(), (Item, LocalViewPath, ServerViewPath, TypeOfTransfer, Attempt))
+
+    def RecordIntegrity(self, Channel, ServerPathItem, Digest, RetryJob):
+        IntegrityBatch = self.TransferIntegrity.Record(ServerPathItem, Digest, RetryJob)
+        if IntegrityBatch is not None:
+            self.VerifyIntegrityBatch(Channel, IntegrityBatch)
+
+    def VerifyIntegrityBatch(self, Channel, IntegrityBatch):
+        #Mismatched files go out again on this same channel, a file still wrong after every retry fails the job
+        with self.ReturnSpan("Verify Batch"):
+            Mismatches = self.TransferIntegrity.ReturnMismatches(IntegrityBatch, Channel)
+        for Item, LocalViewPath, ServerViewPath, TypeOfTransfer, Attempt in Mismatches:
+            LocalPathItem, ServerPathItem = f"{LocalViewPath}/{Item.Name}", f"{ServerViewPath}/{Item.Name}"
+            if Attempt >= self.MiscParameters.get("Verify Retries", 2):
+                self.TransferIntegrity.AddToReport("Failed")
+                raise IOError(f"Checksum mismatch between '{LocalPathItem}' and '{ServerPathItem}' after {Attempt + 1} attempt(s)")
+            self.TransferIntegrity.AddToReport("Retried")
+            self.serverMessage.emit({
+                "Message" : f"Checksum mismatch between '{LocalPathItem}' and '{ServerPathItem}', transferring it again"
+            })
+            self.TransferJournal.ForgetFile(self.ReturnJournalKey(TypeOfTransfer, LocalPathItem, ServerPathItem))
+            self.TransferProgress.QueueFile()
+            self.TransferProgress.QueueBytes(Item.Size)
+            self.TransferSingleFile(Channel, Item, LocalViewPath, ServerViewPath, TypeOfTransfer, Attempt + 1)
+
+    def ReturnJournalKey(self, TypeOfTransfer, LocalPathItem, ServerPathItem):
+        #Encrypted transfers keep their own entries, a plain retry never trusts what an encrypted attempt recorded
+        return f"{TypeOfTransfer}|{LocalPathItem}|{ServerPathItem}" + ("|Encrypted" if self.TransferCipher is not None else "")
+
+    def ReturnResumeOffset(self, Channel, JournalKey, LocalPathItem, ServerPathItem, TypeOfTransfer, FileSize, FileModified):
+        JournalOffset = self.TransferJournal.BeginFile(JournalKey, FileSize, FileModified)
+        if JournalOffset <= 0 or JournalOffset >= FileSize:
+            return 0
+        #Never trust the journal past what actually reached the destination
+        if TypeOfTransfer == "Download":
+            DestinationSize = os.path.getsize(LocalPathItem) if os.path.isfile(LocalPathItem) else 0
+        else:
+            try:
+                DestinationSize = Channel.stat(ServerPathItem).st_size
+            except IOError:
+                DestinationSize = 0
+        return min(JournalOffset, DestinationSize)
+
+    def TransferSegmentedFile(self, LocalPathItem, ServerPathItem, TypeOfTransfer):
+        #Every range gets its own channel, opened for this file only so the shared pool keeps serving other files
+        SegmentPool = ChannelPoolObject.SFTPChannelPool(self.SSHObject, self.MiscParameters.get("Segment Count", 4), self.MiscParameters.get("Channel Mode", "Sessions"), self.ConnectionParameters, self.MiscParameters.get("Channel Window Size"), Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        try:
+            if TypeOfTransfer == "Download":
+                self.LargeFileTransfer.SegmentedGet(SegmentPool, ServerPathItem, LocalPathItem, SegmentPool.ChannelCount, self.TransferProgessCallback)
+            elif TypeOfTransfer == "Upload":
+                self.LargeFileTransfer.SegmentedPut(SegmentPool, LocalPathItem, ServerPathItem, SegmentPool.ChannelCount, self.TransferProgessCallback)
+            Channel = SegmentPool.Lease()
+            try:
+                Checksum = self.LargeFileTransfer.ValidateChecksum(self.SSHObject, Channel, ServerPathItem, LocalPathItem)
+            finally:
+                SegmentPool.Return(Channel)
+        finally:
+            SegmentPool.Close()
+        if self.TransferIntegrity is not None:
+            self.TransferIntegrity.AddToReport("Verified" if Checksum is not None else "Unverified")
+        self.serverMessage.emit({
+            "Message" : f"Checksum verified for '{LocalPathItem}' (sha256 {Checksum})" if Checksum is not None else f"Server could not checksum '{ServerPathItem}', segmented transfer is unverified"
+        })
+
+    def ReturnTransferMethod(self, FileSize):
+        TransferMode = self.MiscParameters.get("Transfer Mode", "Standard")
+        IsLargeFile = FileSize >= self.MiscParameters.get("Large File Threshold", 0)
+        if TransferMode == "Auto":
+            return "Pipelined" if IsLargeFile else "Standard"
+        elif TransferMode == "Segmented":
+            return "Segmented" if IsLargeFile else "Standard"
+        return TransferMode
+
+    def TransferProgessCallback(self, JournalKey = None, StartOffset = 0):
+        LastBytes = 0
+        def Callback(bytesSoFar, totalBytes):      #Paramiko reports per file, fold each delta into the job totals
+            nonlocal LastBytes
+            self.ReturnCancelled()      #Raising here aborts the file mid transfer, the journal keeps its offset
+            self.AddTransferBytes(bytesSoFar - LastBytes)
+            LastBytes = bytesSoFar
+            if JournalKey is not None:
+                self.TransferJournal.UpdateOffset(JournalKey, StartOffset + bytesSoFar)
+        return Callback
+
+    def AddTransferBytes(self, ByteCount):
+        #Every data path reports through here, holding the caller back is what shapes the transfer
+        self.TransferProgress.AddBytes(ByteCount)
+        if self.BandwidthLimiter is not None:
+            self.BandwidthLimiter.Acquire(self, ByteCount, self.CancelEvent)
 
     def ReturnRemoteDirectory(self, ServerPath):
         try:
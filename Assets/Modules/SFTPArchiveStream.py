@@ -0,0 +1,98 @@
+import os, io, shlex, tarfile, hashlib, threading
+
+class SFTPArchiveStream():
+    def __init__(self, SSHObj, CompressionLevel = 0, PreserveTimes = False, BlockSize = 65536, Algorithm = None):
+        self.SSHObject = SSHObj
+        self.CompressionLevel = CompressionLevel        #gzip level for the stream, 0 sends it uncompressed
+        self.PreserveTimes = PreserveTimes
+        self.BlockSize = BlockSize
+        self.Algorithm = Algorithm      #Hash taken of every member as it streams, None skips it
+        self.ServerTar = None       #Whether the server can run tar over an exec channel, probed on first use
+
+    def ReturnServerTar(self):
+        if self.ServerTar is None:
+            try:
+                Channel = self.SSHObject.get_transport().open_session()
+                try:
+                    Channel.exec_command("tar --version")
+                    Channel.makefile("rb").read()
+                    self.ServerTar = Channel.recv_exit_status() == 0
+                finally:
+                    Channel.close()
+            except Exception:       #No shell access, an SFTP only account
+                self.ServerTar = False
+        return self.ServerTar
+
+    def Upload(self, LocalPath, ServerPath, Records, FileCallback, ProgressCallback):
+        #Files are packed straight into the channel and unpacked by the server as they arrive, nothing touches a temporary file
+        Digests = {}
+        Channel = self.SSHObject.get_transport().open_session()
+        try:
+            Channel.exec_command(f"tar -x {"-z " if self.CompressionLevel else ""}{"" if self.PreserveTimes else "-m "}--no-same-owner -C {shlex.quote(ServerPath)} -f -")
+            ChannelFile = Channel.makefile("wb")
+            with tarfile.open(fileobj = ChannelFile, mode = "w|gz" if self.CompressionLevel else "w|", bufsize = self.BlockSize, **({"compresslevel" : self.CompressionLevel} if self.CompressionLevel else {})) as Archive:
+                for Record in Records:
+                    ArchiveMember = Archive.gettarinfo(f"{LocalPath}/{Record.Name}", arcname = Record.Name)
+                    ArchiveMember.uid, ArchiveMember.gid, ArchiveMember.uname, ArchiveMember.gname = 0, 0, "", ""
+                    with open(f"{LocalPath}/{Record.Name}", "rb") as LocalFile:
+                        if self.Algorithm is None:
+                            Archive.addfile(ArchiveMember, LocalFile)
+                        else:       #Members are small, read once into memory so the hash and the archive share that read
+                            Data = LocalFile.read(ArchiveMember.size)
+                            Digests[Record.Name] = hashlib.new(self.Algorithm, Data).hexdigest()
+                            Archive.addfile(ArchiveMember, io.BytesIO(Data))
+                    ProgressCallback(ArchiveMember.size)
+            ChannelFile.flush()
+            Channel.shutdown_write()
+            self.ReturnExitStatus(Channel, "extract")
+        finally:
+            Channel.close()
+        for Record in Records:      #The server only confirms the whole archive, never a single member
+            FileCallback(Record, Digests.get(Record.Name))
+
+    def Download(self, ServerPath, LocalPath, Records, FileCallback, ProgressCallback):
+        #Names go in over stdin so no command line limit applies, members are written out as they stream past
+        Channel = self.SSHObject.get_transport().open_session()
+        try:
+            Channel.exec_command(f"tar -c {"-z " if self.CompressionLevel else ""}-C {shlex.quote(ServerPath)} --null -T - -f -")
+            NameErrors = []
+            def SendNames():        #Written alongside the read below, tar stops taking names once its output fills the channel window
+                try:
+                    Channel.sendall("".join(f"{Record.Name}\0" for Record in Records).encode("utf-8"))
+                    Channel.shutdown_write()
+                except Exception as e:      #The channel closed under it, the read below reports why
+                    NameErrors.append(e)
+            NameSender = threading.Thread(target = SendNames, daemon = True)
+            NameSender.start()
+            PendingRecords = {Record.Name : Record for Record in Records}
+            with tarfile.open(fileobj = Channel.makefile("rb"), mode = "r|gz" if self.CompressionLevel else "r|", bufsize = self.BlockSize) as Archive:
+                for ArchiveMember in Archive:
+                    Record = PendingRecords.pop(ArchiveMember.name, None)
+                    if Record is None or not ArchiveMember.isfile():     #Only the requested regular files are ever written
+                        continue
+                    ArchiveFile = Archive.extractfile(ArchiveMember)
+                    Checksum = hashlib.new(self.Algorithm) if self.Algorithm is not None else None
+                    with open(f"{LocalPath}/{Record.Name}", "wb") as LocalFile:
+                        while Block := ArchiveFile.read(self.BlockSize):
+                            LocalFile.write(Block)
+                            if Checksum is not None:
+                                Checksum.update(Block)
+                    if self.PreserveTimes:
+                        os.utime(f"{LocalPath}/{Record.Name}", (ArchiveMember.mtime, ArchiveMember.mtime))
+                    ProgressCallback(ArchiveMember.size)
+                    FileCallback(Record, Checksum.hexdigest() if Checksum is not None else None)
+            NameSender.join()
+            self.ReturnExitStatus(Channel, "create")
+            if NameErrors:
+                raise IOError(f"Could not send the file list to the server tar: {NameErrors[0]}")
+            if PendingRecords:
+                raise IOError(f"Server archive was missing {len(PendingRecords)} file(s), first was '{next(iter(PendingRecords))}'")
+        finally:
+            Channel.close()
+
+    def ReturnExitStatus(self, Channel, Action):
+        ExitStatus = Channel.recv_exit_status()
+        if ExitStatus != 0:
+            ErrorOutput = Channel.makefile_stderr("rb").read().decode("utf-8", "replace").strip()
+            raise IOError(f"Server tar could not {Action} the archive (exit status {ExitStatus}): {ErrorOutput}")
+        return ExitStatus
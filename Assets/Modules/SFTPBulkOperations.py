@@ -0,0 +1,230 @@
+from Assets.Modules import \
+    SFTPChannelPool as ChannelPoolObject \
+    , DirectoryRecord as DirectoryRecordObject
+import posixpath, shlex, stat, threading, concurrent.futures
+
+BULKBATCHSIZE = 1000        #Entries reported back per batch callback
+BULKRECEIVESIZE = 65536     #Bytes read from a server command's output at a time
+FINDTYPES = {
+    "f" : "File",
+    "d" : "Folder"
+}
+
+class SFTPBulkOperations():
+    def __init__(self, SSHObj, SFTPObj, ChannelCount = 4, ChannelMode = "Sessions", Conn = None, BatchSize = BULKBATCHSIZE, Manager = None, ConnectionKey = None):
+        self.SSHObject = SSHObj
+        self.SFTPObject = SFTPObj
+        self.ChannelCount = ChannelCount        #Channels opened for the SFTP fallback only
+        self.ChannelMode = ChannelMode
+        self.ConnectionParameters = Conn
+        self.BatchSize = BatchSize
+        self.ConnectionManager = Manager
+        self.ConnectionKey = ConnectionKey
+        self.ServerFind = None      #Whether the server runs a find with -printf and -delete, probed on first use
+
+    def Delete(self, ServerPath, BatchCallback = None):
+        if self.ReturnServerFind():
+            Deleted, Errors = [], []
+            #Printed only once removed, a path find could not delete shows up on stderr alone
+            for ItemPath in self.ReturnServerRecords(f"find {shlex.quote(ServerPath)} -delete -print0", BatchCallback, Deleted, Errors):
+                Deleted.append(ItemPath)
+            return len(Deleted), Errors
+        return self.DeleteOverSFTP(ServerPath, BatchCallback)
+
+    def Copy(self, ServerPath, DestinationPath, BatchCallback = None):
+        #The copy never leaves the server when it has a shell, links are copied as links and never followed
+        try:
+            self.SFTPObject.lstat(DestinationPath)
+            raise FileExistsError(f"'{DestinationPath}' already exists on the server")
+        except FileNotFoundError:
+            pass
+        if self.ReturnServerFind():
+            Copied, Errors = [], []
+            for ItemPath in self.ReturnServerRecords(f"cp -R -- {shlex.quote(ServerPath)} {shlex.quote(DestinationPath)}; find {shlex.quote(DestinationPath)} -print0 2>/dev/null", BatchCallback, Copied, Errors):
+                Copied.append(ItemPath)
+            return len(Copied), Errors
+        return self.CopyOverSFTP(ServerPath, DestinationPath, BatchCallback)
+
+    def WalkTree(self, ServerPath, BatchCallback = None):
+        #Records carry paths relative to ServerPath, links inside the tree are reported with an empty type and never followed
+        if self.ReturnServerFind():
+            Records, Errors, PathPrefix = [], [], ServerPath.rstrip("/") + "/"
+            for Line in self.ReturnServerRecords(f"find -H {shlex.quote(ServerPath)} -mindepth 1 -printf '%y %s %T@ %p\\0'", BatchCallback, Records, Errors):
+                try:
+                    ItemType, ItemSize, ItemModified, ItemPath = Line.split(" ", 3)
+                    Records.append(DirectoryRecordObject.DirectoryRecord(ItemPath[len(PathPrefix):], FINDTYPES.get(ItemType, ""), float(ItemModified), int(ItemSize)))
+                except ValueError:
+                    Errors.append(Line)
+            return Records, Errors
+        return self.WalkOverSFTP(ServerPath, BatchCallback)
+
+    def ReturnTreeSize(self, ServerPath):
+        #Totals are summed on the server, a single line crosses the wire however large the tree
+        if self.ReturnServerFind():
+            Totals, Errors = None, []
+            for Line in self.ReturnServerRecords(f"find {shlex.quote(ServerPath)} -printf '%y %s\\n' | awk '$1 == \"f\" {{ f++; b += $2 }} $1 == \"d\" {{ d++ }} END {{ printf \"%d %d %.0f\\n\", f, d, b }}'", Errors = Errors, Separator = b"\n"):
+                Fields = Line.split()
+                if len(Fields) == 3 and all(Field.isdigit() for Field in Fields):
+                    Totals = tuple(int(Field) for Field in Fields)
+                else:
+                    Errors.append(Line)
+            if Totals is not None:
+                return Totals, Errors
+        Records, Errors = self.WalkTree(ServerPath)
+        return (sum(1 for Record in Records if Record.Type == "File"), sum(1 for Record in Records if Record.Type == "Folder") + 1, sum(Record.Size or 0 for Record in Records if Record.Type == "File")), Errors
+
+    def ReturnServerFind(self):
+        if self.ServerFind is None:
+            try:
+                Records = list(self.ReturnServerRecords("find . -maxdepth 0 -printf '%y\\0' -o -false -delete"))      #-delete is parsed but never runs
+                self.ServerFind = Records == ["d"]
+            except Exception:       #No shell access, an SFTP only account
+                self.ServerFind = False
+        return self.ServerFind
+
+    def ReturnServerRecords(self, Command, BatchCallback = None, Results = None, Errors = None, Separator = b"\0"):
+        #Records end in NUL, the one byte no path can hold, stderr is drained on its own thread so a flood of errors can not stall stdout
+        Errors = Errors if Errors is not None else []
+        Channel = self.SSHObject.get_transport().open_session()
+        def ReadErrors():
+            for Line in Channel.makefile_stderr("rb"):
+                Errors.append(Line.decode("utf-8", "replace").rstrip("\n"))
+        try:
+            Channel.exec_command(Command)
+            ErrorReader = threading.Thread(target = ReadErrors, daemon = True)
+            ErrorReader.start()
+            ReportedResults, ReportedErrors, Pending = 0, 0, b""
+            while Data := Channel.recv(BULKRECEIVESIZE):
+                *Records, Pending = (Pending + Data).split(Separator)
+                for Record in Records:
+                    yield Record.decode("utf-8", "replace")
+                    if BatchCallback is not None and len(Results) + len(Errors) - ReportedResults - ReportedErrors >= self.BatchSize:
+                        BatchCallback(Results[ReportedResults:], Errors[ReportedErrors:])
+                        ReportedResults, ReportedErrors = len(Results), len(Errors)
+            if Pending:     #Output cut short without its last separator
+                yield Pending.decode("utf-8", "replace")
+            ErrorReader.join()
+            if BatchCallback is not None and (len(Results) > ReportedResults or len(Errors) > ReportedErrors):
+                BatchCallback(Results[ReportedResults:], Errors[ReportedErrors:])
+        finally:
+            Channel.close()
+
+    def WalkOverSFTP(self, ServerPath, BatchCallback = None):
+        ChannelPool = ChannelPoolObject.SFTPChannelPool(self.SSHObject, self.ChannelCount, self.ChannelMode, self.ConnectionParameters, Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        Records, Errors, ReportedResults, ReportedErrors = [], [], 0, 0
+        def ListFolder(RelativePath):
+            Channel = ChannelPool.Lease()
+            try:
+                return RelativePath, Channel.listdir_attr(posixpath.join(ServerPath, RelativePath) if RelativePath else ServerPath)
+            finally:
+                ChannelPool.Return(Channel)
+        try:
+            #Every folder is listed as soon as its parent is, keeping one request per channel in flight
+            with concurrent.futures.ThreadPoolExecutor(max_workers = ChannelPool.ChannelCount) as Executor:
+                PendingFolders = {Executor.submit(ListFolder, "")}
+                while PendingFolders:
+                    DoneFolders, PendingFolders = concurrent.futures.wait(PendingFolders, return_when = concurrent.futures.FIRST_COMPLETED)
+                    for Future in DoneFolders:
+                        try:
+                            RelativePath, FolderItems = Future.result()
+                        except IOError as e:       #An unreadable folder is reported, the rest of the tree is still walked
+                            Errors.append(str(e))
+                            continue
+                        for Item in FolderItems:
+                            ItemPath = posixpath.join(RelativePath, Item.filename) if RelativePath else Item.filename
+                            ItemType = "Folder" if stat.S_ISDIR(Item.st_mode) else "File" if stat.S_ISREG(Item.st_mode) else ""
+                            Records.append(DirectoryRecordObject.DirectoryRecord(ItemPath, ItemType, Item.st_mtime, Item.st_size))
+                            if ItemType == "Folder":
+                                PendingFolders.add(Executor.submit(ListFolder, ItemPath))
+                    if BatchCallback is not None and (len(Records) - ReportedResults >= self.BatchSize or not PendingFolders):
+                        BatchCallback(Records[ReportedResults:], Errors[ReportedErrors:])
+                        ReportedResults, ReportedErrors = len(Records), len(Errors)
+        finally:
+            ChannelPool.Close()
+        return Records, Errors
+
+    def DeleteOverSFTP(self, ServerPath, BatchCallback = None):
+        if not stat.S_ISDIR(self.SFTPObject.lstat(ServerPath).st_mode):
+            self.SFTPObject.remove(ServerPath)
+            if BatchCallback is not None:
+                BatchCallback([ServerPath], [])
+            return 1, []
+        Records, Errors = self.WalkOverSFTP(ServerPath)
+        Files = [posixpath.join(ServerPath, Record.Name) for Record in Records if Record.Type != "Folder"]
+        Folders = [posixpath.join(ServerPath, Record.Name) for Record in Records if Record.Type == "Folder"]
+        Deleted = []
+        ChannelPool = ChannelPoolObject.SFTPChannelPool(self.SSHObject, self.ChannelCount, self.ChannelMode, self.ConnectionParameters, Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        def RemovePaths(RemoveFunction, Paths):
+            Channel = ChannelPool.Lease()
+            try:
+                Results, PathErrors = [], []
+                for Path in Paths:
+                    try:
+                        getattr(Channel, RemoveFunction)(Path)
+                        Results.append(Path)
+                    except IOError as e:
+                        PathErrors.append(f"{Path}: {e}")
+                return Results, PathErrors
+            finally:
+                ChannelPool.Return(Channel)
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers = ChannelPool.ChannelCount) as Executor:
+                #Files go first in parallel batches, then folders deepest level first so each is empty when removed
+                Stages = [("remove", Files)] + [("rmdir", [Folder for Folder in Folders if Folder.count("/") == Depth]) for Depth in sorted({Folder.count("/") for Folder in Folders}, reverse = True)] + [("rmdir", [ServerPath])]
+                for RemoveFunction, Paths in Stages:
+                    for Future in [Executor.submit(RemovePaths, RemoveFunction, Paths[Start:Start + self.BatchSize]) for Start in range(0, len(Paths), self.BatchSize)]:
+                        Results, PathErrors = Future.result()
+                        Deleted.extend(Results)
+                        Errors.extend(PathErrors)
+                        if BatchCallback is not None:
+                            BatchCallback(Results, PathErrors)
+        finally:
+            ChannelPool.Close()
+        return len(Deleted), Errors
+
+    def CopyOverSFTP(self, ServerPath, DestinationPath, BatchCallback = None):
+        #Every byte makes a round trip through the client, files are copied in parallel over their own channels
+        IsFolder = stat.S_ISDIR(self.SFTPObject.lstat(ServerPath).st_mode)
+        Records, Errors = self.WalkOverSFTP(ServerPath) if IsFolder else ([], [])
+        Folders = [DestinationPath] + [posixpath.join(DestinationPath, Record.Name) for Record in sorted((Record for Record in Records if Record.Type == "Folder"), key = lambda Record: Record.Name.count("/"))] if IsFolder else []
+        Files = [Record.Name for Record in Records if Record.Type != "Folder"] if IsFolder else [""]
+        Copied = []
+        ChannelPool = ChannelPoolObject.SFTPChannelPool(self.SSHObject, self.ChannelCount, self.ChannelMode, self.ConnectionParameters, Manager = self.ConnectionManager, ConnectionKey = self.ConnectionKey)
+        def CopyPaths(RelativePaths):
+            Channel = ChannelPool.Lease()
+            try:
+                Results, PathErrors = [], []
+                for RelativePath in RelativePaths:
+                    SourcePath, TargetPath = (posixpath.join(ServerPath, RelativePath), posixpath.join(DestinationPath, RelativePath)) if RelativePath else (ServerPath, DestinationPath)
+                    try:
+                        if stat.S_ISLNK(Channel.lstat(SourcePath).st_mode):
+                            Channel.symlink(Channel.readlink(SourcePath), TargetPath)
+                        else:
+                            with Channel.open(SourcePath, "rb") as SourceFile, Channel.open(TargetPath, "wb") as TargetFile:
+                                SourceFile.prefetch()
+                                TargetFile.set_pipelined(True)
+                                while Data := SourceFile.read(BULKRECEIVESIZE):
+                                    TargetFile.write(Data)
+                        Results.append(TargetPath)
+                    except IOError as e:
+                        PathErrors.append(f"{SourcePath}: {e}")
+                return Results, PathErrors
+            finally:
+                ChannelPool.Return(Channel)
+        try:
+            #Folders go first, parents before children, then the files in parallel batches
+            for Folder in Folders:
+                self.SFTPObject.mkdir(Folder)
+                Copied.append(Folder)
+            if BatchCallback is not None and Folders:
+                BatchCallback(Folders, [])
+            with concurrent.futures.ThreadPoolExecutor(max_workers = ChannelPool.ChannelCount) as Executor:
+                for Future in [Executor.submit(CopyPaths, Files[Start:Start + self.BatchSize]) for Start in range(0, len(Files), self.BatchSize)]:
+                    Results, PathErrors = Future.result()
+                    Copied.extend(Results)
+                    Errors.extend(PathErrors)
+                    if BatchCallback is not None:
+                        BatchCallback(Results, PathErrors)
+        finally:
+            ChannelPool.Close()
+        return len(Copied), Errors
@@ -0,0 +1,65 @@
+import paramiko, queue, threading
+
+class SFTPChannelPool():
+    def __init__(self, SSHObj, ChannelCount = 4, ChannelMode = "Sessions", Conn = None, WindowSize = None, MaxPacketSize = None, Manager = None, ConnectionKey = None):
+        self.SSHObject = SSHObj
+        self.ConnectionManager = Manager        #When given, channels are leased from the shared pool and handed back on close
+        self.ConnectionKey = ConnectionKey
+        self.ChannelMode = ChannelMode
+        self.ConnectionParameters = Conn
+        self.WindowSize = WindowSize            #SSH channel window, bounds the bytes in flight per channel
+        self.MaxPacketSize = MaxPacketSize
+        self.AvailableChannels = queue.Queue()
+        self.OpenedChannels = []
+        self.OpenedClients = []
+        self.PoolLock = threading.Lock()
+        for _ in range(max(1, int(ChannelCount))):
+            try:
+                self.AvailableChannels.put(self.OpenChannel())
+            except Exception as e:      #Server may cap the sessions per connection (MaxSessions), keep what was opened
+                if not self.OpenedChannels:
+                    raise e
+                break
+        self.ChannelCount = len(self.OpenedChannels)
+
+    def OpenChannel(self):
+        if self.ConnectionManager is not None:
+            Channel = self.ConnectionManager.LeaseSFTP(self.ConnectionKey, self.ChannelMode == "Transports")
+            with self.PoolLock:
+                self.OpenedChannels.append(Channel)
+            return Channel
+        if self.ChannelMode == "Transports" and self.ConnectionParameters is not None:
+            Client = paramiko.SSHClient()
+            Client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            Client.connect(self.ConnectionParameters["Host"], self.ConnectionParameters["Port"], self.ConnectionParameters["Username"], self.ConnectionParameters["Password"])
+            with self.PoolLock:
+                self.OpenedClients.append(Client)
+            SSHTransport = Client.get_transport()
+        else:
+            SSHTransport = self.SSHObject.get_transport()
+        if SSHTransport is None or not SSHTransport.is_active():
+            raise Exception("Cannot open an SFTP channel without an active SSH connection")
+        Channel = paramiko.SFTPClient.from_transport(SSHTransport, window_size = self.WindowSize, max_packet_size = self.MaxPacketSize)
+        with self.PoolLock:
+            self.OpenedChannels.append(Channel)
+        return Channel
+
+    def Lease(self, Timeout = None):
+        return self.AvailableChannels.get(timeout = Timeout)
+
+    def Return(self, Channel):
+        self.AvailableChannels.put(Channel)
+
+    def Close(self):
+        with self.PoolLock:
+            for Channel in self.OpenedChannels:
+                try:
+                    if self.ConnectionManager is not None:
+                        self.ConnectionManager.ReturnSFTP(self.ConnectionKey, Channel)
+                    else:
+                        Channel.close()
+                except Exception:
+                    pass
+            for Client in self.OpenedClients:
+                Client.close()
+            self.OpenedChannels, self.OpenedClients = [], []
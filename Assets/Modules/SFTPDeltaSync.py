@@ -0,0 +1,102 @@
+import os, hashlib, shlex
+
+class SFTPDeltaSync():
+    def __init__(self, BlockSize = 1048576):
+        self.BlockSize = BlockSize
+
+    def ReturnLocalTree(self, LocalPath, RelativePath = "", Files = None, Folders = None):
+        Files, Folders = (Files if Files is not None else {}), (Folders if Folders is not None else set())
+        with os.scandir(f"{LocalPath}/{RelativePath}" if RelativePath else LocalPath) as DirectoryEntries:
+            for Entry in DirectoryEntries:
+                EntryPath = f"{RelativePath}/{Entry.name}" if RelativePath else Entry.name
+                if Entry.is_dir(follow_symlinks = False):
+                    Folders.add(EntryPath)
+                    self.ReturnLocalTree(LocalPath, EntryPath, Files, Folders)
+                elif Entry.is_file(follow_symlinks = False):
+                    EntryStat = Entry.stat()
+                    Files[EntryPath] = (EntryStat.st_size, int(EntryStat.st_mtime))
+        return Files, Folders
+
+    def ReturnSyncPlan(self, LocalFiles, ServerFiles):
+        SyncPlan = []
+        for RelativePath in sorted(LocalFiles.keys() | ServerFiles.keys()):
+            LocalAttributes, ServerAttributes = LocalFiles.get(RelativePath), ServerFiles.get(RelativePath)
+            if ServerAttributes is None:
+                SyncPlan.append((RelativePath, "Upload"))
+            elif LocalAttributes is None:
+                SyncPlan.append((RelativePath, "Download"))
+            elif LocalAttributes == ServerAttributes:
+                SyncPlan.append((RelativePath, "Unchanged"))
+            elif LocalAttributes[1] == ServerAttributes[1]:
+                SyncPlan.append((RelativePath, "Conflict"))     #Same modification time but different sizes, neither side is newer
+            else:
+                #The newer side wins, files too small to be worth hashing are copied whole
+                Direction = "Upload" if LocalAttributes[1] > ServerAttributes[1] else "Download"
+                IsDelta = min(LocalAttributes[0], ServerAttributes[0]) >= self.BlockSize
+                SyncPlan.append((RelativePath, f"Delta {Direction}" if IsDelta else Direction))
+        return SyncPlan
+
+    def ReturnChangedBlocks(self, SSHObj, LocalPath, ServerPath, TypeOfTransfer):
+        ServerHashes = self.ReturnServerBlockHashes(SSHObj, ServerPath)
+        if ServerHashes is None:
+            return None
+        LocalHashes = self.ReturnLocalBlockHashes(LocalPath)
+        SourceHashes, DestinationHashes = (LocalHashes, ServerHashes) if TypeOfTransfer == "Upload" else (ServerHashes, LocalHashes)
+        SourceSize = os.path.getsize(LocalPath) if TypeOfTransfer == "Upload" else None
+        ChangedBlocks = []
+        for Index, BlockHash in enumerate(SourceHashes):
+            if Index >= len(DestinationHashes) or DestinationHashes[Index] != BlockHash:
+                ChangedBlocks.append((Index * self.BlockSize, self.BlockSize))
+        if SourceSize is not None and ChangedBlocks:       #Clip the final block to the end of the source
+            Offset, Length = ChangedBlocks[-1]
+            ChangedBlocks[-1] = (Offset, min(Length, SourceSize - Offset))
+        return ChangedBlocks
+
+    def ReturnLocalBlockHashes(self, LocalPath):
+        BlockHashes = []
+        with open(LocalPath, "rb") as LocalFile:
+            while Data := LocalFile.read(self.BlockSize):
+                BlockHashes.append(hashlib.md5(Data, usedforsecurity = False).hexdigest())
+        return BlockHashes
+
+    def ReturnServerBlockHashes(self, SSHObj, ServerPath):
+        #GNU split hashes each block without a temporary file, python3 covers servers without GNU coreutils
+        QuotedPath = shlex.quote(ServerPath)
+        PythonHasher = f"import hashlib,sys;f=open(sys.argv[1],'rb');[print(hashlib.md5(b).hexdigest()) for b in iter(lambda:f.read({self.BlockSize}),b'')]"
+        try:
+            stdin, stdout, stderr = SSHObj.exec_command(f"split -b {self.BlockSize} --filter=md5sum -- {QuotedPath} 2>/dev/null || python3 -c {shlex.quote(PythonHasher)} {QuotedPath}")
+            ServerOutput = stdout.read().decode().split()
+            if stdout.channel.recv_exit_status() != 0:
+                return None
+            return [Word.lower() for Word in ServerOutput if Word != "-"]
+        except Exception:
+            return None
+
+    def PutBlocks(self, SFTPObj, LocalPath, ServerPath, ChangedBlocks, Callback = None):
+        FileSize, BytesSent = os.path.getsize(LocalPath), 0
+        TotalBytes = sum(Length for _, Length in ChangedBlocks)
+        with open(LocalPath, "rb") as LocalFile, SFTPObj.open(ServerPath, "r+b") as RemoteFile:
+            RemoteFile.set_pipelined(True)
+            for Offset, Length in ChangedBlocks:
+                LocalFile.seek(Offset)
+                RemoteFile.seek(Offset)
+                RemoteFile.write(LocalFile.read(Length))
+                BytesSent += Length
+                if Callback is not None:
+                    Callback(BytesSent, TotalBytes)
+        SFTPObj.truncate(ServerPath, FileSize)
+        return BytesSent
+
+    def GetBlocks(self, SFTPObj, ServerPath, LocalPath, ChangedBlocks, Callback = None):
+        FileSize, BytesReceived = SFTPObj.stat(ServerPath).st_size, 0
+        ChangedBlocks = [(Offset, min(Length, FileSize - Offset)) for Offset, Length in ChangedBlocks]
+        TotalBytes = sum(Length for _, Length in ChangedBlocks)
+        with SFTPObj.open(ServerPath, "rb") as RemoteFile, open(LocalPath, "r+b") as LocalFile:
+            for (Offset, Length), Data in zip(ChangedBlocks, RemoteFile.readv(ChangedBlocks)):     #readv pipelines every block request
+                LocalFile.seek(Offset)
+                LocalFile.write(Data)
+                BytesReceived += Length
+                if Callback is not None:
+                    Callback(BytesReceived, TotalBytes)
+            LocalFile.truncate(FileSize)
+        return BytesReceived
@@ -0,0 +1,230 @@
+import os, time, types, hashlib, shlex, concurrent.futures
+
+TARGETCHUNKSECONDS = 0.1        #Chunk size adapts so every local read/write takes about this long
+CHECKSUMBLOCKSIZE = 1048576
+
+class SFTPLargeFileTransfer():
+    def __init__(self, MaxRequests = 64, BlockSize = 32768, MinChunkSize = 65536, MaxChunkSize = 8388608):
+        self.MaxRequests = MaxRequests          #Read requests kept in flight by the prefetcher
+        self.BlockSize = BlockSize              #Bytes per SFTP read/write request on the wire
+        self.MinChunkSize = MinChunkSize
+        self.MaxChunkSize = MaxChunkSize
+
+    def Get(self, SFTPObj, ServerPath, LocalPath, Callback = None, Checksum = None):
+        FileSize = SFTPObj.stat(ServerPath).st_size
+        self.PreallocateLocalFile(LocalPath, FileSize)
+        self.GetRange(SFTPObj, ServerPath, LocalPath, 0, FileSize, Callback, Checksum)
+        return FileSize
+
+    def Put(self, SFTPObj, LocalPath, ServerPath, Callback = None, Checksum = None):
+        FileSize = os.path.getsize(LocalPath)
+        SFTPObj.open(ServerPath, "wb").close()
+        self.PutRange(SFTPObj, LocalPath, ServerPath, 0, FileSize, Callback, Checksum)
+        self.ValidateServerSize(SFTPObj, ServerPath, FileSize)
+        return FileSize
+
+    def ResumeGet(self, SFTPObj, ServerPath, LocalPath, Offset, Callback = None, Checksum = None):
+        FileSize = SFTPObj.stat(ServerPath).st_size
+        with open(LocalPath, "r+b") as LocalFile:
+            LocalFile.truncate(Offset)
+        self.UpdateLocalChecksum(Checksum, LocalPath, Offset)
+        self.GetRange(SFTPObj, ServerPath, LocalPath, Offset, FileSize, Callback, Checksum)
+        return FileSize
+
+    def ResumePut(self, SFTPObj, LocalPath, ServerPath, Offset, Callback = None, Checksum = None):
+        FileSize = os.path.getsize(LocalPath)
+        SFTPObj.truncate(ServerPath, Offset)
+        self.UpdateLocalChecksum(Checksum, LocalPath, Offset)
+        self.PutRange(SFTPObj, LocalPath, ServerPath, Offset, FileSize, Callback, Checksum)
+        self.ValidateServerSize(SFTPObj, ServerPath, FileSize)
+        return FileSize
+
+    def EncryptedGet(self, SFTPObj, ServerPath, LocalPath, Cipher, Callback = None, Checksum = None):
+        #Decrypted chunk by chunk as it arrives, a chunk that fails its tag aborts before anything replaces the local file
+        FileSize = SFTPObj.stat(ServerPath).st_size
+        Offset = 0
+        def ReadBlock(Block):
+            nonlocal Offset
+            Offset += len(Block)
+            if Checksum is not None:        #The server holds ciphertext, so that is what gets compared
+                Checksum.update(Block)
+            if Callback is not None:
+                Callback(Offset, FileSize)
+        with SFTPObj.open(ServerPath, "rb") as RemoteFile:
+            RemoteFile.MAX_REQUEST_SIZE = self.BlockSize
+            Blocks, Buffer = self.IteratePrefetchedBlocks(RemoteFile, ServerPath, 0, FileSize), bytearray()
+            def Read(Size):     #The decryptor asks for whole chunks, the prefetched blocks are cut to fit
+                while len(Buffer) < Size and (Data := next(Blocks, b"")):
+                    Buffer.extend(Data)
+                Data = bytes(Buffer[:Size])
+                del Buffer[:Size]
+                return Data
+            try:
+                Cipher.WriteFileAtomically(LocalPath, Cipher.IterateDecryptedChunks(types.SimpleNamespace(read = Read), BlockFunction = ReadBlock))
+            except ValueError as e:
+                raise ValueError(f"Could not decrypt '{ServerPath}', the key is wrong or the file was altered ({e})") from e
+        return FileSize
+
+    def EncryptedPut(self, SFTPObj, LocalPath, ServerPath, Cipher, Callback = None, Checksum = None):
+        #Plaintext never reaches the server or a temporary file, only sealed chunks are written
+        FileSize = os.path.getsize(LocalPath)
+        with open(LocalPath, "rb") as LocalFile, SFTPObj.open(ServerPath, "wb") as RemoteFile:
+            RemoteFile.MAX_REQUEST_SIZE = self.BlockSize
+            RemoteFile.set_pipelined(True)
+            for Data in Cipher.IterateEncryptedChunks(LocalFile):
+                RemoteFile.write(Data)
+                if Checksum is not None:
+                    Checksum.update(Data)
+                if Callback is not None:
+                    Callback(min(LocalFile.tell(), FileSize), FileSize)
+        self.ValidateServerSize(SFTPObj, ServerPath, Cipher.ReturnEncryptedSize(FileSize))
+        return FileSize
+
+    def SegmentedGet(self, ChannelPool, ServerPath, LocalPath, SegmentCount, CallbackFactory = None):
+        Channel = ChannelPool.Lease()
+        try:
+            FileSize = Channel.stat(ServerPath).st_size
+        finally:
+            ChannelPool.Return(Channel)
+        self.PreallocateLocalFile(LocalPath, FileSize)
+        self.RunSegments(ChannelPool, lambda Channel, Start, End, Callback: self.GetRange(Channel, ServerPath, LocalPath, Start, End, Callback), FileSize, SegmentCount, CallbackFactory)
+        return FileSize
+
+    def SegmentedPut(self, ChannelPool, LocalPath, ServerPath, SegmentCount, CallbackFactory = None):
+        FileSize = os.path.getsize(LocalPath)
+        Channel = ChannelPool.Lease()
+        try:
+            Channel.open(ServerPath, "wb").close()
+            Channel.truncate(ServerPath, FileSize)
+        finally:
+            ChannelPool.Return(Channel)
+        self.RunSegments(ChannelPool, lambda Channel, Start, End, Callback: self.PutRange(Channel, LocalPath, ServerPath, Start, End, Callback), FileSize, SegmentCount, CallbackFactory)
+        return FileSize
+
+    def RunSegments(self, ChannelPool, RangeFunction, FileSize, SegmentCount, CallbackFactory):
+        def RunSegment(Start, End):
+            Channel = ChannelPool.Lease()
+            try:
+                RangeFunction(Channel, Start, End, CallbackFactory() if CallbackFactory is not None else None)
+            finally:
+                ChannelPool.Return(Channel)
+        Segments = self.ReturnSegments(FileSize, SegmentCount)
+        with concurrent.futures.ThreadPoolExecutor(max_workers = len(Segments) or 1) as Executor:
+            for Future in [Executor.submit(RunSegment, Start, End) for Start, End in Segments]:
+                Future.result()
+
+    def GetRange(self, SFTPObj, ServerPath, LocalPath, Start, End, Callback = None, Checksum = None):
+        with SFTPObj.open(ServerPath, "rb") as RemoteFile, open(LocalPath, "r+b") as LocalFile:
+            RemoteFile.MAX_REQUEST_SIZE = self.BlockSize
+            LocalFile.seek(Start)
+            Offset = Start
+            for Data in self.IteratePrefetchedBlocks(RemoteFile, ServerPath, Start, End):
+                LocalFile.write(Data)
+                if Checksum is not None:        #Hashed in order as it streams past, no second read of the file
+                    Checksum.update(Data)
+                LocalFile.flush()       #Reported offsets must be on disk, they are what a resumed transfer trusts
+                Offset += len(Data)
+                if Callback is not None:
+                    Callback(Offset - Start, End - Start)
+
+    def IteratePrefetchedBlocks(self, RemoteFile, ServerPath, Start, End):
+        Window = self.MaxRequests * self.BlockSize
+        Offset, ChunkSize, PrefetchEnd = Start, self.MinChunkSize, Start
+        RemoteFile.seek(Start)
+        while Offset < End:
+            while PrefetchEnd < End and PrefetchEnd - Offset < 2 * Window:
+                #paramiko marks a prefetch done as soon as its outstanding requests run dry, so a second window stays queued behind the one being read
+                RemoteFile.seek(PrefetchEnd)
+                PrefetchEnd = min(PrefetchEnd + Window, End)
+                RemoteFile.prefetch(PrefetchEnd)        #Prefetches from the current position up to PrefetchEnd
+                RemoteFile.seek(Offset)
+            StartTime = time.perf_counter()
+            Data = RemoteFile.read(min(ChunkSize, (End if PrefetchEnd == End else PrefetchEnd - Window) - Offset))
+            if not Data:
+                raise EOFError(f"Server file '{ServerPath}' ended at {Offset} of {End} bytes")
+            Offset += len(Data)
+            yield Data      #The caller's handling of each block counts towards the chunk timing, as the local write always has
+            ChunkSize = self.AdaptChunkSize(ChunkSize, time.perf_counter() - StartTime)
+
+    def PutRange(self, SFTPObj, LocalPath, ServerPath, Start, End, Callback = None, Checksum = None):
+        with open(LocalPath, "rb") as LocalFile, SFTPObj.open(ServerPath, "r+b") as RemoteFile:
+            RemoteFile.MAX_REQUEST_SIZE = self.BlockSize
+            RemoteFile.set_pipelined(True)      #Writes are acknowledged asynchronously, errors surface on close
+            RemoteFile.seek(Start)
+            LocalFile.seek(Start)
+            Offset, ChunkSize = Start, self.MinChunkSize
+            while Offset < End:
+                StartTime = time.perf_counter()
+                Data = LocalFile.read(min(ChunkSize, End - Offset))
+                if not Data:
+                    raise EOFError(f"Local file '{LocalPath}' ended at {Offset} of {End} bytes")
+                RemoteFile.write(Data)
+                if Checksum is not None:
+                    Checksum.update(Data)
+                Offset += len(Data)
+                if Callback is not None:
+                    Callback(Offset - Start, End - Start)
+                ChunkSize = self.AdaptChunkSize(ChunkSize, time.perf_counter() - StartTime)
+
+    def ReturnSegments(self, FileSize, SegmentCount):
+        SegmentSize = -(-FileSize // max(1, SegmentCount))
+        SegmentSize = -(-SegmentSize // self.BlockSize) * self.BlockSize      #Keep segment edges on request boundaries
+        return [(Start, min(Start + SegmentSize, FileSize)) for Start in range(0, FileSize, SegmentSize or 1)]
+
+    def AdaptChunkSize(self, ChunkSize, Elapsed):
+        if Elapsed < TARGETCHUNKSECONDS / 2:
+            return min(ChunkSize * 2, self.MaxChunkSize)
+        elif Elapsed > TARGETCHUNKSECONDS * 2:
+            return max(ChunkSize // 2, self.MinChunkSize)
+        return ChunkSize
+
+    def PreallocateLocalFile(self, LocalPath, FileSize):
+        with open(LocalPath, "wb") as LocalFile:
+            if FileSize > 0:
+                try:
+                    os.posix_fallocate(LocalFile.fileno(), 0, FileSize)
+                except (AttributeError, OSError):       #Windows or a filesystem without fallocate support
+                    LocalFile.truncate(FileSize)
+
+    def UpdateLocalChecksum(self, Checksum, LocalPath, End):
+        #A resumed file only streams its tail, the part already on disk is hashed up front
+        if Checksum is None:
+            return
+        with open(LocalPath, "rb") as LocalFile:
+            while (Remaining := End - LocalFile.tell()) > 0 and (Data := LocalFile.read(min(CHECKSUMBLOCKSIZE, Remaining))):
+                Checksum.update(Data)
+
+    def ValidateServerSize(self, SFTPObj, ServerPath, FileSize):
+        ServerSize = SFTPObj.stat(ServerPath).st_size
+        if ServerSize != FileSize:
+            raise IOError(f"Size mismatch after upload of '{ServerPath}': server has {ServerSize} of {FileSize} bytes")
+
+    def ValidateChecksum(self, SSHObj, SFTPObj, ServerPath, LocalPath):
+        ServerChecksum = self.ReturnServerChecksum(SSHObj, SFTPObj, ServerPath)
+        if ServerChecksum is None:
+            return None
+        LocalChecksum = self.ReturnLocalChecksum(LocalPath)
+        if ServerChecksum != LocalChecksum:
+            raise IOError(f"Checksum mismatch between '{LocalPath}' and '{ServerPath}'")
+        return LocalChecksum
+
+    def ReturnLocalChecksum(self, LocalPath):
+        Hash = hashlib.sha256()
+        with open(LocalPath, "rb") as LocalFile:
+            while Data := LocalFile.read(CHECKSUMBLOCKSIZE):
+                Hash.update(Data)
+        return Hash.hexdigest()
+
+    def ReturnServerChecksum(self, SSHObj, SFTPObj, ServerPath):
+        try:
+            stdin, stdout, stderr = SSHObj.exec_command(f"sha256sum -- {shlex.quote(ServerPath)}")
+            ServerOutput = stdout.read().decode().split()
+            if stdout.channel.recv_exit_status() == 0 and ServerOutput:
+                return ServerOutput[0].lower()
+        except Exception:
+            pass
+        try:    #Fall back on the 'check-file' SFTP extension
+            with SFTPObj.open(ServerPath, "rb") as RemoteFile:
+                return RemoteFile.check("sha256").hex()
+        except Exception:
+            return None
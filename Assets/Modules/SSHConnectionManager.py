@@ -0,0 +1,202 @@
+import paramiko, threading, time, contextlib
+
+class SSHConnectionManager():
+    def __init__(self, KeepaliveInterval = 30, HealthCheckInterval = 15, ReconnectAttempts = 3, StatusFunction = None, WindowSize = None, TransportCount = 1, IdleTimeout = 300, Metrics = None):
+        self.KeepaliveInterval = KeepaliveInterval      #Seconds between SSH keepalives, keeps NAT and firewall state from expiring
+        self.HealthCheckInterval = HealthCheckInterval
+        self.ReconnectAttempts = ReconnectAttempts
+        self.StatusFunction = StatusFunction        #Called from worker and health check threads
+        self.WindowSize = WindowSize
+        self.TransportCount = TransportCount        #Authenticated transports per host that leased channels are spread over
+        self.IdleTimeout = IdleTimeout      #Idle SFTP channels older than this are closed to free server sessions
+        self.Metrics = Metrics      #Optional, times handshakes and meters every SFTP session it opens
+        self.Hosts = {}     #Connection key -> host pool
+        self.ManagerLock = threading.Lock()
+        self.StopEvent = threading.Event()
+        self.HealthThread = None
+
+    def ReturnConnectionKey(self, Conn):
+        return f"{Conn["Username"]}@{Conn["Host"]}:{Conn["Port"]}"
+
+    def Connect(self, Conn):
+        #An already connected, healthy host is reused as is, so reconnecting costs nothing
+        ConnectionKey = self.ReturnConnectionKey(Conn)
+        with self.ManagerLock:
+            Host = self.Hosts.get(ConnectionKey)
+            if Host is None:
+                Host = self.Hosts[ConnectionKey] = {
+                    "Parameters" : dict(Conn),
+                    "Clients" : [],
+                    "Idle Channels" : [],       #(Channel, Client, Time returned)
+                    "Leased Channels" : {},     #Channel -> Client
+                    "Lock" : threading.RLock()
+                }
+            else:
+                Host["Parameters"] = dict(Conn)
+        try:
+            self.ReturnClient(ConnectionKey)
+        except Exception:
+            with self.ManagerLock:
+                if not self.Hosts[ConnectionKey]["Clients"]:
+                    del self.Hosts[ConnectionKey]
+            raise
+        if self.HealthThread is None:
+            self.HealthThread = threading.Thread(target = self.HealthLoop, daemon = True)
+            self.HealthThread.start()
+        return ConnectionKey
+
+    def Disconnect(self, ConnectionKey):
+        with self.ManagerLock:
+            Host = self.Hosts.pop(ConnectionKey, None)
+        if Host is None:
+            return
+        with Host["Lock"]:
+            for Channel in [IdleChannel for IdleChannel, _, _ in Host["Idle Channels"]] + list(Host["Leased Channels"]):
+                self.CloseQuietly(Channel)
+            for Client in Host["Clients"]:
+                self.CloseQuietly(Client)
+            Host["Idle Channels"], Host["Leased Channels"], Host["Clients"] = [], {}, []
+
+    def ReturnConnected(self, ConnectionKey):
+        with self.ManagerLock:
+            return ConnectionKey in self.Hosts
+
+    def ReturnParameters(self, ConnectionKey):
+        with self.ManagerLock:
+            return dict(self.Hosts[ConnectionKey]["Parameters"])
+
+    def ReturnHost(self, ConnectionKey):
+        with self.ManagerLock:
+            Host = self.Hosts.get(ConnectionKey)
+        if Host is None:
+            raise Exception(f"'{ConnectionKey}' is not connected")
+        return Host
+
+    def ReturnClient(self, ConnectionKey):
+        #The primary client is used for exec channels, a dropped transport is replaced before it is handed out
+        Host = self.ReturnHost(ConnectionKey)
+        with Host["Lock"]:
+            if not Host["Clients"]:
+                Host["Clients"].append(self.OpenClient(Host["Parameters"]))
+            elif not self.ReturnClientActive(Host["Clients"][0]):
+                self.Reconnect(ConnectionKey, Host, 0)
+            return Host["Clients"][0]
+
+    def LeaseSFTP(self, ConnectionKey, Spread = False):
+        Host = self.ReturnHost(ConnectionKey)
+        self.ReturnClient(ConnectionKey)
+        with Host["Lock"]:
+            #Idle channels are reused first, dead ones found on the way are dropped
+            while Host["Idle Channels"]:
+                Channel, Client, _ = Host["Idle Channels"].pop()
+                if self.ReturnChannelActive(Channel) and Client in Host["Clients"]:
+                    Host["Leased Channels"][Channel] = Client
+                    return Channel
+                self.CloseQuietly(Channel)
+            Client = self.ReturnLeastLoadedClient(Host, Spread)
+        Channel = paramiko.SFTPClient.from_transport(Client.get_transport(), window_size = self.WindowSize)
+        if self.Metrics is not None:
+            self.Metrics.MeterChannel(Channel)
+        with Host["Lock"]:
+            Host["Leased Channels"][Channel] = Client
+        return Channel
+
+    def ReturnSFTP(self, ConnectionKey, Channel):
+        with self.ManagerLock:
+            Host = self.Hosts.get(ConnectionKey)
+        if Host is None:        #Disconnected while leased
+            self.CloseQuietly(Channel)
+            return
+        with Host["Lock"]:
+            Client = Host["Leased Channels"].pop(Channel, None)
+            if Client is not None and Client in Host["Clients"] and self.ReturnChannelActive(Channel):
+                Host["Idle Channels"].append((Channel, Client, time.monotonic()))
+            else:
+                self.CloseQuietly(Channel)
+
+    def ReturnLeastLoadedClient(self, Host, Spread):
+        ClientLoads = {Client : 0 for Client in Host["Clients"] if self.ReturnClientActive(Client)}
+        for Client in Host["Leased Channels"].values():
+            if Client in ClientLoads:
+                ClientLoads[Client] += 1
+        if Spread and len(Host["Clients"]) < self.TransportCount and all(ClientLoads.values()):
+            Client = self.OpenClient(Host["Parameters"])
+            Host["Clients"].append(Client)
+            return Client
+        if not ClientLoads or not Spread:
+            return Host["Clients"][0]
+        return min(ClientLoads, key = ClientLoads.get)
+
+    def OpenClient(self, Conn):
+        Client = paramiko.SSHClient()
+        Client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        with self.Metrics.Span("Connect") if self.Metrics is not None else contextlib.nullcontext():
+            Client.connect(Conn["Host"], Conn["Port"], Conn["Username"], Conn["Password"])
+        Client.get_transport().set_keepalive(self.KeepaliveInterval)
+        return Client
+
+    def Reconnect(self, ConnectionKey, Host, ClientIndex):
+        #Backs off between attempts, a server that is restarting usually answers within a few seconds
+        for Attempt in range(self.ReconnectAttempts):
+            try:
+                Client = self.OpenClient(Host["Parameters"])
+            except Exception as e:
+                self.ReportStatus(f"Reconnect attempt {Attempt + 1} of {self.ReconnectAttempts} to '{ConnectionKey}' failed: {e}")
+                if Attempt + 1 == self.ReconnectAttempts:
+                    raise
+                time.sleep(2 ** Attempt)
+                continue
+            self.CloseQuietly(Host["Clients"][ClientIndex])
+            Host["Clients"][ClientIndex] = Client
+            self.ReportStatus(f"Connection to '{ConnectionKey}' dropped and was re-established")
+            return Client
+
+    def HealthLoop(self):
+        while not self.StopEvent.wait(self.HealthCheckInterval):
+            with self.ManagerLock:
+                Hosts = list(self.Hosts.items())
+            for ConnectionKey, Host in Hosts:
+                try:
+                    self.CheckHost(ConnectionKey, Host)
+                except Exception as e:
+                    self.ReportStatus(f"Health check for '{ConnectionKey}' failed: {e}")
+
+    def CheckHost(self, ConnectionKey, Host):
+        with Host["Lock"]:
+            #Extra transports that died are dropped, the primary is brought back before anyone asks for it
+            for Client in [Client for Client in Host["Clients"][1:] if not self.ReturnClientActive(Client)]:
+                Host["Clients"].remove(Client)
+                self.CloseQuietly(Client)
+            IdleChannels = []
+            for Channel, Client, ReturnedAt in Host["Idle Channels"]:
+                if Client in Host["Clients"] and self.ReturnChannelActive(Channel) and time.monotonic() - ReturnedAt < self.IdleTimeout:
+                    IdleChannels.append((Channel, Client, ReturnedAt))
+                else:
+                    self.CloseQuietly(Channel)
+            Host["Idle Channels"] = IdleChannels
+            if Host["Clients"] and not self.ReturnClientActive(Host["Clients"][0]):
+                self.Reconnect(ConnectionKey, Host, 0)
+
+    def ReturnClientActive(self, Client):
+        SSHTransport = Client.get_transport()
+        return SSHTransport is not None and SSHTransport.is_active()
+
+    def ReturnChannelActive(self, Channel):
+        return not Channel.sock.closed and Channel.sock.get_transport().is_active()
+
+    def ReportStatus(self, Message):
+        if self.StatusFunction is not None:
+            self.StatusFunction(Message)
+
+    def CloseQuietly(self, Connection):
+        try:
+            Connection.close()
+        except Exception:
+            pass
+
+    def Close(self):
+        self.StopEvent.set()
+        with self.ManagerLock:
+            ConnectionKeys = list(self.Hosts)
+        for ConnectionKey in ConnectionKeys:
+            self.Disconnect(ConnectionKey)
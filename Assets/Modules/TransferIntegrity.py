@@ -0,0 +1,101 @@
+import hashlib, re, threading
+
+SERVERHASHCOMMANDS = {
+    "sha256" : "sha256sum",
+    "sha1" : "sha1sum",
+    "md5" : "md5sum",
+    "blake2b" : "b2sum"
+}
+
+class TransferIntegrity():
+    def __init__(self, SSHObj, Algorithm = "sha256", BatchSize = 256):
+        self.SSHObject = SSHObj
+        self.Algorithm = Algorithm      #Hashed locally as the bytes stream past, compared with the same hash taken on the server
+        self.BatchSize = BatchSize      #Files verified per server hash command
+        self.PendingFiles = []      #(Server path, Local digest, Retry job)
+        self.IntegrityLock = threading.Lock()
+        self.ServerHash = None      #Whether the server can run the hash command, probed on first use
+        self.Report = {
+            "Verified" : 0,
+            "Retried" : 0,
+            "Unverified" : 0,
+            "Failed" : 0
+        }
+
+    def ReturnHasher(self):
+        return hashlib.new(self.Algorithm)
+
+    def Record(self, ServerPath, Digest, RetryJob):
+        #Returns a full batch to the caller once enough files are waiting, so verifying never needs a thread of its own
+        with self.IntegrityLock:
+            self.PendingFiles.append((ServerPath, Digest, RetryJob))
+            if len(self.PendingFiles) < self.BatchSize:
+                return None
+            Batch, self.PendingFiles = self.PendingFiles, []
+            return Batch
+
+    def ReturnPending(self):
+        with self.IntegrityLock:
+            Batch, self.PendingFiles = self.PendingFiles, []
+            return Batch
+
+    def AddToReport(self, Outcome, Count = 1):
+        with self.IntegrityLock:
+            self.Report[Outcome] += Count
+
+    def ReturnMismatches(self, Batch, SFTPObj):
+        if not Batch:
+            return []
+        ServerDigests = self.ReturnServerDigests([ServerPath for ServerPath, _, _ in Batch], SFTPObj)
+        Mismatches = []
+        for ServerPath, Digest, RetryJob in Batch:
+            ServerDigest = ServerDigests.get(ServerPath, "")
+            if ServerDigest is None:
+                self.AddToReport("Unverified")
+            elif ServerDigest == Digest:
+                self.AddToReport("Verified")
+            else:       #A missing server file counts as a mismatch too
+                Mismatches.append(RetryJob)
+        return Mismatches
+
+    def ReturnServerDigests(self, ServerPaths, SFTPObj):
+        #One exec hashes the whole batch, names go in over stdin so paths never touch the shell
+        if self.ReturnServerHash():
+            Channel = self.SSHObject.get_transport().open_session()
+            try:
+                Channel.exec_command(f"xargs -0 {SERVERHASHCOMMANDS[self.Algorithm]} --")
+                Channel.sendall("".join(f"{ServerPath}\0" for ServerPath in ServerPaths).encode("utf-8"))
+                Channel.shutdown_write()
+                ServerDigests = {}
+                for Line in Channel.makefile("rb").read().decode("utf-8", "replace").splitlines():
+                    Escaped = Line.startswith("\\")     #GNU tools escape names holding a backslash or newline
+                    Digest, _, ServerPath = Line[1 if Escaped else 0:].partition(" ")
+                    ServerPath = ServerPath[1:]     #Text or binary mode marker
+                    if Escaped:
+                        ServerPath = re.sub(r"\\(.)", lambda Match: "\n" if Match.group(1) == "n" else Match.group(1), ServerPath)
+                    ServerDigests[ServerPath] = Digest.lower()
+                return ServerDigests
+            finally:
+                Channel.close()
+        ServerDigests = {}
+        for ServerPath in ServerPaths:
+            try:    #Fall back on the 'check-file' SFTP extension, most servers do not offer it
+                with SFTPObj.open(ServerPath, "rb") as RemoteFile:
+                    ServerDigests[ServerPath] = RemoteFile.check(self.Algorithm).hex()
+            except Exception:
+                ServerDigests[ServerPath] = None
+        return ServerDigests
+
+    def ReturnServerHash(self):
+        if self.ServerHash is None:
+            try:
+                Channel = self.SSHObject.get_transport().open_session()
+                try:
+                    Channel.exec_command(f"{SERVERHASHCOMMANDS[self.Algorithm]} --version")
+                    Channel.makefile("rb").read()
+                    self.ServerHash = Channel.recv_exit_status() == 0
+                finally:
+                    Channel.close()
+            except Exception:       #No shell access, an SFTP only account
+                self.ServerHash = False
+        return self.ServerHash
@@ -0,0 +1,70 @@
+import os, json, time, threading
+
+JOURNALSAVEINTERVAL = 1.0      #Seconds between journal writes while offsets are moving
+
+class TransferJournal():
+    def __init__(self, JournalPath = None):
+        self.JournalPath = JournalPath
+        self.JournalLock = threading.Lock()
+        self.LastSaved = 0
+        self.JournalData = {
+            "Completed" : {},
+            "Partial" : {}
+        }
+        if self.JournalPath is not None and os.path.exists(self.JournalPath):
+            try:
+                with open(self.JournalPath, "r") as JournalFile:
+                    self.JournalData.update(json.load(JournalFile))
+            except (IOError, ValueError):      #A torn or unreadable journal only costs the resume, start over
+                pass
+
+    def ReturnCompleted(self, Key, FileSize, FileModified):
+        with self.JournalLock:
+            return self.JournalData["Completed"].get(Key) == [FileSize, FileModified]
+
+    def BeginFile(self, Key, FileSize, FileModified):
+        with self.JournalLock:
+            Partial = self.JournalData["Partial"].get(Key)
+            if Partial is None or Partial["Size"] != FileSize or Partial["Modified"] != FileModified:
+                Partial = self.JournalData["Partial"][Key] = {
+                    "Size" : FileSize,
+                    "Modified" : FileModified,
+                    "Offset" : 0
+                }
+            return Partial["Offset"]
+
+    def UpdateOffset(self, Key, Offset):
+        with self.JournalLock:
+            if Key in self.JournalData["Partial"]:
+                self.JournalData["Partial"][Key]["Offset"] = Offset
+        if time.monotonic() - self.LastSaved >= JOURNALSAVEINTERVAL:
+            self.Save()
+
+    def CompleteFile(self, Key):
+        with self.JournalLock:
+            Partial = self.JournalData["Partial"].pop(Key, None)
+            if Partial is not None:
+                self.JournalData["Completed"][Key] = [Partial["Size"], Partial["Modified"]]
+        if time.monotonic() - self.LastSaved >= JOURNALSAVEINTERVAL:
+            self.Save()
+
+    def ForgetFile(self, Key):
+        #A file that failed verification has to go out again in full
+        with self.JournalLock:
+            self.JournalData["Partial"].pop(Key, None)
+            self.JournalData["Completed"].pop(Key, None)
+
+    def Save(self):
+        if self.JournalPath is None:
+            return
+        with self.JournalLock:
+            self.LastSaved = time.monotonic()
+            os.makedirs(os.path.dirname(self.JournalPath), exist_ok = True)
+            TemporaryPath = f"{self.JournalPath}.tmp"
+            with open(TemporaryPath, "w") as JournalFile:
+                json.dump(self.JournalData, JournalFile)
+            os.replace(TemporaryPath, self.JournalPath)     #Atomic, a crash mid-save leaves the previous journal intact
+
+    def Remove(self):
+        if self.JournalPath is not None and os.path.exists(self.JournalPath):
+            os.remove(self.JournalPath)
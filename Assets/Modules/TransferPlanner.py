@@ -0,0 +1,58 @@
+from Assets.Modules import DirectoryRecord as DirectoryRecordObject
+import os, stat, posixpath
+
+class TransferPlanner():
+    def __init__(self, BulkOperations):
+        self.BulkOperations = BulkOperations        #Server trees are scanned in one pass, on the server or over parallel channels
+
+    def ReturnManifest(self, TransferItems, SourceListing, SourcePath, TypeOfTransfer):
+        #Names in the manifest are relative to the folder the transfer was started from
+        SourceRecords = {Record.Name : Record for Record in SourceListing}
+        Folders, Files = [], []
+        for Item in TransferItems:
+            Record = SourceRecords.get(Item.Name)
+            if Record is None:
+                raise FileNotFoundError(f"'{Item.Name}' no longer exists in '{SourcePath}'")
+            if Record.Type == "Folder":
+                Folders.append(Record.Name)
+                for TreeRecord in self.ReturnSourceTree(posixpath.join(SourcePath, Record.Name), TypeOfTransfer):
+                    if TreeRecord.Type == "Folder":
+                        Folders.append(f"{Record.Name}/{TreeRecord.Name}")
+                    elif TreeRecord.Type == "File":
+                        Files.append(TreeRecord._replace(Name = f"{Record.Name}/{TreeRecord.Name}"))
+            elif Record.Type == "File":
+                Files.append(Record)
+        Folders.sort(key = lambda Folder: Folder.count("/"))      #Parents are created before their children
+        Files.sort(key = lambda Record: Record.Size, reverse = True)      #Largest first, so no channel is left with a big file at the end
+        return {
+            "Folders" : Folders,
+            "Files" : Files,
+            "Total Files" : len(Files),
+            "Total Bytes" : sum(Record.Size for Record in Files)
+        }
+
+    def ReturnSourceTree(self, SourcePath, TypeOfTransfer):
+        if TypeOfTransfer == "Download":
+            TreeRecords, TreeErrors = self.BulkOperations.WalkTree(SourcePath)
+            if TreeErrors:
+                raise IOError(f"Could not read the whole server tree under '{SourcePath}'. First error: {TreeErrors[0]}")
+            return TreeRecords
+        return self.ReturnLocalTree(SourcePath)
+
+    def ReturnLocalTree(self, LocalPath):
+        #Links are never followed, a dangling one or a loop back to a parent folder can not stall the plan
+        TreeRecords, Folders = [], [""]
+        while Folders:
+            RelativePath = Folders.pop()
+            with os.scandir(f"{LocalPath}/{RelativePath}" if RelativePath else LocalPath) as DirectoryEntries:
+                for Entry in DirectoryEntries:
+                    EntryPath = f"{RelativePath}/{Entry.name}" if RelativePath else Entry.name
+                    try:
+                        EntryStat = Entry.stat(follow_symlinks = False)
+                    except OSError:     #Removed while planning
+                        continue
+                    IsFolder = stat.S_ISDIR(EntryStat.st_mode)
+                    TreeRecords.append(DirectoryRecordObject.DirectoryRecord(EntryPath, "Folder" if IsFolder else "File" if stat.S_ISREG(EntryStat.st_mode) else "", EntryStat.st_mtime, EntryStat.st_size))
+                    if IsFolder:
+                        Folders.append(EntryPath)
+        return TreeRecords
@@ -0,0 +1,75 @@
+import threading, time
+
+class TransferProgressAggregator():
+    def __init__(self, ReportFunction, SampleRate = 10, SmoothingFactor = 0.3, RateLimitFunction = None):
+        self.ReportFunction = ReportFunction      #Called from the sampling thread only, never per paramiko callback
+        self.RateLimitFunction = RateLimitFunction      #Optional, the bytes per second the job is currently shaped to
+        self.SampleInterval = 1 / SampleRate
+        self.SmoothingFactor = SmoothingFactor
+        self.ProgressLock = threading.Lock()
+        self.CurrentBytes, self.TotalBytes = 0, 0
+        self.FilesCompleted, self.FilesTotal = 0, 0
+        self.LastSampleBytes, self.LastSampleTime = 0, time.monotonic()
+        self.SmoothedRate = None
+        self.LastReport = None
+        self.StopEvent = threading.Event()
+        self.SampleThread = None
+
+    def Start(self):
+        self.LastSampleTime = time.monotonic()
+        self.SampleThread = threading.Thread(target = self.SampleLoop, daemon = True)
+        self.SampleThread.start()
+
+    def Stop(self):
+        self.StopEvent.set()
+        if self.SampleThread is not None:
+            self.SampleThread.join()
+        self.Sample()       #Final totals always reach the view
+
+    def SampleLoop(self):
+        while not self.StopEvent.wait(self.SampleInterval):
+            self.Sample()
+
+    def QueueFile(self):
+        with self.ProgressLock:
+            self.FilesTotal += 1
+
+    def QueueBytes(self, ByteCount):
+        with self.ProgressLock:
+            self.TotalBytes += ByteCount
+
+    def AddBytes(self, ByteCount):
+        with self.ProgressLock:
+            self.CurrentBytes += ByteCount
+
+    def SkipBytes(self, ByteCount):
+        with self.ProgressLock:     #Counted as done but kept out of the throughput, nothing crossed the wire
+            self.CurrentBytes += ByteCount
+            self.LastSampleBytes += ByteCount
+
+    def CompleteFile(self):
+        with self.ProgressLock:
+            self.FilesCompleted += 1
+
+    def Sample(self):
+        with self.ProgressLock:
+            CurrentBytes, TotalBytes = self.CurrentBytes, self.TotalBytes
+            FilesCompleted, FilesTotal = self.FilesCompleted, self.FilesTotal
+            SampleTime, Elapsed = time.monotonic(), time.monotonic() - self.LastSampleTime
+            BytesPerSecond = (CurrentBytes - self.LastSampleBytes) / Elapsed if Elapsed > 0 else 0
+            self.LastSampleBytes, self.LastSampleTime = CurrentBytes, SampleTime
+        self.SmoothedRate = BytesPerSecond if self.SmoothedRate is None else self.SmoothingFactor * BytesPerSecond + (1 - self.SmoothingFactor) * self.SmoothedRate
+        Report = (CurrentBytes, TotalBytes, FilesCompleted, FilesTotal)
+        if Report == self.LastReport and BytesPerSecond == 0:       #Nothing moved since the last sample, spare the event loop
+            return
+        self.LastReport = Report
+        self.ReportFunction({
+            "Current Bytes" : CurrentBytes,
+            "Total Bytes" : TotalBytes,
+            "Bytes Per Second" : BytesPerSecond,
+            "Smoothed Bytes Per Second" : self.SmoothedRate,
+            "Bytes Per Second Limit" : self.RateLimitFunction() if self.RateLimitFunction is not None else 0,
+            "Seconds Remaining" : (TotalBytes - CurrentBytes) / self.SmoothedRate if self.SmoothedRate > 0 else None,
+            "Files Remaining" : FilesTotal - FilesCompleted,
+            "Files Total" : FilesTotal
+        })
@@ -0,0 +1,386 @@
+"""
+Benchmark Suite
+
+Drives QThreadWorker and FileEncryption headlessly against a local stand-in SFTP server, with the same job requests
+and settings the client window uses, and writes a JSON report that can be compared against one from another commit.
+
+Usage
+    -python Benchmarks/RunBenchmarks.py [--workloads Huge,Tiny,Deep,Wide,Encrypt] [--scale Quick|Full] [--repeats 3]
+        [--latency 0] [--bandwidth 0] [--metrics] [--output Report.json] [--compare Baseline.json] [--threshold 0.1]
+    -Latency is the round trip in milliseconds and bandwidth the link rate in Mbit/s, both injected by a proxy in front of the server
+    -With --compare, every operation whose median got slower by more than the threshold is listed and the exit status is 1
+    -With --metrics, every job is timed per operation and the breakdown is added to the report, metering adds a little overhead
+
+Workloads
+    -Huge: one large file uploaded and downloaded
+    -Tiny: many 1 KiB files uploaded, downloaded and deleted
+    -Deep: narrow folder chains many levels deep, uploaded, downloaded and deleted
+    -Wide: a single server folder with a very large number of entries, listed and deleted
+    -Encrypt: FileEncryption directory encryption and decryption over tiny files and one large file
+
+Report
+    -Commit, machine and settings the numbers were taken with
+    -Per operation: files, bytes, every run in seconds, median/min/max, MB/s and files/s
+    -Listings also record the time until the first chunk of entries reached the view
+    -With --metrics, per operation timings and SFTP request and byte counters over the whole run
+"""
+
+import argparse, importlib.machinery, importlib.util, json, logging, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+
+REPOSITORYROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+sys.path.insert(0, REPOSITORYROOT)
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+from Assets.Modules import \
+    QThreadWorker as ThreadWorkerObject \
+    , SSHConnectionManager as ConnectionManagerObject \
+    , DirectoryListingCache as DirectoryListingCacheObject \
+    , AsyncSFTPEngine as AsyncEngineObject \
+    , OperationMetrics as OperationMetricsObject
+try:
+    from Assets.Modules import PyAESEncryption as EncryptionObject
+except ImportError:     #Optional, the encryption workload is skipped without pycryptodomex
+    EncryptionObject = None
+import StandInSFTPServer as StandInServerObject
+
+SCALES = {
+    "Quick" : {
+        "Huge File Bytes" : 268435456,
+        "Tiny Files" : 2000,
+        "Deep Tree Branches" : 4,
+        "Deep Tree Depth" : 32,
+        "Deep Tree Files" : 2,      #Per folder
+        "Wide Directory Entries" : 20000
+    },
+    "Full" : {
+        "Huge File Bytes" : 4294967296,
+        "Tiny Files" : 10000,
+        "Deep Tree Branches" : 8,
+        "Deep Tree Depth" : 128,
+        "Deep Tree Files" : 4,
+        "Wide Directory Entries" : 200000
+    }
+}
+WORKLOADS = ("Huge", "Tiny", "Deep", "Wide", "Encrypt")
+TINYFILEBYTES = 1024
+GENERATEBLOCKSIZE = 1048576
+
+class BenchmarkRunner():
+    def __init__(self, Arguments):
+        self.Arguments = Arguments
+        self.Scale = SCALES[Arguments.scale]
+        self.Window = self.ReturnWindowModule()
+        self.WorkPath = tempfile.mkdtemp(prefix = "QTSFTPBenchmark")
+        self.Results = []
+        self.Application = QCoreApplication.instance() or QCoreApplication([])
+        self.Server = StandInServerObject.StandInSFTPServer(Arguments.latency / 1000, Arguments.bandwidth * 125000 if Arguments.bandwidth else None)
+        self.Metrics = OperationMetricsObject.OperationMetrics() if Arguments.metrics else None
+        self.ConnectionManager = ConnectionManagerObject.SSHConnectionManager(self.Window.KEEPALIVEINTERVAL, self.Window.HEALTHCHECKINTERVAL, self.Window.RECONNECTATTEMPTS, logging.warning,
+            self.Window.CHANNELWINDOWSIZE, self.Window.TRANSFERCHANNELS if self.Window.CHANNELMODE == "Transports" else 1, Metrics = self.Metrics)
+        self.ConnectionParameters = self.Server.ReturnConnectionParameters()
+        self.ConnectionKey = self.ConnectionManager.Connect(self.ConnectionParameters)
+        self.ListingCache = DirectoryListingCacheObject.DirectoryListingCache(self.Window.LISTINGCACHETTL, self.Window.LISTINGCACHESIZE)
+        self.AsyncEngine = AsyncEngineObject.AsyncSFTPEngine(self.Window.ASYNCCONCURRENCY, self.Window.PIPELINEBLOCKSIZE, self.Window.ASYNCMAXREQUESTS, self.Window.REFRESHINTERVAL / 1000) \
+            if self.Window.TRANSFERBACKEND == "Asyncio" else None
+
+    def ReturnWindowModule(self):
+        #Settings come from the client itself, so a changed constant shows up in the numbers like any code change would
+        Loader = importlib.machinery.SourceFileLoader("SSHClientMainWindow", os.path.join(REPOSITORYROOT, "SSHClientMainWindow.pyw"))
+        WindowModule = importlib.util.module_from_spec(importlib.util.spec_from_loader(Loader.name, Loader))
+        Loader.exec_module(WindowModule)
+        return WindowModule
+
+    def Run(self):
+        try:
+            for Workload in self.Arguments.workloads:
+                logging.info(f"Running the '{Workload}' workload ...")
+                getattr(self, f"Run{Workload}Workload")()
+        finally:
+            self.ConnectionManager.Close()
+            if self.AsyncEngine is not None:
+                self.AsyncEngine.Close()
+            self.Server.Close()
+            shutil.rmtree(self.WorkPath, ignore_errors = True)
+        return self.ReturnReport()
+
+    def RunHugeWorkload(self):
+        LocalPath, ServerPath, DownloadPath = self.ReturnWorkloadPaths("Huge")
+        self.CreateFile(f"{LocalPath}/src/huge.bin", self.Scale["Huge File Bytes"])
+        self.MeasureTransfers("Huge File", LocalPath, ServerPath, DownloadPath, Delete = False)
+
+    def RunTinyWorkload(self):
+        LocalPath, ServerPath, DownloadPath = self.ReturnWorkloadPaths("Tiny")
+        self.CreateTinyFiles(f"{LocalPath}/src", self.Scale["Tiny Files"])
+        self.MeasureTransfers("Tiny Files", LocalPath, ServerPath, DownloadPath)
+
+    def RunDeepWorkload(self):
+        LocalPath, ServerPath, DownloadPath = self.ReturnWorkloadPaths("Deep")
+        for Branch in range(self.Scale["Deep Tree Branches"]):
+            FolderPath = f"{LocalPath}/src/b{Branch}"
+            for Level in range(self.Scale["Deep Tree Depth"]):
+                FolderPath = f"{FolderPath}/l{Level}"
+                self.CreateTinyFiles(FolderPath, self.Scale["Deep Tree Files"])
+        self.MeasureTransfers("Deep Tree", LocalPath, ServerPath, DownloadPath)
+
+    def RunWideWorkload(self):
+        _, ServerPath, _ = self.ReturnWorkloadPaths("Wide")
+        Entries = self.Scale["Wide Directory Entries"]
+        def Prepare():      #Written straight to the server's disk, only the listing and the delete are timed
+            if not os.path.isdir(f"{ServerPath}/wide"):
+                self.CreateTinyFiles(f"{ServerPath}/wide", Entries, 0)
+        self.Measure("Wide Directory", "List", lambda: self.RunWorkerJob("QueryDirectoriesContentsServerRequest", {
+                "Server Path" : f"{ServerPath}/wide",
+                "Force Refresh" : True
+            }), Prepare, 0, Entries)
+        self.Measure("Wide Directory", "Delete", lambda: self.RunWorkerJob("DeleteFileOrDirectoryServerRequest", self.ReturnDeleteParameters(ServerPath)), Prepare, 0, Entries)
+
+    def RunEncryptWorkload(self):
+        if EncryptionObject is None:
+            logging.warning("Skipping the 'Encrypt' workload, pycryptodomex is not installed")
+            return
+        LocalPath, _, _ = self.ReturnWorkloadPaths("Encrypt")
+        self.CreateTinyFiles(f"{LocalPath}/src", self.Scale["Tiny Files"])
+        self.CreateFile(f"{LocalPath}/src/huge.pdf", min(self.Scale["Huge File Bytes"], 1073741824))
+        TotalBytes, TotalFiles = self.ReturnTreeSize(f"{LocalPath}/src")
+        shutil.copytree(f"{LocalPath}/src", f"{LocalPath}/pristine")
+        Encryption = EncryptionObject.FileEncryption()
+        Encryption.ChangeKeyToBytes(os.urandom(16).hex())
+        def RestorePlaintext():     #Every repeat starts from the same plaintext, an already encrypted file would only be skipped
+            shutil.rmtree(f"{LocalPath}/src", ignore_errors = True)
+            shutil.copytree(f"{LocalPath}/pristine", f"{LocalPath}/src")
+        def PrepareCiphertext():
+            RestorePlaintext()
+            self.RunEncryptionJob(Encryption.EncryptDirectory, f"{LocalPath}/src")
+        self.Measure("Encrypt Directory", "Encrypt", lambda: self.RunEncryptionJob(Encryption.EncryptDirectory, f"{LocalPath}/src"), RestorePlaintext, TotalBytes, TotalFiles)
+        self.Measure("Encrypt Directory", "Decrypt", lambda: self.RunEncryptionJob(Encryption.DecryptDirectory, f"{LocalPath}/src"), PrepareCiphertext, TotalBytes, TotalFiles)
+
+    def MeasureTransfers(self, Workload, LocalPath, ServerPath, DownloadPath, Delete = True):
+        TotalBytes, TotalFiles = self.ReturnTreeSize(f"{LocalPath}/src")
+        self.Measure(Workload, "Upload", lambda: self.RunWorkerJob("TransferFilesServerRequest", self.ReturnTransferParameters("Upload", LocalPath, ServerPath)),
+            lambda: shutil.rmtree(f"{ServerPath}/src", ignore_errors = True), TotalBytes, TotalFiles)
+        self.Measure(Workload, "Download", lambda: self.RunWorkerJob("TransferFilesServerRequest", self.ReturnTransferParameters("Download", DownloadPath, ServerPath)),
+            lambda: shutil.rmtree(f"{DownloadPath}/src", ignore_errors = True), TotalBytes, TotalFiles)
+        if Delete:
+            def Prepare():
+                if not os.path.isdir(f"{ServerPath}/src"):
+                    shutil.copytree(f"{LocalPath}/src", f"{ServerPath}/src")
+            self.Measure(Workload, "Delete", lambda: self.RunWorkerJob("DeleteFileOrDirectoryServerRequest", self.ReturnDeleteParameters(ServerPath)), Prepare, 0, TotalFiles)
+
+    def Measure(self, Workload, Operation, Function, Prepare, TotalBytes, TotalFiles):
+        Runs, FirstChunks = [], []
+        for _ in range(self.Arguments.repeats):
+            if Prepare is not None:
+                Prepare()
+            RunResult = Function()
+            Runs.append(RunResult["Seconds"])
+            if RunResult.get("First Chunk Seconds") is not None:
+                FirstChunks.append(RunResult["First Chunk Seconds"])
+        MedianSeconds = statistics.median(Runs)
+        Result = {
+            "Workload" : Workload,
+            "Operation" : Operation,
+            "Files" : TotalFiles,
+            "Bytes" : TotalBytes,
+            "Runs" : [round(Seconds, 4) for Seconds in Runs],
+            "Median Seconds" : round(MedianSeconds, 4),
+            "Minimum Seconds" : round(min(Runs), 4),
+            "Maximum Seconds" : round(max(Runs), 4),
+            "Throughput MB/s" : round(TotalBytes / MedianSeconds / 1000000, 2) if TotalBytes else None,
+            "Files Per Second" : round(TotalFiles / MedianSeconds, 1) if TotalFiles else None
+        }
+        if FirstChunks:
+            Result["First Chunk Seconds"] = round(statistics.median(FirstChunks), 4)
+        self.Results.append(Result)
+        logging.info(f"{Workload} / {Operation}: median {Result["Median Seconds"]} sec(s)" + \
+            (f", {Result["Throughput MB/s"]} MB/s" if Result["Throughput MB/s"] else "") + (f", {Result["Files Per Second"]} file(s)/s" if Result["Files Per Second"] else ""))
+
+    def RunWorkerJob(self, Request, Misc):
+        #Built like the window's job workers and run on this thread, signals from transfer threads are drained before the clock stops
+        Worker = ThreadWorkerObject.QThreadWorker(
+                Conn = self.ConnectionManager.ReturnParameters(self.ConnectionKey)
+                , Misc = dict(Misc, **{"Job Request" : Request})
+                , Cache = self.ListingCache
+                , Manager = self.ConnectionManager
+                , Engine = self.AsyncEngine if Request == "TransferFilesServerRequest" and self.AsyncEngine is not None and self.AsyncEngine.ReturnAvailable() else None
+                , Metrics = self.Metrics
+            )
+        JobResults, FirstChunk = {}, []
+        StartTime = time.perf_counter()
+        Worker.completeDataSignal.connect(JobResults.update)
+        Worker.directoryChunkRemote.connect(lambda params: FirstChunk.append(time.perf_counter() - StartTime) if not FirstChunk else None)
+        Worker.ExecuteJob()
+        self.Application.processEvents()
+        Seconds = time.perf_counter() - StartTime
+        if "Error Thrown" in JobResults:
+            raise JobResults["Error Thrown"]
+        return {
+            "Seconds" : Seconds,
+            "First Chunk Seconds" : FirstChunk[0] if FirstChunk else None
+        }
+
+    def RunEncryptionJob(self, Function, Directory):
+        LogLevel = logging.getLogger().level
+        logging.getLogger().setLevel(logging.WARNING)       #Keeps the directory progress lines out of the benchmark output
+        try:
+            StartTime = time.perf_counter()
+            Summary = Function(Directory, self.Arguments.processes)
+            Seconds = time.perf_counter() - StartTime
+        finally:
+            logging.getLogger().setLevel(LogLevel)
+        if Summary is None or Summary["Failed"] or Summary["Skipped"]:     #A skipped file would leave the timing covering less than the workload
+            raise RuntimeError(f"Encryption benchmark failed in '{Directory}': {Summary if Summary is None else Summary["Failed"][:3] or f"{Summary["Skipped"]} file(s) skipped"}")
+        return {
+            "Seconds" : Seconds
+        }
+
+    def ReturnTransferParameters(self, Type, LocalPath, ServerPath):
+        Window = self.Window
+        return {
+            "Transfer Type" : Type,
+            "Transfer Data" : [{"Item Name" : "src", "Item Type" : "Folder"}],
+            "Local Path" : LocalPath,
+            "Server Path" : ServerPath,
+            "Transfer Mode" : self.Arguments.transfer_mode,
+            "Transfer Channels" : Window.TRANSFERCHANNELS,
+            "Channel Mode" : Window.CHANNELMODE,
+            "Channel Window Size" : Window.CHANNELWINDOWSIZE,
+            "Large File Threshold" : Window.LARGEFILETHRESHOLD,
+            "Pipeline Requests" : Window.PIPELINEREQUESTS,
+            "Pipeline Block Size" : Window.PIPELINEBLOCKSIZE,
+            "Segment Count" : Window.SEGMENTCOUNT,
+            "Journal Directory" : os.path.join(self.WorkPath, "Journals"),
+            "Sync Block Size" : Window.SYNCBLOCKSIZE,
+            "Archive File Threshold" : Window.ARCHIVEFILETHRESHOLD,
+            "Archive Minimum Files" : Window.ARCHIVEMINIMUMFILES,
+            "Archive Batch Size" : Window.ARCHIVEBATCHSIZE,
+            "Archive Compression" : Window.ARCHIVECOMPRESSION,
+            "Encrypt Transfers" : False,
+            "Encryption Key Path" : Window.TRANSFERKEYPATH,
+            "Verify Transfers" : Window.VERIFYTRANSFERS,
+            "Integrity Algorithm" : Window.INTEGRITYALGORITHM,
+            "Integrity Batch Size" : Window.INTEGRITYBATCHSIZE,
+            "Verify Retries" : Window.VERIFYRETRIES,
+            "Preserve Times" : False,
+            "Progress Sample Rate" : Window.PROGRESSSAMPLERATE
+        }
+
+    def ReturnDeleteParameters(self, ServerPath):
+        return {
+            "Server Path" : ServerPath,
+            "Directory Items" : [{"Item Name" : "wide" if ServerPath.endswith("Wide") else "src", "Item Type" : "Folder"}],
+            "Transfer Channels" : self.Window.TRANSFERCHANNELS,
+            "Channel Mode" : self.Window.CHANNELMODE
+        }
+
+    def ReturnWorkloadPaths(self, Workload):
+        WorkloadPaths = tuple(os.path.join(self.WorkPath, Side, Workload).replace("\\", "/") for Side in ("Local", "Server", "Download"))
+        for WorkloadPath in WorkloadPaths:
+            os.makedirs(WorkloadPath, exist_ok = True)
+        return WorkloadPaths
+
+    def CreateFile(self, Path, Size):
+        os.makedirs(os.path.dirname(Path), exist_ok = True)
+        with open(Path, "wb") as File:
+            for Offset in range(0, Size, GENERATEBLOCKSIZE):
+                File.write(os.urandom(min(GENERATEBLOCKSIZE, Size - Offset)))
+
+    def CreateTinyFiles(self, Path, Count, Size = TINYFILEBYTES):
+        #Text content, so the encryption workload does not mistake them for files that are already encrypted
+        os.makedirs(Path, exist_ok = True)
+        for Index in range(Count):
+            with open(f"{Path}/f{Index:06d}.txt", "w") as File:
+                File.write((f"line {Index}\n" * (Size // 8 + 1))[:Size])
+
+    def ReturnTreeSize(self, Path):
+        TotalBytes, TotalFiles = 0, 0
+        for FolderPath, _, FileNames in os.walk(Path):
+            for FileName in FileNames:
+                TotalBytes += os.path.getsize(os.path.join(FolderPath, FileName))
+                TotalFiles += 1
+        return TotalBytes, TotalFiles
+
+    def ReturnReport(self):
+        return {
+            "Commit" : self.ReturnGitOutput("rev-parse", "HEAD"),
+            "Uncommitted Changes" : bool(self.ReturnGitOutput("status", "--porcelain", "--untracked-files=no")),
+            "Created" : time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "Python" : platform.python_version(),
+            "Platform" : platform.platform(),
+            "Processors" : os.cpu_count(),
+            "Scale" : self.Arguments.scale,
+            "Repeats" : self.Arguments.repeats,
+            "Latency Milliseconds" : self.Arguments.latency,
+            "Bandwidth Mbit/s" : self.Arguments.bandwidth or None,
+            "Settings" : {
+                "Transfer Mode" : self.Arguments.transfer_mode,
+                "Transfer Backend" : self.Window.TRANSFERBACKEND,
+                "Transfer Channels" : self.Window.TRANSFERCHANNELS,
+                "Channel Mode" : self.Window.CHANNELMODE,
+                "Verify Transfers" : self.Window.VERIFYTRANSFERS,
+                "Encryption Processes" : self.Arguments.processes or os.cpu_count()
+            },
+            "Workload Sizes" : self.Scale,
+            "Results" : self.Results,
+            "Metrics" : self.Metrics.ReturnSnapshot() if self.Metrics is not None else None
+        }
+
+    def ReturnGitOutput(self, *Arguments):
+        try:
+            return subprocess.run(["git", "-C", REPOSITORYROOT, *Arguments], capture_output = True, text = True, check = True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+def CompareReports(Baseline, Report, Threshold):
+    #Only medians are compared, and only for operations both reports measured
+    BaselineResults = {(Result["Workload"], Result["Operation"]) : Result for Result in Baseline["Results"]}
+    Regressions = []
+    print(f"{"Operation":<34}{"Baseline s":>12}{"Current s":>12}{"Change":>10}")
+    for Result in Report["Results"]:
+        BaselineResult = BaselineResults.get((Result["Workload"], Result["Operation"]))
+        if BaselineResult is None:
+            continue
+        Change = Result["Median Seconds"] / BaselineResult["Median Seconds"] - 1 if BaselineResult["Median Seconds"] else 0
+        print(f"{Result["Workload"] + " / " + Result["Operation"]:<34}{BaselineResult["Median Seconds"]:>12.3f}{Result["Median Seconds"]:>12.3f}{Change:>+10.1%}")
+        if Change > Threshold:
+            Regressions.append(f"{Result["Workload"]} / {Result["Operation"]}")
+    if Baseline.get("Scale") != Report["Scale"] or Baseline.get("Latency Milliseconds") != Report["Latency Milliseconds"] or Baseline.get("Bandwidth Mbit/s") != Report["Bandwidth Mbit/s"]:
+        print("Warning: the reports were taken with different scales or network shaping")
+    return Regressions
+
+def ReturnArguments():
+    Parser = argparse.ArgumentParser(description = "Benchmarks QThreadWorker and FileEncryption against a local stand-in SFTP server")
+    Parser.add_argument("--workloads", default = ",".join(WORKLOADS), type = lambda Value: [Workload.strip().capitalize() for Workload in Value.split(",")])
+    Parser.add_argument("--scale", default = "Quick", type = str.capitalize, choices = list(SCALES))
+    Parser.add_argument("--repeats", default = 3, type = int)
+    Parser.add_argument("--latency", default = 0, type = float, help = "Injected round trip time in milliseconds")
+    Parser.add_argument("--bandwidth", default = 0, type = float, help = "Injected link rate in Mbit/s, 0 leaves it unlimited")
+    Parser.add_argument("--transfer-mode", default = "Auto", choices = ["Auto", "Standard", "Pipelined", "Segmented"])
+    Parser.add_argument("--processes", default = None, type = int, help = "Worker processes for the encryption workload, defaults to one per core")
+    Parser.add_argument("--metrics", action = "store_true", help = "Add a per operation timing breakdown to the report")
+    Parser.add_argument("--output", default = None, help = "Report path, defaults to Benchmarks/Results/<commit>-<time>.json")
+    Parser.add_argument("--compare", default = None, help = "Earlier report to compare the medians against")
+    Parser.add_argument("--threshold", default = 0.1, type = float, help = "Slowdown that counts as a regression in --compare")
+    Arguments = Parser.parse_args()
+    UnknownWorkloads = [Workload for Workload in Arguments.workloads if Workload not in WORKLOADS]
+    if UnknownWorkloads:
+        Parser.error(f"Unknown workload(s): {", ".join(UnknownWorkloads)}, choose from {", ".join(WORKLOADS)}")
+    return Arguments
+
+if __name__ == "__main__":
+    logging.basicConfig(level = logging.INFO, format = "%(asctime)s %(message)s")
+    logging.getLogger("paramiko").setLevel(logging.WARNING)
+    Arguments = ReturnArguments()
+    Report = BenchmarkRunner(Arguments).Run()
+    OutputPath = Arguments.output or os.path.join(REPOSITORYROOT, "Benchmarks", "Results", f"{(Report["Commit"] or "unknown")[:10]}-{time.strftime("%Y%m%d-%H%M%S")}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(OutputPath)), exist_ok = True)
+    with open(OutputPath, "w") as ReportFile:
+        json.dump(Report, ReportFile, indent = 2)
+    logging.info(f"Report written to '{OutputPath}'")
+    if Arguments.compare is not None:
+        with open(Arguments.compare, "r") as BaselineFile:
+            Regressions = CompareReports(json.load(BaselineFile), Report, Arguments.threshold)
+        if Regressions:
+            print(f"Slower than the baseline by more than {Arguments.threshold:.0%}: {", ".join(Regressions)}")
+            sys.exit(1)
@@ -0,0 +1,220 @@
+import os, socket, threading, subprocess, queue, time, paramiko
+from paramiko import ServerInterface, SFTPServerInterface, SFTPServer, SFTPAttributes, SFTPHandle, SFTP_OK, AUTH_SUCCESSFUL, OPEN_SUCCEEDED, OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+PUMPBLOCKSIZE = 65536
+
+class StandInServer(ServerInterface):
+    #Any username and password is accepted, exec requests run through bash so the server side find, tar and sha256sum paths are exercised
+    def check_auth_password(self, Username, Password):
+        return AUTH_SUCCESSFUL
+
+    def get_allowed_auths(self, Username):
+        return "password"
+
+    def check_channel_request(self, Kind, ChannelId):
+        return OPEN_SUCCEEDED if Kind == "session" else OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, Channel, Command):
+        threading.Thread(target = self.RunCommand, args = (Channel, Command.decode("utf-8")), daemon = True).start()
+        return True
+
+    def RunCommand(self, Channel, Command):
+        Process = subprocess.Popen(["bash", "-c", Command], stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE)
+        def FeedInput():
+            while Data := Channel.recv(PUMPBLOCKSIZE):
+                Process.stdin.write(Data)
+            Process.stdin.close()
+        def SendErrors():
+            for Data in iter(lambda: Process.stderr.read(PUMPBLOCKSIZE), b""):
+                Channel.sendall_stderr(Data)
+        threading.Thread(target = FeedInput, daemon = True).start()
+        ErrorThread = threading.Thread(target = SendErrors, daemon = True)
+        ErrorThread.start()
+        for Data in iter(lambda: Process.stdout.read(PUMPBLOCKSIZE), b""):
+            Channel.sendall(Data)
+        ErrorThread.join()
+        Channel.send_exit_status(Process.wait())
+        Channel.close()
+
+class StandInSFTPHandle(SFTPHandle):
+    def stat(self):
+        return SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+    def chattr(self, Attributes):
+        return StandInSFTPInterface.ApplyAttributes(self.filename, Attributes)
+
+class StandInSFTPInterface(SFTPServerInterface):
+    def list_folder(self, Path):
+        try:
+            Entries = []
+            with os.scandir(Path) as DirectoryEntries:
+                for Entry in DirectoryEntries:
+                    Attributes = SFTPAttributes.from_stat(Entry.stat(follow_symlinks = False))
+                    Attributes.filename = Entry.name
+                    Entries.append(Attributes)
+            return Entries
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def stat(self, Path):
+        try:
+            return SFTPAttributes.from_stat(os.stat(Path))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def lstat(self, Path):
+        try:
+            return SFTPAttributes.from_stat(os.lstat(Path))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def open(self, Path, Flags, Attributes):
+        try:
+            FileDescriptor = os.open(Path, Flags | getattr(os, "O_BINARY", 0), 0o644)
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        if Flags & os.O_WRONLY:
+            Mode = "ab" if Flags & os.O_APPEND else "wb"
+        elif Flags & os.O_RDWR:
+            Mode = "a+b" if Flags & os.O_APPEND else "r+b"
+        else:
+            Mode = "rb"
+        Handle = StandInSFTPHandle(Flags)
+        Handle.filename = Path
+        Handle.readfile = Handle.writefile = os.fdopen(FileDescriptor, Mode)
+        return Handle
+
+    def remove(self, Path):
+        return self.RunFileOperation(os.remove, Path)
+
+    def rename(self, OldPath, NewPath):
+        return self.RunFileOperation(os.rename, OldPath, NewPath)
+
+    def posix_rename(self, OldPath, NewPath):
+        return self.RunFileOperation(os.replace, OldPath, NewPath)
+
+    def mkdir(self, Path, Attributes):
+        return self.RunFileOperation(os.mkdir, Path)
+
+    def rmdir(self, Path):
+        return self.RunFileOperation(os.rmdir, Path)
+
+    def chattr(self, Path, Attributes):
+        return self.ApplyAttributes(Path, Attributes)
+
+    def RunFileOperation(self, Operation, *Arguments):
+        try:
+            Operation(*Arguments)
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    @staticmethod
+    def ApplyAttributes(Path, Attributes):
+        try:
+            if Attributes.st_mtime is not None:
+                os.utime(Path, (Attributes.st_atime, Attributes.st_mtime))
+            if Attributes.st_size is not None:
+                os.truncate(Path, Attributes.st_size)
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+class ShapingProxy():
+    #Sits between client and server, every block is held back by half the round trip and paced to the link rate in each direction
+    def __init__(self, TargetPort, Latency = 0, Bandwidth = None):
+        self.TargetPort = TargetPort
+        self.Latency = Latency      #Round trip time in seconds
+        self.Bandwidth = Bandwidth      #Bytes per second in each direction, None leaves it unlimited
+        self.ListenSocket = socket.create_server(("127.0.0.1", 0))
+        self.Port = self.ListenSocket.getsockname()[1]
+        threading.Thread(target = self.AcceptLoop, daemon = True).start()
+
+    def AcceptLoop(self):
+        while True:
+            try:
+                ClientSocket, _ = self.ListenSocket.accept()
+            except OSError:     #Closed
+                return
+            ServerSocket = socket.create_connection(("127.0.0.1", self.TargetPort))
+            for Socket in (ClientSocket, ServerSocket):
+                Socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.StartDirection(ClientSocket, ServerSocket)
+            self.StartDirection(ServerSocket, ClientSocket)
+
+    def StartDirection(self, SourceSocket, TargetSocket):
+        Blocks = queue.Queue()
+        def Receive():
+            while True:
+                try:
+                    Data = SourceSocket.recv(PUMPBLOCKSIZE)
+                except OSError:
+                    Data = b""
+                Blocks.put((time.monotonic() + self.Latency / 2, Data))
+                if not Data:
+                    return
+        def Send():
+            NextFree = 0
+            while True:
+                DeliverAt, Data = Blocks.get()
+                if not Data:
+                    self.CloseQuietly(TargetSocket)
+                    return
+                SendAt = max(DeliverAt, NextFree)
+                Delay = SendAt - time.monotonic()       #Read once, a second read could go negative between the check and the sleep
+                if Delay > 0:
+                    time.sleep(Delay)
+                NextFree = SendAt + (len(Data) / self.Bandwidth if self.Bandwidth else 0)
+                try:
+                    TargetSocket.sendall(Data)
+                except OSError:
+                    self.CloseQuietly(SourceSocket)
+                    return
+        threading.Thread(target = Receive, daemon = True).start()
+        threading.Thread(target = Send, daemon = True).start()
+
+    def CloseQuietly(self, Socket):
+        try:
+            Socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def Close(self):
+        self.ListenSocket.close()
+
+class StandInSFTPServer():
+    def __init__(self, Latency = 0, Bandwidth = None):
+        self.HostKey = paramiko.RSAKey.generate(2048)
+        self.ListenSocket = socket.create_server(("127.0.0.1", 0), backlog = 64)
+        self.ServerPort = self.ListenSocket.getsockname()[1]
+        self.Transports = []
+        threading.Thread(target = self.AcceptLoop, daemon = True).start()
+        self.Proxy = ShapingProxy(self.ServerPort, Latency, Bandwidth) if Latency or Bandwidth else None
+        self.Port = self.Proxy.Port if self.Proxy is not None else self.ServerPort      #What clients connect to
+
+    def AcceptLoop(self):
+        while True:
+            try:
+                ClientSocket, _ = self.ListenSocket.accept()
+            except OSError:
+                return
+            SSHTransport = paramiko.Transport(ClientSocket)
+            SSHTransport.add_server_key(self.HostKey)
+            SSHTransport.set_subsystem_handler("sftp", SFTPServer, StandInSFTPInterface)
+            SSHTransport.start_server(server = StandInServer())
+            self.Transports.append(SSHTransport)
+
+    def ReturnConnectionParameters(self):
+        return {
+            "Host" : "127.0.0.1",
+            "Port" : self.Port,
+            "Username" : "benchmark",
+            "Password" : "benchmark"
+        }
+
+    def Close(self):
+        if self.Proxy is not None:
+            self.Proxy.Close()
+        self.ListenSocket.close()
+        for SSHTransport in self.Transports:
+            SSHTransport.close()
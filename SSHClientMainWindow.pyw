@@ -7,19 +7,11 @@ Github: https://github.com/MatthewHahn73/Py-SFTP-Client
 Current Bugs
     -Progress bar in bottom left of the status bar is not aligned left properly at certain window resolutions
     -If a directory is deleted while in that directory and the refresh button is hit, will throw inaccurate error message
-    -Processes flow causes the directory to be updated in the directory on every file upload/download 
-        -When downloading/uploading files in sub directories causes the application to briefly navigate to those directories 
-            -Not really a bug, but kind of a confusing visual mess
-            -Fix?
 Future Features
     -Add functionality for the 'Help' and 'Update' buttons in the menu bar
     -Add more informative information on files in both directories (type of file, size)
         -Images for folder/files?
     -Add in a confirmation prompt for deletions
-    -Add in the ability to safely cancel an operation (Upload/Download)
-    -Add in a sync directories button
-        -Would ensure missing files in both active directories would be transferred to the other directory
-    -Add in notification for failed/corrupt transfers 
     -Add in the option to connect via SSH certificates
     -Modify stylesheet to be more modern 
 
@@ -36,15 +28,85 @@ Required Software
             -Purpose: SSH Connections
             -Installation: https://pypi.org/project/paramiko/
             -Documentation - https://www.paramiko.org/
+        -pycryptodomex (Optional)
+            -Purpose: AES encryption of files in flight, only needed for the 'Encrypt Transfers' option
+            -Installation: https://pypi.org/project/pycryptodomex/
+        -beautifulsoup4 (Optional)
+            -Purpose: XML processing in PyAESEncryption, imported alongside pycryptodomex
+            -Installation: https://pypi.org/project/beautifulsoup4/
+        -asyncssh (Optional)
+            -Purpose: Asyncio transfer backend, only needed when TRANSFERBACKEND is 'Asyncio'
+            -Installation: https://pypi.org/project/asyncssh/
+            -Documentation - https://asyncssh.readthedocs.io/
         -QLogHandler
-            -Purpose: Custom QObject that handles log messages
+            -Purpose: Custom QObject that buffers log messages and hands them to the log view in periodic batches
             -Installation: Included (/Assets/Modules/)
-        -QStandardItemModelCustom
-            -Purpose: Custom QStandardItemModel that handles moving items from one QTreeView to another
+        -QDirectoryTableModel
+            -Purpose: Lazily populated table model for the directory trees, handles moving items from one QTreeView to another
+            -Installation: Included (/Assets/Modules/)
+        -DirectoryRecord
+            -Purpose: Compact record for a single directory listing entry
+            -Installation: Included (/Assets/Modules/)
+        -SFTPBulkOperations
+            -Purpose: Recursive delete, copy, size and tree walks run on the server, with a parallel SFTP fallback
+            -Installation: Included (/Assets/Modules/)
+        -TransferPlanner
+            -Purpose: Expands a transfer selection into a full manifest of folders and files before any data is moved
+            -Installation: Included (/Assets/Modules/)
+        -QJobScheduler
+            -Purpose: Priority queue of listing, transfer and delete jobs with per connection limits, persisted across restarts
+            -Installation: Included (/Assets/Modules/)
+        -SSHConnectionManager
+            -Purpose: Pools authenticated transports and SFTP sessions per server, with keepalives, health checks and reconnects
+            -Installation: Included (/Assets/Modules/)
+        -AsyncSFTPEngine
+            -Purpose: Optional asyncio transfer engine that keeps many files in flight from one event loop thread
+            -Installation: Included (/Assets/Modules/)
+        -TransferIntegrity
+            -Purpose: Checks streamed file hashes against the server in batches and keeps a per job integrity report
+            -Installation: Included (/Assets/Modules/)
+        -SFTPArchiveStream
+            -Purpose: Streams many small files as one tar archive over an SSH exec channel, unpacked on the fly
             -Installation: Included (/Assets/Modules/)
         -QThreadWorker
             -Purpose: Custom QObject that handles paramiko calls on a seperate thread
             -Installation: Included (/Assets/Modules/)
+        -SFTPChannelPool
+            -Purpose: Pool of SFTP channels used to transfer several files at once
+            -Installation: Included (/Assets/Modules/)
+        -SFTPLargeFileTransfer
+            -Purpose: Pipelined, prefetching and segmented get/put for large files
+            -Installation: Included (/Assets/Modules/)
+        -TransferJournal
+            -Purpose: On-disk checkpoints that let an interrupted transfer resume
+            -Installation: Included (/Assets/Modules/)
+        -LocalBulkOperations
+            -Purpose: Parallel walk and delete of local folder trees, run off the GUI thread
+            -Installation: Included (/Assets/Modules/)
+        -SFTPDeltaSync
+            -Purpose: Directory sync that only sends the blocks that changed
+            -Installation: Included (/Assets/Modules/)
+        -DirectoryListingCache
+            -Purpose: Cache of server directory listings, kept current by the client's own changes
+            -Installation: Included (/Assets/Modules/)
+        -QRefreshScheduler
+            -Purpose: Coalesces per-file view updates during transfers into rate limited batches
+            -Installation: Included (/Assets/Modules/)
+        -TransferProgressAggregator
+            -Purpose: Samples job wide transfer progress at a fixed rate, with throughput and ETA
+            -Installation: Included (/Assets/Modules/)
+        -PyAESEncryption
+            -Purpose: Streaming AES-GCM file encryption, used to encrypt and decrypt files as they transfer
+            -Installation: Included (/Assets/Modules/)
+        -BandwidthLimiter
+            -Purpose: Token bucket shaping of transfers with global and per job limits, shared fairly between jobs
+            -Installation: Included (/Assets/Modules/)
+        -OperationMetrics
+            -Purpose: Per-operation timings, SFTP request and byte counters, with JSON, Prometheus and profile export
+            -Installation: Included (/Assets/Modules/)
+        -QStatisticsPanel
+            -Purpose: Dialog showing the collected operation timings and counters
+            -Installation: Included (/Assets/Modules/)
         
 Loaded GUI Resources (And structure)
     -MainWidget (QWidget)
@@ -86,20 +148,31 @@ Loaded GUI Resources (And structure)
             -actionAbout (QAction)
             -actionUpdates (QAction)
         -menuOptions (QMenu)
+            -actionEncrypt_Transfers (QAction)
             -actionShow_Password (QAction)
+            -actionShow_Statistics (QAction)
             -menuLogging_Level (QAction)
                 -actionDebugging (QAction)
                 -actionError (QAction)
                 -actionInfo (QAction)
                 -actionWarning (QAction)
+            -menuTransfer_Mode (QAction)
+                -actionAuto (QAction)
+                -actionStandard (QAction)
+                -actionPipelined (QAction)
+                -actionSegmented (QAction)
+            -menuBandwidth_Limit (QAction)
+                -actionGlobal_Limit (QAction)
+                -actionPer_Job_Limit (QAction)
         -menuServer (QMenu)
             -actionCancel_Current_Operation (QAction)
             -actionDisconnect (QAction)
+            -actionSync_Directories (QAction)
             -seperator
     -SMTPStatusBar (QStatusBar)
 """
 
-import os, logging, sys, paramiko, platform, ctypes, json, shutil
+import os, logging, logging.handlers, queue, sys, paramiko, platform, ctypes, json, shutil, datetime
 from PyQt6.QtWidgets import *
 from PyQt6.QtGui import *
 from PyQt6.QtCore import *
@@ -116,11 +189,74 @@ from paramiko.ssh_exception import \
 from Assets.Modules import \
     QLogHandler as LogHanderObject \
     , QThreadWorker as ThreadWorkerObject \
-    , QStandardItemModelCustom as StandardItemModelCustomObject \
+    , QDirectoryTableModel as DirectoryTableModelObject \
+    , DirectoryListingCache as DirectoryListingCacheObject \
+    , QRefreshScheduler as RefreshSchedulerObject \
+    , QJobScheduler as JobSchedulerObject \
+    , SSHConnectionManager as ConnectionManagerObject \
+    , AsyncSFTPEngine as AsyncEngineObject \
+    , OperationMetrics as OperationMetricsObject \
+    , QStatisticsPanel as StatisticsPanelObject \
+    , BandwidthLimiter as BandwidthLimiterObject
 
 #Constants
 VERSIONNUMBER = "QTSFTP Client v1.0"
 ERRORTEMPLATE = "A(n) {0} exception occurred. Arguments:\n{1!r}"
+TRANSFERCHANNELS = 4            #Concurrent SFTP channels used by a single transfer
+CHANNELMODE = "Sessions"        #'Sessions' shares the connected transport, 'Transports' opens a connection per channel
+CHANNELWINDOWSIZE = 16777216    #SSH window per transfer channel, in bytes
+KEEPALIVEINTERVAL = 30          #Seconds between SSH keepalives on every pooled transport
+HEALTHCHECKINTERVAL = 15        #Seconds between checks that reconnect dropped transports and close stale idle sessions
+RECONNECTATTEMPTS = 3           #Attempts made to re-establish a dropped connection before a job fails
+TRANSFERBACKEND = "Threads"     #'Asyncio' drives every file of a transfer from one event loop, needs asyncssh
+ASYNCCONCURRENCY = 64           #Files in flight at once on the asyncio engine
+ASYNCMAXREQUESTS = 16           #Outstanding SFTP requests per file on the asyncio engine
+LARGEFILETHRESHOLD = 67108864   #Files at or above this size use the pipelined transfer in 'Auto' mode
+PIPELINEREQUESTS = 64           #Read requests kept in flight by a pipelined download
+PIPELINEBLOCKSIZE = 32768       #Bytes per SFTP request in a pipelined transfer
+SEGMENTCOUNT = 4                #Parallel byte ranges per file in a segmented transfer
+SYNCBLOCKSIZE = 1048576         #Block size compared by checksum when syncing changed files
+ARCHIVEFILETHRESHOLD = 1048576  #Files below this size are streamed together as a tar archive in 'Auto' mode
+ARCHIVEMINIMUMFILES = 32        #Small files needed in one transfer before the archive stream is used
+ARCHIVEBATCHSIZE = 67108864     #Bytes packed into a single archive stream
+ARCHIVECOMPRESSION = 0          #gzip level for archive streams, 0 sends them uncompressed
+TRANSFERKEYPATH = os.path.join(os.path.expanduser("~"), ".qtsftp", "TransferKey")     #16, 24 or 32 character AES key used by 'Encrypt Transfers'
+VERIFYTRANSFERS = True          #Hash every file as it streams and compare it against the same hash taken on the server
+INTEGRITYALGORITHM = "sha256"   #'sha256', 'sha1', 'md5' or 'blake2b', the server needs the matching *sum tool
+INTEGRITYBATCHSIZE = 256        #Transferred files checked per server hash command
+VERIFYRETRIES = 2               #Times a file that fails verification is transferred again before the job fails
+JOURNALDIRECTORY = os.path.join(os.path.expanduser("~"), ".qtsftp", "Journals")    #Checkpoints of interrupted transfers
+LISTINGCACHETTL = 30            #Seconds a cached server directory listing stays valid
+LISTINGCACHESIZE = 256          #Server directory listings kept in memory
+REFRESHINTERVAL = 250           #Milliseconds between batched view updates during a transfer
+PROGRESSSAMPLERATE = 10         #Progress updates per second sent to the status bar during a transfer
+PROGRESSBARSTEPS = 1000         #QProgressBar values are 32 bit, so byte counts are scaled onto this range
+GLOBALBANDWIDTHLIMIT = 0        #Bytes per second shared by every running transfer, 0 leaves it unlimited
+JOBBANDWIDTHLIMIT = 0           #Bytes per second for any one transfer, 0 leaves it unlimited
+INTERACTIVERESERVE = 0.2        #Part of the global limit held back from transfers while a server listing or rename runs
+LOGFLUSHINTERVAL = 200          #Milliseconds between batched writes to the log view
+LOGMAXIMUMLINES = 5000          #Lines kept in the log view, older ones are dropped from the top
+LOGFILEPATH = os.path.join(os.path.expanduser("~"), ".qtsftp", "Logs", "QTSFTP.log")    #Full log, written off the GUI thread
+LOGFILEBYTES = 5242880          #Size a log file reaches before it is rotated
+LOGFILEBACKUPS = 3              #Rotated log files kept beside the current one
+METRICSPROFILING = False        #Run every job under cProfile, the merged stats are exported beside the metrics
+METRICSTRACELIMIT = 10000       #Latest timed operations kept for a Chrome trace export, 0 keeps none
+METRICSEXPORTPATH = os.path.join(os.path.expanduser("~"), ".qtsftp", "Metrics.json")     #Default export location, a '.prom' name writes Prometheus text
+JOBQUEUEPATH = os.path.join(os.path.expanduser("~"), ".qtsftp", "Jobs.json")    #Queued transfers and deletes, kept across restarts
+LOCALDELETEWORKERS = 8          #Threads walking and removing entries in a local delete
+JOBLANELIMITS = {               #Jobs running at once per connection, browsing never waits behind transfers
+    "Interactive" : 2,
+    "Bulk" : 1
+}
+JOBPRIORITIES = {               #Lower runs first within a lane
+    "List Local" : 0,
+    "List Remote" : 0,
+    "Rename" : 1,
+    "Rename Local" : 1,
+    "Delete" : 2,
+    "Delete Local" : 2,
+    "Transfer" : 3
+}
 
 #Main window
 class SSHClientMainWindow(QMainWindow):
@@ -128,17 +264,31 @@ class SSHClientMainWindow(QMainWindow):
         super().__init__(parent)
         uic.loadUi("Assets/GUI/SMTPClientGUI.ui", self)    #Load main GUI layout
         
-        #Instantiate the SSH Object
-        self.SSHObject = paramiko.SSHClient()   
-        self.SSHObject.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        #Instantiate the connection manager, every connected server keeps its own pool of transports and SFTP sessions
+        self.OperationMetrics = OperationMetricsObject.OperationMetrics(METRICSPROFILING, METRICSTRACELIMIT)
+        self.ConnectionManager = ConnectionManagerObject.SSHConnectionManager(KEEPALIVEINTERVAL, HEALTHCHECKINTERVAL, RECONNECTATTEMPTS, logging.warning, CHANNELWINDOWSIZE, TRANSFERCHANNELS if CHANNELMODE == "Transports" else 1, Metrics = self.OperationMetrics)
+        self.ConnectionParameters = None
+        self.ConnectionKey = None
+        self.AsyncEngine = AsyncEngineObject.AsyncSFTPEngine(ASYNCCONCURRENCY, PIPELINEBLOCKSIZE, ASYNCMAXREQUESTS, REFRESHINTERVAL / 1000)
+        self.BandwidthLimiter = BandwidthLimiterObject.BandwidthLimiter(GLOBALBANDWIDTHLIMIT, JOBBANDWIDTHLIMIT, INTERACTIVERESERVE)
+        self.TransferMode = "Auto"
+        self.EncryptTransfers = False
+        self.RemoteListingCache = DirectoryListingCacheObject.DirectoryListingCache(LISTINGCACHETTL, LISTINGCACHESIZE)
+        self.RefreshScheduler = RefreshSchedulerObject.QRefreshScheduler(REFRESHINTERVAL)
+        self.RefreshScheduler.refreshBatch.connect(self.DirectoryRefreshBatch)
+        self.StatisticsPanel = StatisticsPanelObject.QStatisticsPanel(self.OperationMetrics, METRICSEXPORTPATH, parent = self)
 
-        #Instantiate the secondary thread
+        #Instantiate the secondary thread and the job scheduler
         self.PThread = QThread(self) 
+        self.JobScheduler = JobSchedulerObject.QJobScheduler(self.CreateJobWorker, JOBQUEUEPATH, JOBLANELIMITS)
+        self.JobScheduler.jobFinished.connect(self.JobFinished)
 
-        #Set up the logger
-        self.LogHandler = LogHanderObject.QLogHandler()
-        self.LogHandler.appendPlainText.connect(self.GeneralLog.append)
+        #Set up the logger, the view gets batched lines and the full log goes to a rotating file from a listener thread
+        self.GeneralLog.document().setMaximumBlockCount(LOGMAXIMUMLINES)
+        self.LogHandler = LogHanderObject.QLogHandler(LOGFLUSHINTERVAL, LOGMAXIMUMLINES)
+        self.LogHandler.appendPlainText.connect(self.AppendLogLines)
         logging.getLogger().addHandler(self.LogHandler)
+        self.LogListener = self.ReturnLogFileListener()
         logging.getLogger().setLevel(logging.DEBUG)
         logging.getLogger("paramiko").setLevel(logging.WARNING)
 
@@ -149,16 +299,30 @@ class SSHClientMainWindow(QMainWindow):
         self.StatusBarProgressBar = QProgressBar()
         self.StatusBarProgressBar.setFixedSize(200, 25)
         self.SMTPStatusBar.addWidget(self.StatusBarProgressBar, 1)
+        self.StatusBarProgressBar.setRange(0, PROGRESSBARSTEPS)
         self.StatusBarProgressBar.hide()
+        self.StatusBarTransferLabel = QLabel()
+        self.SMTPStatusBar.addWidget(self.StatusBarTransferLabel, 1)
+        self.StatusBarTransferLabel.hide()
 
         #Set menu item triggers
         self.actionClose.triggered.connect(self.close)
         self.actionDisconnect.triggered.connect(self.ExecuteDisconnectButton)
+        self.actionSync_Directories.triggered.connect(lambda: self.ExecuteTransferringFiles("Sync", []))
+        self.actionCancel_Current_Operation.triggered.connect(self.ExecuteCancelCurrentOperation)
         self.actionShow_Password.triggered.connect(self.TogglePasswords)
         self.actionError.triggered.connect(lambda: self.ToggleLoggingLevel("Error"))
         self.actionWarning.triggered.connect(lambda: self.ToggleLoggingLevel("Warning"))
         self.actionInfo.triggered.connect(lambda: self.ToggleLoggingLevel("Info"))
         self.actionDebugging.triggered.connect(lambda: self.ToggleLoggingLevel("Debug"))
+        self.actionAuto.triggered.connect(lambda: self.ToggleTransferMode("Auto"))
+        self.actionStandard.triggered.connect(lambda: self.ToggleTransferMode("Standard"))
+        self.actionPipelined.triggered.connect(lambda: self.ToggleTransferMode("Pipelined"))
+        self.actionSegmented.triggered.connect(lambda: self.ToggleTransferMode("Segmented"))
+        self.actionEncrypt_Transfers.triggered.connect(self.ToggleEncryptTransfers)
+        self.actionShow_Statistics.triggered.connect(self.StatisticsPanel.show)
+        self.actionGlobal_Limit.triggered.connect(lambda: self.ChangeBandwidthLimit("Global"))
+        self.actionPer_Job_Limit.triggered.connect(lambda: self.ChangeBandwidthLimit("Per Job"))
 
         #Set button triggers
         self.E_ConnectionButton.clicked.connect(self.ExecuteConnectButton)
@@ -167,7 +331,7 @@ class SSHClientMainWindow(QMainWindow):
         self.ConnectedHiddenToggleCheckbox.clicked.connect(self.ExecuteShowConnectedHiddenFilesButton)
         self.ConnectedDirUpOne.clicked.connect(self.ExecuteConnectedNavigateOneUpButton)
         self.CurrentRefresh.clicked.connect(lambda: self.LoadGivenLocalDirectory(self.CurrentDirEdit.text()))
-        self.ConnectedRefresh.clicked.connect(lambda: self.LoadGivenRemoteDirectory(self.ConnectedDirEdit.text()))
+        self.ConnectedRefresh.clicked.connect(lambda: self.LoadGivenRemoteDirectory(self.ConnectedDirEdit.text(), True))
 
         #Set the TextEdit triggers
         self.CurrentDirEdit.editingFinished.connect(lambda: self.LoadGivenLocalDirectory(self.CurrentDirEdit.text()))
@@ -180,12 +344,12 @@ class SSHClientMainWindow(QMainWindow):
         self.ConnectedMachineDirectoryTree.doubleClicked.connect(self.ConnectedItemDoubleClicked)
         self.ConnectedMachineDirectoryTree.customContextMenuRequested.connect(self.ConnectedContextMenuGenerated)
 
-        #Instantiate the custom QStandardItemModels for the trees
-        self.CurrentDirectoryModel = StandardItemModelCustomObject.QStandardItemModelCustom("CurrentDirectoryModel")
+        #Instantiate the custom table models for the trees
+        self.CurrentDirectoryModel = DirectoryTableModelObject.QDirectoryTableModel("CurrentDirectoryModel")
         self.CurrentDirectoryModel.valueAdded.connect(self.CurrentDirectoryModelChanged)
         self.CurrentDirectoryModel.customItemChanged.connect(self.RenameLocalFile)
 
-        self.ConnectedDirectoryModel = StandardItemModelCustomObject.QStandardItemModelCustom("ConnectedDirectoryModel")
+        self.ConnectedDirectoryModel = DirectoryTableModelObject.QDirectoryTableModel("ConnectedDirectoryModel")
         self.ConnectedDirectoryModel.valueAdded.connect(self.ConnectedDirectoryModelChanged)
         self.ConnectedDirectoryModel.customItemChanged.connect(self.RenameRemoteFile)
         
@@ -199,17 +363,25 @@ class SSHClientMainWindow(QMainWindow):
         #Set application icon 
         self.setWindowIcon(QIcon("Assets/Icons/Padlock_Icon.ico"))
 
+        if TRANSFERBACKEND == "Asyncio" and not self.AsyncEngine.ReturnAvailable():
+            logging.warning("The asyncio transfer backend needs asyncssh, transfers will use the threaded engine")
+        if self.JobScheduler.RestoredJobs:
+            logging.info(f"{self.JobScheduler.RestoredJobs} queued job(s) restored, they resume once their server is connected")
+
     def ExecuteConnectButton(self):
         self.UpdateStatusLabel("Disconnected", "white")
+        self.RemoteListingCache.Clear()
         self.PThread = QThread(self) 
         self.PWorker = ThreadWorkerObject.QThreadWorker (
-                SSHObj = self.SSHObject
-                , Conn = {
+                Conn = {
                     "Host": self.B_HostEdit.text(), 
                     "Port": self.B_PortEdit.text(), 
                     "Username": self.B_UsernameEdit.text(), 
                     "Password": self.B_PasswordEdit.text()
                 }
+                , Cache = self.RemoteListingCache
+                , Manager = self.ConnectionManager
+                , Metrics = self.OperationMetrics
             )
         self.PWorker.moveToThread(self.PThread)
         self.PThread.started.connect(self.PWorker.ConnectAndOpenSFTP)    
@@ -217,9 +389,11 @@ class SSHClientMainWindow(QMainWindow):
         self.PThread.start()
 
     def ExecuteDisconnectButton(self):
+        self.RemoteListingCache.Clear()
         self.PThread = QThread(self) 
         self.PWorker = ThreadWorkerObject.QThreadWorker (
-                SSHObj = self.SSHObject
+                Conn = self.ConnectionParameters
+                , Manager = self.ConnectionManager
             )
         self.PWorker.moveToThread(self.PThread)
         self.PThread.started.connect(self.PWorker.DisconnectAndCloseSFTP)    
@@ -227,131 +401,165 @@ class SSHClientMainWindow(QMainWindow):
         self.PThread.start()
 
     def LoadGivenLocalDirectory(self, Path):
-        if not self.PThread.isRunning():
-            self.PThread = QThread(self) 
-            self.PWorker = ThreadWorkerObject.QThreadWorker (
-                    Misc = {
-                        "Local Path": Path, 
-                    }
-                )
-            self.PWorker.moveToThread(self.PThread)
-            self.PThread.started.connect(self.PWorker.QueryDirectoriesContentsLocalRequest)    
-            self.PWorker.completeDataSignal.connect(self.LocalQueryResults)
-            self.PThread.start()
-        else:
-            logging.warning("Cannot query for the local directory while the secondary thread is in use")
+        self.JobScheduler.Submit("List Local", "QueryDirectoriesContentsLocalRequest", {
+                "Local Path": Path, 
+            }
+            , Priority = JOBPRIORITIES["List Local"]
+            , ReplaceKey = "List Local"
+        )
         
-    def LoadGivenRemoteDirectory(self, Path):
-        if not self.PThread.isRunning():
-            SSHTransport = self.SSHObject.get_transport()
-            if (SSHTransport is not None and SSHTransport.is_active()) and not (self.SFTPObject.sock.closed):
-                self.PThread = QThread(self) 
-                self.PWorker = ThreadWorkerObject.QThreadWorker (
-                        SSHObj = self.SSHObject
-                        , SFTPObj = self.SFTPObject
-                        , Misc = {
-                            "Server Path": Path, 
-                        }
-                    )
-                self.PWorker.moveToThread(self.PThread)
-                self.PThread.started.connect(self.PWorker.QueryDirectoriesContentsServerRequest)    
-                self.PWorker.completeDataSignal.connect(self.ServerQueryResults)
-                self.PThread.start()
-            else:
-                logging.warning("Cannot fetch the remote directory without an active SSH connection")
+    def LoadGivenRemoteDirectory(self, Path, ForceRefresh = False):
+        if self.ReturnConnected():
+            self.JobScheduler.Submit("List Remote", "QueryDirectoriesContentsServerRequest", {
+                    "Server Path": Path, 
+                    "Force Refresh": ForceRefresh
+                }
+                , Connection = self.ReturnConnectionKey()
+                , Priority = JOBPRIORITIES["List Remote"]
+                , ReplaceKey = "List Remote"
+            )
         else:
-            logging.warning("Cannot query for the remote directory while the secondary thread is in use")
-
-    def ExecuteTransferringFiles(self, Type, TransferData):
-        if not self.PThread.isRunning():
-            SSHTransport = self.SSHObject.get_transport()
-            if (SSHTransport is not None and SSHTransport.is_active()) and not (self.SFTPObject.sock.closed):
-                self.PThread = QThread(self) 
-                self.PWorker = ThreadWorkerObject.QThreadWorker (
-                        SSHObj = self.SSHObject
-                        , SFTPObj = self.SFTPObject
-                        , Misc = {
-                            "Transfer Type" : Type, 
-                            "Transfer Data": TransferData,
-                            "Local Path": self.CurrentDirEdit.text(),
-                            "Server Path": self.ConnectedDirEdit.text(), 
-                        }
-                    )
-                self.PWorker.moveToThread(self.PThread)
-                self.PThread.started.connect(self.PWorker.TransferFilesServerRequest)  
-                self.PWorker.serverMessage.connect(self.ServerUpdateMessage)
-                self.PWorker.transferProgress.connect(self.FileTransferProgress)
-                self.PWorker.transferCompleteLocal.connect(self.LocalQueryResults)
-                self.PWorker.transferCompleteRemote.connect(self.ServerQueryResults)
-                self.PWorker.completeDataSignal.connect(self.FileTransferResults)
-                self.PThread.start()
-            else:
-                logging.warning("Cannot transfer files without an active SFTP connection")
+            logging.warning("Cannot fetch the remote directory without an active SSH connection")
+
+    def ExecuteTransferringFiles(self, Type, TransferData, Mode = None):
+        if self.ReturnConnected():
+            Job = self.JobScheduler.Submit("Transfer", "SyncDirectoriesServerRequest" if Type == "Sync" else "TransferFilesServerRequest", {
+                    "Transfer Type" : Type, 
+                    "Transfer Data": TransferData,
+                    "Local Path": self.CurrentDirEdit.text(),
+                    "Server Path": self.ConnectedDirEdit.text(), 
+                    "Transfer Mode": Mode if Mode is not None else self.TransferMode,
+                    "Transfer Channels": TRANSFERCHANNELS,
+                    "Channel Mode": CHANNELMODE,
+                    "Channel Window Size": CHANNELWINDOWSIZE,
+                    "Large File Threshold": LARGEFILETHRESHOLD,
+                    "Pipeline Requests": PIPELINEREQUESTS,
+                    "Pipeline Block Size": PIPELINEBLOCKSIZE,
+                    "Segment Count": SEGMENTCOUNT,
+                    "Journal Directory": JOURNALDIRECTORY,
+                    "Sync Block Size": SYNCBLOCKSIZE,
+                    "Archive File Threshold": ARCHIVEFILETHRESHOLD,
+                    "Archive Minimum Files": ARCHIVEMINIMUMFILES,
+                    "Archive Batch Size": ARCHIVEBATCHSIZE,
+                    "Archive Compression": ARCHIVECOMPRESSION,
+                    "Encrypt Transfers": self.EncryptTransfers and Type != "Sync",
+                    "Encryption Key Path": TRANSFERKEYPATH,
+                    "Verify Transfers": VERIFYTRANSFERS,
+                    "Integrity Algorithm": INTEGRITYALGORITHM,
+                    "Integrity Batch Size": INTEGRITYBATCHSIZE,
+                    "Verify Retries": VERIFYRETRIES,
+                    "Preserve Times": Type == "Sync",
+                    "Progress Sample Rate": PROGRESSSAMPLERATE
+                }
+                , Connection = self.ReturnConnectionKey()
+                , Priority = JOBPRIORITIES["Transfer"]
+                , Lane = "Bulk"
+                , Persist = True
+            )
+            self.LogQueuedJob(Job, f"{Type} of {len(TransferData)} item(s)" if Type != "Sync" else "Sync")
         else:
-            logging.warning("Cannot transfer files while the secondary thread is in use")
+            logging.warning("Cannot transfer files without an active SFTP connection")
 
     def RenameRemoteFile(self, Index, Role, OldValue, NewValue):
-        if not self.PThread.isRunning():
-            SSHTransport = self.SSHObject.get_transport()
-            if (SSHTransport is not None and SSHTransport.is_active()) and not (self.SFTPObject.sock.closed):
-                self.PThread = QThread(self) 
-                self.PWorker = ThreadWorkerObject.QThreadWorker (
-                        SSHObj = self.SSHObject
-                        , SFTPObj = self.SFTPObject
-                        , Misc = {
-                            "Old Name": os.path.join(self.ConnectedDirEdit.text(), OldValue), 
-                            "New Name": os.path.join(self.ConnectedDirEdit.text(), NewValue)
-                        }
-                    )
-                self.PWorker.moveToThread(self.PThread)
-                self.PThread.started.connect(self.PWorker.RenameFileOrDirectory)  
-                self.PWorker.completeDataSignal.connect(self.ServerFileRenamingCompleted)
-                self.PThread.start()
-            else:
-                logging.warning("Cannot rename server files without an active SFTP connection")
+        if self.ReturnConnected():
+            self.JobScheduler.Submit("Rename", "RenameFileOrDirectory", {
+                    "Old Name": os.path.join(self.ConnectedDirEdit.text(), OldValue), 
+                    "New Name": os.path.join(self.ConnectedDirEdit.text(), NewValue)
+                }
+                , Connection = self.ReturnConnectionKey()
+                , Priority = JOBPRIORITIES["Rename"]
+            )
         else:
-            logging.warning("Cannot rename files on the server while the secondary thread is in use")
+            logging.warning("Cannot rename server files without an active SFTP connection")
 
     def DeleteRemoteFiles(self, Items):
-        if not self.PThread.isRunning():
-            SSHTransport = self.SSHObject.get_transport()
-            if (SSHTransport is not None and SSHTransport.is_active()) and not (self.SFTPObject.sock.closed):
-                self.PThread = QThread(self) 
-                self.PWorker = ThreadWorkerObject.QThreadWorker (
-                        SSHObj = self.SSHObject
-                        , SFTPObj = self.SFTPObject
-                        , Misc = {
-                            "Server Path": self.ConnectedDirEdit.text(),
-                            "Directory Items" : Items
-                        }
-                    )
-                self.PWorker.moveToThread(self.PThread)
-                self.PThread.started.connect(self.PWorker.DeleteFileOrDirectoryServerRequest)              
-                self.PWorker.serverMessage.connect(self.ServerUpdateMessage)
-                self.PWorker.completeDataSignal.connect(self.ServerFileorDirectoryDeleteCompleted)
-                self.PThread.start()
-            else:
-                logging.warning("Cannot delete server files without an active SFTP connection")
+        if self.ReturnConnected():
+            Job = self.JobScheduler.Submit("Delete", "DeleteFileOrDirectoryServerRequest", {
+                    "Server Path": self.ConnectedDirEdit.text(),
+                    "Directory Items" : Items,
+                    "Transfer Channels": TRANSFERCHANNELS,
+                    "Channel Mode": CHANNELMODE
+                }
+                , Connection = self.ReturnConnectionKey()
+                , Priority = JOBPRIORITIES["Delete"]
+                , Lane = "Bulk"
+                , Persist = True
+            )
+            self.LogQueuedJob(Job, f"Delete of {len(Items)} item(s)")
         else:
-            logging.warning("Cannot delete files on the server while the secondary thread is in use")
+            logging.warning("Cannot delete server files without an active SFTP connection")
+
+    def CreateJobWorker(self, Job):
+        #Workers are built when a job starts, so restored jobs pick up the current connection and never store its password
+        Worker = ThreadWorkerObject.QThreadWorker (
+                Conn = self.ConnectionManager.ReturnParameters(Job["Connection"]) if Job["Connection"] is not None else None
+                , Misc = dict(Job["Misc"], **{"Job Request" : Job["Request"], "Job Lane" : Job["Lane"]})
+                , Cache = self.RemoteListingCache
+                , Manager = self.ConnectionManager
+                , Engine = self.AsyncEngine if Job["Job Type"] == "Transfer" and TRANSFERBACKEND == "Asyncio" and self.AsyncEngine.ReturnAvailable() else None
+                , Metrics = self.OperationMetrics
+                , Limiter = self.BandwidthLimiter
+            )
+        if Job["Job Type"] == "List Local":
+            Worker.directoryChunkLocal.connect(self.LocalQueryChunk)
+            Worker.completeDataSignal.connect(self.LocalQueryResults)
+        elif Job["Job Type"] == "List Remote":
+            Worker.directoryChunkRemote.connect(self.ServerQueryChunk)
+            Worker.completeDataSignal.connect(self.ServerQueryResults)
+        elif Job["Job Type"] == "Transfer":
+            Worker.serverMessage.connect(self.ServerUpdateMessage)
+            Worker.transferProgress.connect(self.FileTransferProgress)
+            Worker.transferCompleteLocal.connect(lambda params: self.RefreshScheduler.QueueItems("Local", params["Local Path"], params.get("Directory Items", [params.get("Directory Item")])))
+            Worker.transferCompleteRemote.connect(lambda params: self.RefreshScheduler.QueueItems("Server", params["Server Path"], params.get("Directory Items", [params.get("Directory Item")])))
+            Worker.completeDataSignal.connect(self.FileTransferResults)
+        elif Job["Job Type"] == "Rename":
+            Worker.completeDataSignal.connect(self.ServerFileRenamingCompleted)
+        elif Job["Job Type"] == "Delete":
+            Worker.serverMessage.connect(self.ServerUpdateMessage)
+            Worker.completeDataSignal.connect(self.ServerFileorDirectoryDeleteCompleted)
+        elif Job["Job Type"] == "Rename Local":
+            Worker.completeDataSignal.connect(self.LocalFileRenamingCompleted)
+        elif Job["Job Type"] == "Delete Local":
+            Worker.serverMessage.connect(self.ServerUpdateMessage)
+            Worker.completeDataSignal.connect(self.LocalFileorDirectoryDeleteCompleted)
+        return Worker
+
+    def LogQueuedJob(self, Job, Description):
+        QueuePosition = self.JobScheduler.ReturnQueuePosition(Job)
+        if Job in self.JobScheduler.PendingJobs:
+            logging.info(f"{Description} queued, {QueuePosition} job(s) ahead of it")
+
+    def ExecuteCancelCurrentOperation(self):
+        CancelledJobs = self.JobScheduler.Cancel("Bulk")
+        logging.info(f"Cancelling {len(CancelledJobs)} transfer/delete job(s)" if CancelledJobs else "No transfer or delete is running or queued")
+
+    def ReturnConnected(self):
+        #Dropped transports are re-established by the connection manager, a server only stops counting once disconnected
+        return self.ConnectionKey is not None and self.ConnectionManager.ReturnConnected(self.ConnectionKey)
+
+    def ReturnConnectionKey(self):
+        return self.ConnectionKey
 
     def RenameLocalFile(self, Index, Role, OldValue, NewValue):
         if NewValue.strip() != OldValue.strip():
-            OldPath = os.path.join(self.CurrentDirEdit.text(), OldValue)
-            NewPath = os.path.join(self.CurrentDirEdit.text(), NewValue)
-            os.rename(OldPath, NewPath)
-            self.LoadGivenLocalDirectory(self.CurrentDirEdit.text()) 
-            logging.info(f"Local file successfully renamed '{OldPath}' → '{NewPath}'")
-
-    def DeleteLocalFiles(self, Path):
-        if os.path.isdir(Path):
-            for PathItem in os.listdir(Path):
-                self.DeleteLocalFiles(os.path.join(Path, PathItem)) 
-            os.rmdir(Path)
-            logging.info(f"Local directory successfully deleted '{Path}'")
-        elif os.path.isfile(Path):
-            os.remove(Path)
-            logging.info(f"Local file successfully deleted '{Path}'")
+            self.JobScheduler.Submit("Rename Local", "RenameFileOrDirectoryLocal", {
+                    "Old Name": os.path.join(self.CurrentDirEdit.text(), OldValue), 
+                    "New Name": os.path.join(self.CurrentDirEdit.text(), NewValue)
+                }
+                , Priority = JOBPRIORITIES["Rename Local"]
+            )
+
+    def DeleteLocalFiles(self, Items):
+        #Runs in the bulk lane so 'Cancel Current Operation' stops it, the view is refreshed once when it finishes
+        Job = self.JobScheduler.Submit("Delete Local", "DeleteFileOrDirectoryLocalRequest", {
+                "Local Path": self.CurrentDirEdit.text(),
+                "Directory Items" : Items,
+                "Delete Workers": LOCALDELETEWORKERS
+            }
+            , Priority = JOBPRIORITIES["Delete Local"]
+            , Lane = "Bulk"
+        )
+        self.LogQueuedJob(Job, f"Local delete of {len(Items)} item(s)")
 
     def ExecuteShowCurrentHiddenFilesButton(self):
         Checked = self.CurrentHiddenToggleCheckbox.isChecked()
@@ -421,9 +629,7 @@ class SSHClientMainWindow(QMainWindow):
             elif MenuItemExecuted == RenameAction:
                 self.CurrentMachineDirectoryTree.edit(AllItemSelectedIndexes[0].siblingAtColumn(0)) 
             elif MenuItemExecuted == DeleteAction:
-                for Item in AllItemAttributes:
-                    self.DeleteLocalFiles(os.path.join(self.CurrentDirEdit.text(), Item["Item Name"]))
-                self.LoadGivenLocalDirectory(self.CurrentDirEdit.text()) 
+                self.DeleteLocalFiles(AllItemAttributes)
                 
     def ConnectedContextMenuGenerated(self, position):
         ItemSelectedIndex = self.ConnectedMachineDirectoryTree.indexAt(position) 
@@ -475,6 +681,48 @@ class SSHClientMainWindow(QMainWindow):
             self.actionDebugging.setChecked(True)
             logging.getLogger("paramiko").setLevel(logging.DEBUG)
 
+    def ToggleTransferMode(self, Mode):
+        self.actionAuto.setChecked(Mode == "Auto")
+        self.actionStandard.setChecked(Mode == "Standard")
+        self.actionPipelined.setChecked(Mode == "Pipelined")
+        self.actionSegmented.setChecked(Mode == "Segmented")
+        self.TransferMode = Mode
+
+    def ChangeBandwidthLimit(self, Scope):
+        #Applies to running transfers at once, the limiter re-reads its rates between chunks
+        CurrentLimit = self.BandwidthLimiter.GlobalRate if Scope == "Global" else self.BandwidthLimiter.JobRate
+        Limit, Accepted = QInputDialog.getInt(self, f"{Scope} Bandwidth Limit", f"{Scope} limit in KB/s, 0 for unlimited:", int(CurrentLimit // 1024), 0, 2**31 - 1)
+        if Accepted:
+            if Scope == "Global":
+                self.BandwidthLimiter.SetGlobalRate(Limit * 1024)
+            else:
+                self.BandwidthLimiter.SetJobRate(Limit * 1024)
+            logging.info(f"{Scope} bandwidth limit set to {f"{self.ReturnReadableSize(Limit * 1024)}/s" if Limit else "unlimited"}")
+
+    def ToggleEncryptTransfers(self):
+        #Uploads are sealed chunk by chunk on their way out and downloads opened the same way, sync always moves files as they are
+        if self.actionEncrypt_Transfers.isChecked() and not os.path.isfile(TRANSFERKEYPATH):
+            logging.warning(f"Cannot encrypt transfers without a key, save a 16, 24 or 32 character key to '{TRANSFERKEYPATH}'")
+            self.actionEncrypt_Transfers.setChecked(False)
+        self.EncryptTransfers = self.actionEncrypt_Transfers.isChecked()
+        if self.EncryptTransfers:
+            logging.info("Uploads will be encrypted and downloads decrypted as they transfer")
+
+    def ReturnLogFileListener(self):
+        try:
+            os.makedirs(os.path.dirname(LOGFILEPATH), exist_ok = True)
+            LogFileHandler = logging.handlers.RotatingFileHandler(LOGFILEPATH, maxBytes = LOGFILEBYTES, backupCount = LOGFILEBACKUPS, encoding = "utf-8")
+        except OSError as E:
+            logging.warning(f"Cannot write the log file '{LOGFILEPATH}', only the log view will be kept: {E}")
+            return None
+        LogFileHandler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s"))
+        LogQueue = queue.SimpleQueue()
+        self.LogQueueHandler = logging.handlers.QueueHandler(LogQueue)      #Callers only pay for a queue put
+        logging.getLogger().addHandler(self.LogQueueHandler)
+        LogListener = logging.handlers.QueueListener(LogQueue, LogFileHandler)
+        LogListener.start()
+        return LogListener
+
     def TogglePasswords(self):
         self.B_PasswordEdit.setEchoMode(QLineEdit.EchoMode.Password \
                                         if self.B_PasswordEdit.echoMode() == QLineEdit.EchoMode.Normal \
@@ -483,6 +731,7 @@ class SSHClientMainWindow(QMainWindow):
     def ToggleServerSpecificMenuButtons(self, Toggle):
         self.actionCancel_Current_Operation.setEnabled(Toggle)
         self.actionDisconnect.setEnabled(Toggle)
+        self.actionSync_Directories.setEnabled(Toggle)
         self.actionReconnect.setEnabled(Toggle)
             
     def UpdateStatusLabel(self, Message, Color):
@@ -494,6 +743,13 @@ class SSHClientMainWindow(QMainWindow):
             return True
         return False
 
+    def ReturnReadableSize(self, ByteCount):
+        for Unit in ("B", "KB", "MB", "GB"):
+            if ByteCount < 1024:
+                return f"{ByteCount:.1f} {Unit}" if Unit != "B" else f"{int(ByteCount)} B"
+            ByteCount /= 1024
+        return f"{ByteCount:.1f} TB"
+
     def ReturnHiddenItem(self, ItemPath):        
         if platform.system() != "Windows":  #Linux
             return os.path.basename(os.path.abspath(ItemPath)).startswith('.')
@@ -504,8 +760,13 @@ class SSHClientMainWindow(QMainWindow):
             return False 
 
     def closeEvent(self, event):
+        self.ConnectionManager.Close()
+        self.AsyncEngine.Close()
         logging.getLogger().removeHandler(self.LogHandler)
         del self.LogHandler
+        if self.LogListener is not None:
+            logging.getLogger().removeHandler(self.LogQueueHandler)
+            self.LogListener.stop()     #Writes out whatever is still queued
 
     @pyqtSlot(object)
     def CurrentDirectoryModelChanged(self, params):
@@ -516,10 +777,7 @@ class SSHClientMainWindow(QMainWindow):
                 if OriginView == "CurrentDirectoryModel":
                     raise FileExistsError(f"Item(s) already exist in '{self.CurrentDirEdit.text()}'")
                 else:
-                    if not self.PThread.isRunning():
-                        self.ExecuteTransferringFiles("Download", ItemsObject)
-                    else: 
-                        logging.warning("Cannot start a new transfer while another process is active")
+                    self.ExecuteTransferringFiles("Download", ItemsObject)
             else:
                 raise params["Error Thrown"]
         except FileExistsError as ExistsError:
@@ -536,10 +794,7 @@ class SSHClientMainWindow(QMainWindow):
                 if OriginView == "ConnectedDirectoryModel":
                     raise FileExistsError(f"Item(s) already exist in '{self.ConnectedDirEdit.text()}'")
                 else:
-                    if not self.PThread.isRunning():
-                        self.ExecuteTransferringFiles("Upload", ItemsObject)
-                    else: 
-                        logging.warning("Cannot start a new transfer while another process is active")
+                    self.ExecuteTransferringFiles("Upload", ItemsObject)
             else:
                 raise params["Error Thrown"]
         except FileExistsError as ExistsError:
@@ -553,11 +808,13 @@ class SSHClientMainWindow(QMainWindow):
             if self.PThread.isRunning():
                 self.PThread.quit()
             if not self.IncludesErrors(params):   
-                self.SSHObject, self.SFTPObject = params["SSH Object"], params["SFTP Object"]
-                SSHTransport = self.SSHObject.get_transport()
-                if (SSHTransport is not None and SSHTransport.is_active()) and not (self.SFTPObject.sock.closed):
+                SSHTransport = params["SSH Object"].get_transport()
+                if (SSHTransport is not None and SSHTransport.is_active()):
+                    self.ConnectionKey = params["Connection Key"]
+                    self.ConnectionParameters = self.ConnectionManager.ReturnParameters(self.ConnectionKey)
                     self.ToggleServerSpecificMenuButtons(True)
-                    TransportInfo = self.SSHObject.get_transport().getpeername()
+                    self.JobScheduler.SetConnection(self.ConnectionKey, True)
+                    TransportInfo = SSHTransport.getpeername()
                     self.UpdateStatusLabel(f"Connected to {TransportInfo[0]}:{TransportInfo[1]}", "#2bfb75")
                     logging.info(f"SSH connection successful to {TransportInfo[0]} on port {TransportInfo[1]}")
                     self.ServerQueryResults({
@@ -577,9 +834,10 @@ class SSHClientMainWindow(QMainWindow):
             if self.PThread.isRunning():
                 self.PThread.quit()
             if not self.IncludesErrors(params):   
-                self.SSHObject = params["SSH Object"]
-                SSHTransport = self.SSHObject.get_transport()
-                if SSHTransport is None or not SSHTransport.is_active():
+                self.JobScheduler.SetConnection(params["Connection Key"], False)
+                self.AsyncEngine.Disconnect(params["Connection Key"])
+                if params["Connection Key"] == self.ConnectionKey:
+                    self.ConnectionKey, self.ConnectionParameters = None, None
                     self.ToggleServerSpecificMenuButtons(False)
                     self.ConnectedMachineDirectoryTree.setModel(None)
                     self.ConnectedDirEdit.setText("")
@@ -593,62 +851,70 @@ class SSHClientMainWindow(QMainWindow):
     @pyqtSlot(object)
     def LocalQueryResults(self, params):
         try:
-            if self.PThread.isRunning():
-                self.PThread.quit()
             if not self.IncludesErrors(params):   
-                ShowHidden, LocalPath, DirectoryItemsList = self.CurrentHiddenToggleCheckbox.isChecked(), params["Local Path"], params["Directory Items"]
-                self.CurrentDirectoryModel.clear() 
-                self.CurrentDirectoryModel.setHorizontalHeaderLabels(["Name", "Type", "Date Modified"])
-                for DirectoryItem in DirectoryItemsList:
-                    DirectoryItemPath = os.path.join(LocalPath, DirectoryItem["Item Name"])
-                    IsHiddenItem = self.ReturnHiddenItem(DirectoryItemPath)
-                    if (not IsHiddenItem) or (IsHiddenItem and self.CurrentHiddenToggleCheckbox.isChecked()):
-                        ItemName, ItemType, ItemModified = DirectoryItem["Item Name"], DirectoryItem["Item Type"], DirectoryItem["Item Date"]
-                        if ItemName != None:
-                            DirectoryItemRow = [QStandardItem(ItemName), QStandardItem(ItemType), QStandardItem(ItemModified)]
-                            self.CurrentDirectoryModel.appendRow(DirectoryItemRow)
-                self.CurrentMachineDirectoryTree.setModel(self.CurrentDirectoryModel)
-                self.CurrentMachineDirectoryTree.header().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
-                self.CurrentMachineDirectoryTree.resizeColumnToContents(0)
-                self.CurrentDirEdit.setText(LocalPath)
-                self.CurrentDirUpOne.setEnabled(self.CurrentDirEdit.text() != '/')
+                if "Directory Items" in params:     #Streamed listings are already on screen, complete ones arrive in a single piece
+                    self.LocalQueryChunk(dict(params, **{"First Chunk" : True}))
+                else:       #The streamed chunks were only appended, the whole listing is sorted once here
+                    with self.OperationMetrics.Span("Model Sort"):
+                        self.CurrentDirectoryModel.SortPendingRows()
             else:
                 raise params["Error Thrown"]
         except Exception as E:
             logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
 
+    @pyqtSlot(object)
+    def LocalQueryChunk(self, params):
+        try:
+            ShowHidden, LocalPath, DirectoryItemsList = self.CurrentHiddenToggleCheckbox.isChecked(), params["Local Path"], params["Directory Items"]
+            with self.OperationMetrics.Span("Model Rebuild" if params["First Chunk"] else "Model Append"):
+                DirectoryItemRows = [DirectoryItem for DirectoryItem in DirectoryItemsList if ShowHidden or not self.ReturnHiddenItem(os.path.join(LocalPath, DirectoryItem.Name))]
+                if params["First Chunk"]:
+                    self.CurrentDirectoryModel.SetRows(DirectoryItemRows)     #Only the first batch is handed to the view, the rest loads on scroll
+                    self.CurrentMachineDirectoryTree.setModel(self.CurrentDirectoryModel)
+                    self.CurrentMachineDirectoryTree.header().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+                    self.CurrentMachineDirectoryTree.resizeColumnToContents(0)
+                    self.CurrentDirEdit.setText(LocalPath)
+                    self.CurrentDirUpOne.setEnabled(self.CurrentDirEdit.text() != '/')
+                else:
+                    self.CurrentDirectoryModel.AppendRows(DirectoryItemRows, DeferSort = True)
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
     @pyqtSlot(object)
     def ServerQueryResults(self, params):
         try:
-            if self.PThread.isRunning():
-                self.PThread.quit()
             if not self.IncludesErrors(params):   
-                ShowHidden, ServerPath, DirectoryItemsList = self.ConnectedHiddenToggleCheckbox.isChecked(), params["Server Path"], params["Directory Items"]
-                self.ConnectedDirectoryModel.clear() 
-                self.ConnectedDirectoryModel.setHorizontalHeaderLabels(["Name", "Type", "Date Modified"])
-                for DirectoryItem in DirectoryItemsList:
-                    DirectoryItemPath = os.path.join(ServerPath, DirectoryItem["Item Name"])
-                    IsHiddenItem = self.ReturnHiddenItem(DirectoryItemPath)
-                    if (not IsHiddenItem) or (IsHiddenItem and ShowHidden):
-                        ItemName, ItemType, ItemModified = DirectoryItem["Item Name"], DirectoryItem["Item Type"], DirectoryItem["Item Date"]
-                        if ItemName != None:
-                            DirectoryItemRow = [QStandardItem(ItemName), QStandardItem(ItemType), QStandardItem(ItemModified)]
-                            self.ConnectedDirectoryModel.appendRow(DirectoryItemRow)
-                self.ConnectedMachineDirectoryTree.setModel(self.ConnectedDirectoryModel)
-                self.ConnectedMachineDirectoryTree.header().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
-                self.ConnectedMachineDirectoryTree.resizeColumnToContents(0)
-                self.ConnectedDirEdit.setText(ServerPath)
-                self.ConnectedDirUpOne.setEnabled(self.ConnectedDirEdit.text() != '/')
+                if "Directory Items" in params:     #Streamed listings are already on screen, complete ones arrive in a single piece
+                    self.ServerQueryChunk(dict(params, **{"First Chunk" : True}))
+                else:       #The streamed chunks were only appended, the whole listing is sorted once here
+                    with self.OperationMetrics.Span("Model Sort"):
+                        self.ConnectedDirectoryModel.SortPendingRows()
             else:
                 raise params["Error Thrown"]
         except Exception as E:
             logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
 
+    @pyqtSlot(object)
+    def ServerQueryChunk(self, params):
+        try:
+            ShowHidden, ServerPath, DirectoryItemsList = self.ConnectedHiddenToggleCheckbox.isChecked(), params["Server Path"], params["Directory Items"]
+            with self.OperationMetrics.Span("Model Rebuild" if params["First Chunk"] else "Model Append"):
+                DirectoryItemRows = [DirectoryItem for DirectoryItem in DirectoryItemsList if ShowHidden or not self.ReturnHiddenItem(os.path.join(ServerPath, DirectoryItem.Name))]
+                if params["First Chunk"]:
+                    self.ConnectedDirectoryModel.SetRows(DirectoryItemRows)     #Only the first batch is handed to the view, the rest loads on scroll
+                    self.ConnectedMachineDirectoryTree.setModel(self.ConnectedDirectoryModel)
+                    self.ConnectedMachineDirectoryTree.header().setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+                    self.ConnectedMachineDirectoryTree.resizeColumnToContents(0)
+                    self.ConnectedDirEdit.setText(ServerPath)
+                    self.ConnectedDirUpOne.setEnabled(self.ConnectedDirEdit.text() != '/')
+                else:
+                    self.ConnectedDirectoryModel.AppendRows(DirectoryItemRows, DeferSort = True)
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
     @pyqtSlot(object)
     def ServerFileRenamingCompleted(self, params):
         try:
-            if self.PThread.isRunning():
-                self.PThread.quit()
             if not self.IncludesErrors(params):
                 if params["Old Name"] != params["New Name"]:
                     logging.info(f"Server file successfully renamed '{params["Old Name"]}' → '{params["New Name"]}'")
@@ -657,11 +923,38 @@ class SSHClientMainWindow(QMainWindow):
         except Exception as E:
             logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
 
+    @pyqtSlot(object)
+    def LocalFileRenamingCompleted(self, params):
+        try:
+            if not self.IncludesErrors(params):
+                if params["Old Name"] != params["New Name"]:
+                    logging.info(f"Local file successfully renamed '{params["Old Name"]}' → '{params["New Name"]}'")
+            else:
+                self.LoadGivenLocalDirectory(self.CurrentDirEdit.text())      #The view already shows the new name, put the real one back
+                raise params["Error Thrown"]
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
+    @pyqtSlot(object)
+    def LocalFileorDirectoryDeleteCompleted(self, params):
+        try:
+            Displayed = os.path.normpath(params["Local Path"]) == os.path.normpath(self.CurrentDirEdit.text())     #Never pulls the view back to a folder navigated away from
+            if not self.IncludesErrors(params):
+                if Displayed:
+                    self.LocalQueryResults({
+                        "Local Path" : params["Local Path"], 
+                        "Directory Items" : params["Local Results"]
+                    })
+            else:
+                if Displayed:       #A failed or cancelled delete may still have removed part of the selection
+                    self.LoadGivenLocalDirectory(params["Local Path"])
+                raise params["Error Thrown"]
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
     @pyqtSlot(object)
     def ServerFileorDirectoryDeleteCompleted(self, params):
         try:
-            if self.PThread.isRunning():
-                self.PThread.quit()
             if not self.IncludesErrors(params):
                 self.ServerQueryResults({
                     "Server Path" : params["Server Path"], 
@@ -672,14 +965,42 @@ class SSHClientMainWindow(QMainWindow):
         except Exception as E:
             logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
 
+    @pyqtSlot(object)
+    def JobFinished(self, params):
+        try:
+            if params["Job Type"] == "Transfer" and not any(Job["Job Type"] == "Transfer" for Job, _, _ in self.JobScheduler.RunningJobs.values()):
+                self.StatusBarProgressBar.hide()        #Kept up while any other transfer still reports progress
+                self.StatusBarTransferLabel.hide()
+            PendingJobs = [Job for Job in self.JobScheduler.PendingJobs if Job["Lane"] == params["Lane"]]
+            if params["Lane"] == "Bulk" and PendingJobs:
+                logging.info(f"{len(PendingJobs)} queued transfer/delete job(s) remaining")
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
+    @pyqtSlot(object)
+    def AppendLogLines(self, Lines):
+        #A whole batch goes in as one edit, so the view lays out once per flush rather than once per line
+        ScrollBar = self.GeneralLog.verticalScrollBar()
+        FollowLog = ScrollBar.value() == ScrollBar.maximum()
+        Cursor = QTextCursor(self.GeneralLog.document())
+        Cursor.movePosition(QTextCursor.MoveOperation.End)
+        Cursor.beginEditBlock()
+        for Line in Lines:
+            if not self.GeneralLog.document().isEmpty():
+                Cursor.insertBlock()
+            Cursor.insertHtml(Line)
+        Cursor.endEditBlock()
+        if FollowLog:
+            ScrollBar.setValue(ScrollBar.maximum())
+
     @pyqtSlot(object)
     def ServerUpdateMessage(self, params):
         try:
             if not self.IncludesErrors(params):
                 logging.info(params["Message"])
                 if "Item Size" in params:
-                    self.StatusBarProgressBar.setRange(0, int(params["Item Size"]))
                     self.StatusBarProgressBar.show()
+                    self.StatusBarTransferLabel.show()
             else:
                 raise params["Error Thrown"]
         except Exception as E:
@@ -689,27 +1010,55 @@ class SSHClientMainWindow(QMainWindow):
     def FileTransferProgress(self, params):
         try:
             if not self.IncludesErrors(params):
-                self.StatusBarProgressBar.setValue(params["Current Bytes"])
+                CurrentBytes, TotalBytes = params["Current Bytes"], params["Total Bytes"]
+                self.StatusBarProgressBar.setValue(CurrentBytes * PROGRESSBARSTEPS // TotalBytes if TotalBytes > 0 else 0)
+                SecondsRemaining = params["Seconds Remaining"]
+                self.StatusBarTransferLabel.setText(
+                    f"{self.ReturnReadableSize(CurrentBytes)} of {self.ReturnReadableSize(TotalBytes)} | "
+                    f"{self.ReturnReadableSize(params["Smoothed Bytes Per Second"])}/s" + \
+                    (f" (limit {self.ReturnReadableSize(params["Bytes Per Second Limit"])}/s)" if params.get("Bytes Per Second Limit") else "") + " | "
+                    f"ETA {str(datetime.timedelta(seconds = int(SecondsRemaining))) if SecondsRemaining is not None else "--:--"} | "
+                    f"{params["Files Remaining"]} of {params["Files Total"]} file(s) left"
+                )
             else:
                 raise params["Error Thrown"]
         except Exception as E:
             logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
 
+    @pyqtSlot(object)
+    def DirectoryRefreshBatch(self, params):
+        try:
+            if params["View Name"] == "Local":
+                Model, Tree, CurrentPath, ShowHidden = self.CurrentDirectoryModel, self.CurrentMachineDirectoryTree, self.CurrentDirEdit.text(), self.CurrentHiddenToggleCheckbox.isChecked()
+            else:
+                Model, Tree, CurrentPath, ShowHidden = self.ConnectedDirectoryModel, self.ConnectedMachineDirectoryTree, self.ConnectedDirEdit.text(), self.ConnectedHiddenToggleCheckbox.isChecked()
+            #Only patch the folder that is on screen, other folders get listed when navigated to
+            if Tree.model() is Model and os.path.normpath(params["Directory Path"]) == os.path.normpath(CurrentPath):
+                with self.OperationMetrics.Span("Model Update"):
+                    Model.UpsertRows([
+                        DirectoryItem for DirectoryItem in params["Directory Items"] 
+                            if ShowHidden or not self.ReturnHiddenItem(os.path.join(params["Directory Path"], DirectoryItem.Name))
+                    ])
+        except Exception as E:
+            logging.error(ERRORTEMPLATE.format(type(E).__name__, E.args)) 
+
     @pyqtSlot(object)
     def FileTransferResults(self, params):
         try:
-            self.StatusBarProgressBar.hide()
-            if self.PThread.isRunning():
-                self.PThread.quit()
             if not self.IncludesErrors(params): 
-                self.LocalQueryResults({
-                    "Local Path" : params["Local Path"], 
-                    "Directory Items" : params["Local Results"]
-                })
-                self.ServerQueryResults({
-                    "Server Path" : params["Server Path"], 
-                    "Directory Items" : params["Server Results"]
-                })
+                #Jobs run alongside browsing, a view is only reloaded if it still shows the folder the transfer ran in
+                if os.path.normpath(params["Local Path"]) == os.path.normpath(self.CurrentDirEdit.text()):
+                    self.RefreshScheduler.Discard("Local", params["Local Path"])     #The final listing supersedes this folder's batched updates
+                    self.LocalQueryResults({
+                        "Local Path" : params["Local Path"], 
+                        "Directory Items" : params["Local Results"]
+                    })
+                if os.path.normpath(params["Server Path"]) == os.path.normpath(self.ConnectedDirEdit.text()):
+                    self.RefreshScheduler.Discard("Server", params["Server Path"])
+                    self.ServerQueryResults({
+                        "Server Path" : params["Server Path"], 
+                        "Directory Items" : params["Server Results"]
+                    })
                 logging.info("All file(s) successfully transferred")
             else:
                 raise params["Error Thrown"]